@@ -1,7 +1,8 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from textwrap import dedent
-from typing import TypeVar
+from typing import Optional, TypeVar
 
 import rich_click as click
 from click import ClickException
@@ -14,15 +15,27 @@ from policy_inspector.model.address_object import AddressObject
 from policy_inspector.model.base import MainModel
 from policy_inspector.model.security_rule import SecurityRule
 from policy_inspector.output.html_report import export_as_html
-from policy_inspector.shadowing import Scenario, Shadowing, ShadowingByValue
+from policy_inspector.output.sqlite_store import save_results
+from policy_inspector.resolver import Resolver
+from policy_inspector.shadowing import (
+    CumulativeShadowing,
+    Scenario,
+    Shadowing,
+    ShadowingByValue,
+)
 from policy_inspector.utils import (
     Example,
     ExampleChoice,
     FilePath,
+    cache_option,
     config_logger,
     exclude_check_option,
     html_report,
+    interval_backend_option,
+    jobs_option,
     output_format_option,
+    store_masks_option,
+    store_option,
     verbose_option,
 )
 
@@ -38,6 +51,13 @@ logger = logging.getLogger(__name__)
 ConcreteScenario = TypeVar("ConcreteScenario", bound="Scenario")
 
 
+SHARED = "shared"
+"""Name of Panorama's location of objects shared by all Device Groups."""
+
+CONNECTIONS = 4
+"""Default number of requests sent to Panorama at once."""
+
+
 @click.group(no_args_is_help=True, add_help_option=True)
 @verbose_option()
 def main():
@@ -122,6 +142,21 @@ def main_list() -> None:
     help="SSL",
     default=False,
 )
+@click.option(
+    "-c",
+    "--connections",
+    type=click.IntRange(min=1),
+    default=CONNECTIONS,
+    show_default=True,
+    nargs=1,
+    help="Number of requests sent to Panorama at once.",
+)
+@click.option(
+    "--split-shared",
+    is_flag=True,
+    default=False,
+    help="Keep shared objects only in their own files, for `pins run devicegroups`.",
+)
 def main_pull(
     hostname: str,
     panos_version: str,
@@ -129,6 +164,8 @@ def main_pull(
     password: str,
     device_groups: tuple[str],
     verify_ssl,
+    connections: int,
+    split_shared: bool,
 ) -> None:
     """Pull Security Rules, Address Objects and Address Groups from Panorama for given Device Group."""
     get_data_from_panorama(
@@ -138,6 +175,8 @@ def main_pull(
         device_groups=device_groups,
         api_version=panos_version,
         verify_ssl=verify_ssl,
+        connections=connections,
+        split_shared=split_shared,
     )
 
 
@@ -181,11 +220,19 @@ def run_config(config_file_path):
 @exclude_check_option()
 @output_format_option()
 @html_report()
+@jobs_option()
+@store_option()
+@store_masks_option()
+@cache_option()
 def run_shadowing(
     security_rules_path: Path,
     exclude_checks: tuple[str],
     display_formats: tuple[str],
     html_report: bool,
+    jobs: int,
+    cache_file: Optional[Path] = None,
+    store_path: Optional[Path] = None,
+    store_masks: bool = False,
 ) -> None:
     process_scenario(
         Shadowing,
@@ -193,6 +240,10 @@ def run_shadowing(
         exclude_checks=exclude_checks,
         display_formats=display_formats,
         html_report=html_report,
+        jobs=jobs,
+        store_path=store_path,
+        store_masks=store_masks,
+        cache_file=cache_file,
     )
 
 
@@ -216,6 +267,11 @@ def run_shadowing(
 @exclude_check_option()
 @output_format_option()
 @html_report()
+@jobs_option()
+@store_option()
+@store_masks_option()
+@cache_option()
+@interval_backend_option()
 def run_shadowingvalue(
     security_rules_path: Path,
     address_objects_path: Path,
@@ -223,6 +279,11 @@ def run_shadowingvalue(
     exclude_checks: tuple[str],
     display_formats: tuple[str],
     html_report: bool,
+    jobs: int,
+    cache_file: Optional[Path] = None,
+    store_path: Optional[Path] = None,
+    store_masks: bool = False,
+    interval_backend: str = "tree",
 ) -> None:
     process_scenario(
         ShadowingByValue,
@@ -232,9 +293,152 @@ def run_shadowingvalue(
         exclude_checks=exclude_checks,
         display_formats=display_formats,
         html_report=html_report,
+        jobs=jobs,
+        store_path=store_path,
+        store_masks=store_masks,
+        cache_file=cache_file,
+        interval_backend=interval_backend,
+    )
+
+
+@main_run.command("cumulative", no_args_is_help=True)
+@verbose_option()
+@click.argument(
+    "security_rules_path",
+    required=True,
+    type=FilePath(),
+)
+@click.argument(
+    "address_objects_path",
+    required=True,
+    type=FilePath(),
+)
+@click.argument(
+    "address_groups_path",
+    required=True,
+    type=FilePath(),
+)
+@exclude_check_option()
+@output_format_option()
+@html_report()
+@jobs_option()
+@store_option()
+@store_masks_option()
+@cache_option()
+@interval_backend_option()
+def run_cumulative(
+    security_rules_path: Path,
+    address_objects_path: Path,
+    address_groups_path: Path,
+    exclude_checks: tuple[str],
+    display_formats: tuple[str],
+    html_report: bool,
+    jobs: int,
+    store_path: Optional[Path] = None,
+    store_masks: bool = False,
+    cache_file: Optional[Path] = None,
+    interval_backend: str = "tree",
+) -> None:
+    process_scenario(
+        CumulativeShadowing,
+        (SecurityRule, security_rules_path),
+        (AddressObject, address_objects_path),
+        (AddressGroup, address_groups_path),
+        exclude_checks=exclude_checks,
+        display_formats=display_formats,
+        html_report=html_report,
+        jobs=jobs,
+        store_path=store_path,
+        store_masks=store_masks,
+        cache_file=cache_file,
+        interval_backend=interval_backend,
     )
 
 
+@main_run.command("devicegroups", no_args_is_help=True)
+@verbose_option()
+@click.argument(
+    "device_groups",
+    nargs=-1,
+    required=True,
+    type=click.STRING,
+)
+@click.option(
+    "-s",
+    "--scenario",
+    "scenario_name",
+    type=click.Choice(["shadowingvalue", "cumulative"]),
+    default="shadowingvalue",
+    show_default=True,
+    help="Scenario executed for each Device Group.",
+)
+@click.option(
+    "--directory",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default=Path(),
+    show_default=True,
+    help="Directory with files saved by `pins pull --split-shared`.",
+)
+@exclude_check_option()
+@output_format_option()
+@jobs_option()
+@store_option()
+@interval_backend_option()
+def run_device_groups(
+    device_groups: tuple[str],
+    scenario_name: str,
+    directory: Path,
+    exclude_checks: tuple[str],
+    display_formats: tuple[str],
+    jobs: int,
+    store_path: Optional[Path] = None,
+    interval_backend: str = "tree",
+) -> None:
+    """Execute a scenario for many Device Groups pulled from Panorama.
+
+    Shared Address Objects and Address Groups are loaded and resolved
+    once, objects of each Device Group override the shared ones.
+    """
+    scenario = {
+        "shadowingvalue": ShadowingByValue,
+        "cumulative": CumulativeShadowing,
+    }[scenario_name]
+    shared_resolver = load_shared_resolver(directory)
+    for device_group in device_groups:
+        logger.info(f"▶ Device Group: '{device_group}'")
+        prefix = directory / get_file_prefix(device_group)
+        process_scenario(
+            scenario,
+            (SecurityRule, Path(f"{prefix}security_rules.json")),
+            (AddressObject, Path(f"{prefix}address_objects.json")),
+            (AddressGroup, Path(f"{prefix}address_groups.json")),
+            exclude_checks=exclude_checks,
+            display_formats=display_formats,
+            jobs=jobs,
+            store_path=store_path,
+            interval_backend=interval_backend,
+            shared_resolver=shared_resolver,
+        )
+
+
+def load_shared_resolver(directory: Path) -> Resolver:
+    """Load shared Address Objects and Address Groups and resolve them."""
+    prefix = directory / get_file_prefix(SHARED)
+    logger.info("↺ Loading shared Address Objects and Address Groups")
+    address_objects = load_model(
+        AddressObject, Path(f"{prefix}address_objects.json")
+    )
+    address_groups = load_model(
+        AddressGroup, Path(f"{prefix}address_groups.json")
+    )
+    resolver = Resolver(address_objects, address_groups)
+    logger.info(
+        f"✓ Resolved {len(address_objects)} shared '{AddressObject.plural}' "
+        f"and {len(address_groups)} shared '{AddressGroup.plural}'"
+    )
+    return resolver
+
+
 examples = [
     Example(
         name="1",
@@ -276,6 +480,7 @@ examples = [
 @exclude_check_option()
 @output_format_option()
 @html_report()
+@jobs_option()
 @click.pass_context
 def run_example(
     ctx,
@@ -283,6 +488,7 @@ def run_example(
     exclude_checks: tuple[str],
     display_formats: tuple[str],
     html_report: bool,
+    jobs: int,
 ) -> None:
     """Run one of the examples."""
     logger.info(f"▶ Selected example: '{example.name}'")
@@ -292,9 +498,52 @@ def run_example(
         exclude_checks=exclude_checks,
         display_formats=display_formats,
         html_report=html_report,
+        jobs=jobs,
     )
 
 
+def get_file_prefix(device_group: str) -> str:
+    """Return prefix of files with data of a Device Group."""
+    return f"{device_group.lower().replace(' ', '_')}_".strip()
+
+
+def pull_device_group(
+    panorama: PanoramaConnector, device_group: Optional[str]
+) -> dict[str, list[dict]]:
+    """Pull items of a single Device Group, or shared ones if ``None``."""
+    logger.info(f"▶ Processing Device Group: '{device_group or SHARED}'")
+    items = {}
+    if device_group is not None:
+        items["security_rules"] = panorama.get_security_rules(
+            device_group=device_group
+        )
+    items["address_objects"] = panorama.get_address_objects(
+        device_group=device_group
+    )
+    items["address_groups"] = panorama.get_address_groups(
+        device_group=device_group
+    )
+    return items
+
+
+def save_device_group(
+    device_group: str,
+    items: dict[str, list[dict]],
+    shared: Optional[dict[str, list[dict]]] = None,
+) -> dict[str, Path]:
+    """Save pulled items of a Device Group, by names of their files.
+
+    Items of ``shared`` are saved after items of the Device Group, so its
+    files can be analyzed on their own.
+    """
+    prefix = get_file_prefix(device_group)
+    shared = shared or {}
+    return {
+        name: save_json(values + shared.get(name, []), f"{prefix}{name}.json")
+        for name, values in items.items()
+    }
+
+
 def get_data_from_panorama(
     hostname: str,
     username: str,
@@ -303,7 +552,22 @@ def get_data_from_panorama(
     device_groups: list[str],
     verify_ssl,
     continue_on_error: bool = True,
+    connections: int = CONNECTIONS,
+    port: int = 443,
+    scheme: str = "https",
+    split_shared: bool = False,
 ) -> dict[str, dict[str, Path]]:
+    """Pull items of shared location and of Device Groups into JSON files.
+
+    Shared items and Device Groups are pulled by ``connections`` threads
+    at once, sharing a pool of kept-alive connections of the same size.
+    Files are saved and returned in the order of ``device_groups``.
+
+    Shared items are added to files of each Device Group, so they can be
+    analyzed on their own, and also saved to their own files. With
+    ``split_shared``, files of Device Groups contain only their own items,
+    as ``run devicegroups`` expects.
+    """
     try:
         logger.info(f"↺ Connecting to Panorama at {hostname}")
         panorama = PanoramaConnector(
@@ -312,51 +576,39 @@ def get_data_from_panorama(
             password=password,
             api_version=api_version,
             verify_ssl=verify_ssl,
+            port=port,
+            max_connections=connections,
+            scheme=scheme,
         )
         logger.info("✓ Successfully authenticated to Panorama")
     except Exception as ex:
         raise ClickException(str(ex)) from None
 
-    logger.info("▶ Retrieving shared items")
-    shared_address_objects = panorama.get_address_objects()
-    shared_address_groups = panorama.get_address_groups()
-
-    data = {}
-    for device_group in device_groups:
-        dg_files = {}
+    with ThreadPoolExecutor(max_workers=connections) as executor:
+        shared_future = executor.submit(pull_device_group, panorama, None)
+        futures = [
+            executor.submit(pull_device_group, panorama, device_group)
+            for device_group in device_groups
+        ]
         try:
-            logger.info(f"▶ Processing Device Group: '{device_group}'")
-
-            prefix = f"{device_group.lower().replace(' ', '_')}_".strip()
-
-            security_rules = panorama.get_security_rules(
-                device_group=device_group
-            )
-            dg_files["security_rules"] = save_json(
-                security_rules, f"{prefix}security_rules.json"
-            )
-
-            address_objects = panorama.get_address_objects(
-                device_group=device_group
-            )
-            dg_files["address_objects"] = save_json(
-                address_objects + shared_address_objects,
-                f"{prefix}address_objects.json",
-            )
-
-            address_groups = panorama.get_address_groups(
-                device_group=device_group
-            )
-            dg_files["address_groups"] = save_json(
-                address_groups + shared_address_groups,
-                f"{prefix}address_groups.json",
-            )
-            data[device_group] = dg_files
+            shared = shared_future.result()
         except Exception as ex:
-            if continue_on_error:
-                logger.error(f"Error occur '{device_group}' {ex}.")
-                continue
+            executor.shutdown(cancel_futures=True)
             raise ClickException(str(ex)) from None
+        data = {SHARED: save_device_group(SHARED, shared)}
+        for device_group, future in zip(device_groups, futures):
+            try:
+                data[device_group] = save_device_group(
+                    device_group,
+                    future.result(),
+                    None if split_shared else shared,
+                )
+            except Exception as ex:
+                if continue_on_error:
+                    logger.error(f"Error occur '{device_group}' {ex}.")
+                    continue
+                executor.shutdown(cancel_futures=True)
+                raise ClickException(str(ex)) from None
     logger.info("✓ All data successfully pulled and saved")
     return data
 
@@ -367,6 +619,11 @@ def process_scenario(
     exclude_checks: tuple[str] = (),
     display_formats: tuple[str] = (),
     html_report: bool = False,
+    jobs: int = 1,
+    cache_file: Optional[Path] = None,
+    store_path: Optional[Path] = None,
+    store_masks: bool = False,
+    interval_backend: str = "tree",
     **kwargs,
 ):
     try:
@@ -384,6 +641,9 @@ def process_scenario(
         logger.info(f"↺ Preparing '{scenario.name}' scenario")
         scenario = scenario(*models_data, **kwargs)
         scenario.exclude_checks(exclude_checks)
+        scenario.jobs = jobs
+        scenario.cache_file = cache_file
+        scenario.interval_backend = interval_backend
 
         logger.info(f"→ Executing scenario with {len(scenario.checks)} checks")
         for check in scenario.checks:
@@ -391,15 +651,25 @@ def process_scenario(
             check_docs = check.__doc__.replace("\n", " ")
             logger.debug(f"\t{check_docs}")
 
-        output = scenario.execute()
-        results = scenario.analyze(output)
-        scenario.show(results, display_formats)
+        if store_masks and store_path:
+            findings = scenario.analyze(scenario.execute())
+        else:
+            findings = scenario.iter_findings()
+        scenario.show(findings, display_formats)
+        if store_path:
+            save_results(store_path, scenario, device_group=cls_path[0][1].stem)
         if html_report:
             logger.info("Saving analysis results as HTML report")
+            models_count = {
+                model_cls: len(instances)
+                for (model_cls, _), instances in zip(cls_path, models_data)
+            }
             html_code = export_as_html(
-                scenario.analysis_results,
-                scenario.execution_results,
-                scenario.checks,
+                [scenario],
+                device_group=cls_path[0][1].stem,
+                address_groups_count=models_count.get(AddressGroup, 0),
+                address_objects_count=models_count.get(AddressObject, 0),
+                total_policies=models_count.get(SecurityRule, 0),
             )
             file_path = Path("report.html")
             file_path.write_text(html_code)
@@ -3,6 +3,7 @@ from typing import Literal, Optional
 
 import urllib3
 from requests import RequestException, Session
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
@@ -10,6 +11,11 @@ logger = logging.getLogger(__name__)
 class PanoramaConnector:
     """Connect to Panorama and retrieve objects using REST API.
 
+    A connector can be used by many threads at once. They share a single
+    ``Session``, which is only read after authentication: the token is
+    set once in its headers, connections are taken from a thread-safe
+    pool of urllib3 and its cookie jar is guarded by a lock.
+
     Args:
         hostname: Panorama hostname or IP address
         username: API username
@@ -18,6 +24,9 @@ class PanoramaConnector:
         verify_ssl: Whether to verify SSL certificates
         api_version: REST API version (default: v1)
         timeout: Request timeout in seconds
+        max_connections: Number of kept-alive connections. Requests made
+            from more threads at once wait for a free connection.
+        scheme: Protocol of the API, ``http`` only for local testing.
     """
 
     def __init__(
@@ -29,6 +38,8 @@ class PanoramaConnector:
         verify_ssl: bool = False,
         api_version: str = "v1",
         timeout: int = 60,
+        max_connections: int = 10,
+        scheme: Literal["https", "http"] = "https",
     ):
         self.hostname = hostname
         self.port = port
@@ -39,7 +50,8 @@ class PanoramaConnector:
             )
         self.verify_ssl = verify_ssl
         self.api_version = api_version
-        self.base_url = f"https://{hostname}:{port}/restapi/{api_version}"
+        self.scheme = scheme
+        self.base_url = f"{scheme}://{hostname}:{port}/restapi/{api_version}"
         self.headers = {
             "Content-Type": "application/json",
             "Accept": "application/json",
@@ -47,6 +59,10 @@ class PanoramaConnector:
         self.token = None
         self.timeout = timeout
         self.session = Session()
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=max_connections, pool_block=True
+        )
+        self.session.mount(f"{scheme}://", adapter)
 
         self._authenticate(username, password)
 
@@ -54,7 +70,7 @@ class PanoramaConnector:
         """Authenticate to Panorama REST API and get token."""
         try:
             response = self.session.post(
-                f"https://{self.hostname}:{self.port}/api/?type=keygen",
+                f"{self.scheme}://{self.hostname}:{self.port}/api/?type=keygen",
                 data={"user": username, "password": password},
                 headers={"Content-Type": "application/x-www-form-urlencoded"},
                 verify=self.verify_ssl,
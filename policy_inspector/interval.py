@@ -0,0 +1,382 @@
+import re
+from bisect import bisect_right
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import Literal, Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+IntervalBackend = Literal["tree", "array"]
+"""Search of intervals of many rules, ``IntervalTree`` or ``IntervalArray``."""
+
+Interval = tuple[int, int]
+"""Inclusive ``(start, end)`` bounds of IPv4 addresses as integers."""
+
+Intervals = tuple[Interval, ...]
+"""Sorted, non-overlapping and non-adjacent intervals."""
+
+_MAX_END = 1 << 32
+
+_IP_LITERAL = re.compile(r"([0-9.]+)(?:/([0-9]{1,2})|-([0-9.]+))?")
+
+
+def parse_ipv4(text: str) -> Optional[int]:
+    """Convert dotted IPv4 address to integer.
+
+    Returns:
+        ``None`` if ``text`` isn't an address in canonical form, e.g. it has
+        leading zeros.
+    """
+    octets = text.split(".")
+    if len(octets) != 4:
+        return None
+    address = 0
+    for octet in octets:
+        if not 0 < len(octet) <= 3 or (len(octet) > 1 and octet[0] == "0"):
+            return None
+        number = int(octet)
+        if number > 255:
+            return None
+        address = address << 8 | number
+    return address
+
+
+@lru_cache(maxsize=1 << 16)
+def parse_ip_literal(value: str) -> Optional[tuple[Interval, Optional[int]]]:
+    """Parse IPv4 network, like ``10.0.0.0/8``, or range, like
+    ``10.1.1.1-10.1.1.20``, without trying to construct any objects.
+
+    Host bits of a network are cleared and an address without prefix
+    length is a single host network.
+
+    Returns:
+        Interval of the value and prefix length of a network, ``None``
+        for a range. ``None`` if value isn't a literal in canonical form.
+    """
+    match = _IP_LITERAL.fullmatch(value)
+    if match is None:
+        return None
+    address, prefix, last = match.groups()
+    start = parse_ipv4(address)
+    if start is None:
+        return None
+    if last is not None:
+        end = parse_ipv4(last)
+        if end is None or end < start:
+            return None
+        return (start, end), None
+    prefix = 32 if prefix is None else int(prefix)
+    if prefix > 32:
+        return None
+    size = 1 << (32 - prefix)
+    start &= ~(size - 1)
+    return (start, start + size - 1), prefix
+
+
+def require_numpy(name: str) -> None:
+    """Raise ``ImportError`` if the optional ``numpy`` isn't installed."""
+    if np is None:
+        raise ImportError(
+            f"{name} requires numpy, install 'policy-inspector[numpy]'"
+        )
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> Intervals:
+    """Sort given intervals and merge the overlapping or adjacent ones."""
+    merged: list[list[int]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return tuple((start, end) for start, end in merged)
+
+
+def covers(intervals: Intervals, other: Intervals) -> bool:
+    """Check if every interval of ``other`` is inside one of ``intervals``.
+
+    Both arguments have to be merged. Each interval of ``other`` is looked up
+    with a binary search, starting from the position of the previous one.
+    """
+    k = 0
+    for start, end in other:
+        k = bisect_right(intervals, (start, _MAX_END), k) - 1
+        if k < 0 or end > intervals[k][1]:
+            return False
+    return True
+
+
+def intersect_intervals(intervals: Intervals, other: Intervals) -> Intervals:
+    """Return intervals covered by both arguments, which have to be merged."""
+    result = []
+    i = j = 0
+    while i < len(intervals) and j < len(other):
+        start = max(intervals[i][0], other[j][0])
+        end = min(intervals[i][1], other[j][1])
+        if start <= end:
+            result.append((start, end))
+        if intervals[i][1] < other[j][1]:
+            i += 1
+        else:
+            j += 1
+    return tuple(result)
+
+
+def subtract_intervals(intervals: Intervals, other: Intervals) -> Intervals:
+    """Return parts of ``intervals`` not covered by ``other``.
+
+    Both arguments have to be merged.
+    """
+    result = []
+    j = 0
+    for start, end in intervals:
+        while j < len(other) and other[j][1] < start:
+            j += 1
+        k = j
+        while k < len(other) and other[k][0] <= end:
+            if other[k][0] > start:
+                result.append((start, other[k][0] - 1))
+            start = other[k][1] + 1
+            k += 1
+        if start <= end:
+            result.append((start, end))
+    return tuple(result)
+
+
+class IntervalTree:
+    """Centered interval tree answering which intervals contain a given one.
+
+    Args:
+        items: ``(start, end, key)`` tuples, where ``key`` is any integer
+            identifying the interval's owner.
+    """
+
+    __slots__ = (
+        "center",
+        "by_start",
+        "starts",
+        "by_end",
+        "ends",
+        "left",
+        "right",
+    )
+
+    def __init__(self, items: Iterable[tuple[int, int, int]]):
+        items = list(items)
+        self.left: Optional[IntervalTree] = None
+        self.right: Optional[IntervalTree] = None
+        if not items:
+            self.center = 0
+            self.by_start = self.by_end = []
+            self.starts = self.ends = []
+            return
+        points = sorted(
+            point for start, end, _ in items for point in (start, end)
+        )
+        self.center = points[len(points) // 2]
+        left, right, here = [], [], []
+        for item in items:
+            if item[1] < self.center:
+                left.append(item)
+            elif item[0] > self.center:
+                right.append(item)
+            else:
+                here.append(item)
+        self.by_start = sorted(here)
+        self.starts = [item[0] for item in self.by_start]
+        self.by_end = sorted(here, key=lambda item: -item[1])
+        self.ends = [-item[1] for item in self.by_end]
+        if left:
+            self.left = IntervalTree(left)
+        if right:
+            self.right = IntervalTree(right)
+
+    def containing(self, start: int, end: int) -> int:
+        """Return bitset of keys whose interval contains ``(start, end)``."""
+        result = 0
+        node = self
+        while node is not None:
+            center = node.center
+            if end <= center:
+                # Every interval here ends at or after the center
+                count = bisect_right(node.starts, start)
+                for item in node.by_start[:count]:
+                    result |= 1 << item[2]
+                node = node.left
+            elif start >= center:
+                # Every interval here starts at or before the center
+                count = bisect_right(node.ends, -end)
+                for item in node.by_end[:count]:
+                    result |= 1 << item[2]
+                node = node.right
+            else:
+                count = bisect_right(node.starts, start)
+                for item in node.by_start[:count]:
+                    if item[1] >= end:
+                        result |= 1 << item[2]
+                node = None
+        return result
+
+
+def _to_bitset(keys: list[int]) -> int:
+    buffer = bytearray((max(keys, default=0) >> 3) + 1)
+    for key in keys:
+        buffer[key >> 3] |= 1 << (key & 7)
+    return int.from_bytes(buffer, "little")
+
+
+class IntervalGrid:
+    """Uniform grid over pairs of IPv4 addresses, e.g. source × destination.
+
+    Region of every key is a product of its ``x`` and ``y`` intervals, so a
+    cell's bitset is an AND of bitsets of its column and its row, and only
+    those are stored. Keys without intervals on an axis are unbounded on it,
+    as are keys whose intervals span more than ``limit`` cells of the axis,
+    e.g. of ``0.0.0.0/0``, so their cells aren't stored one by one.
+
+    Args:
+        items: ``(x_intervals, y_intervals)`` tuples, key is their position.
+        bits: Number of address bits used to select a column or a row.
+        limit: Number of cells of a key's intervals stored on an axis.
+    """
+
+    __slots__ = ("shift", "all", "columns", "rows", "unbounded")
+
+    def __init__(
+        self,
+        items: Iterable[tuple[Intervals, Intervals]],
+        bits: int = 16,
+        limit: int = 1024,
+    ):
+        self.shift = 32 - bits
+        size = 0
+        keys: tuple[dict[int, list[int]], ...] = ({}, {})
+        unbounded: tuple[list[int], ...] = ([], [])
+        for key, region in enumerate(items):
+            size = key + 1
+            for axis, intervals in enumerate(region):
+                if not intervals or self._count(intervals) > limit:
+                    unbounded[axis].append(key)
+                    continue
+                for cell in self._cells(intervals):
+                    keys[axis].setdefault(cell, []).append(key)
+        self.all = (1 << size) - 1
+        self.columns, self.rows = (
+            {cell: _to_bitset(cell_keys) for cell, cell_keys in axis.items()}
+            for axis in keys
+        )
+        self.unbounded = tuple(_to_bitset(axis) for axis in unbounded)
+
+    def _count(self, intervals: Intervals) -> int:
+        shift = self.shift
+        return sum(
+            (end >> shift) - (start >> shift) + 1 for start, end in intervals
+        )
+
+    def _cells(self, intervals: Intervals) -> set[int]:
+        shift = self.shift
+        return {
+            cell
+            for start, end in intervals
+            for cell in range(start >> shift, (end >> shift) + 1)
+        }
+
+    def containing(self, x_intervals: Intervals, y_intervals: Intervals) -> int:
+        """Return bitset of keys whose region can contain the given one.
+
+        Such region has to overlap cells at all corners of each rectangle of
+        the given region. Empty intervals leave the axis unconstrained.
+        The result is a superset of keys whose region contains it.
+        """
+        result = self.all
+        shift = self.shift
+        for intervals, cells, unbounded in zip(
+            (x_intervals, y_intervals),
+            (self.columns, self.rows),
+            self.unbounded,
+        ):
+            for start, end in intervals:
+                result &= (
+                    cells.get(start >> shift, 0) & cells.get(end >> shift, 0)
+                ) | unbounded
+                if not result:
+                    return 0
+        return result
+
+    def overlapping(
+        self,
+        x_intervals: Intervals,
+        y_intervals: Intervals,
+        limit: int = 1024,
+    ) -> int:
+        """Return bitset of keys whose region can overlap the given one.
+
+        Such region has to overlap at least one of cells of the given region.
+        Axis with empty intervals or spanning more than ``limit`` cells
+        is left unconstrained. The result is a superset of keys whose region
+        overlaps it.
+        """
+        result = self.all
+        for intervals, cells, unbounded in zip(
+            (x_intervals, y_intervals),
+            (self.columns, self.rows),
+            self.unbounded,
+        ):
+            if not intervals or self._count(intervals) > limit:
+                continue
+            axis = unbounded
+            for cell in self._cells(intervals):
+                axis |= cells.get(cell, 0)
+            result &= axis
+        return result
+
+
+class IntervalArray:
+    """Intervals of many keys in flat NumPy arrays, sorted by start.
+
+    It answers which keys contain all given intervals with a few vectorised
+    operations: a binary search selects intervals starting early enough,
+    and their ends are compared all at once.
+
+    Requires ``numpy``, from the ``numpy`` extra.
+
+    Args:
+        items: Merged intervals of every key, key is their position.
+    """
+
+    __slots__ = ("size", "starts", "ends", "keys")
+
+    def __init__(self, items: Iterable[Intervals]):
+        require_numpy(self.__class__.__name__)
+        starts: list[int] = []
+        ends: list[int] = []
+        keys: list[int] = []
+        size = 0
+        for key, intervals in enumerate(items):
+            size = key + 1
+            for start, end in intervals:
+                starts.append(start)
+                ends.append(end)
+                keys.append(key)
+        self.size = size
+        order = np.argsort(np.array(starts, dtype=np.uint32), kind="stable")
+        self.starts = np.array(starts, dtype=np.uint32)[order]
+        self.ends = np.array(ends, dtype=np.uint32)[order]
+        self.keys = np.array(keys, dtype=np.intp)[order]
+
+    def containing(self, intervals: Intervals) -> int:
+        """Return bitset of keys whose intervals contain all ``intervals``."""
+        selected = np.ones(self.size, dtype=bool)
+        for start, end in intervals:
+            count = np.searchsorted(self.starts, start, side="right")
+            found = np.zeros(self.size, dtype=bool)
+            found[self.keys[:count][self.ends[:count] >= end]] = True
+            selected &= found
+            if not selected.any():
+                return 0
+        packed = np.packbits(selected, bitorder="little")
+        return int.from_bytes(packed.tobytes(), "little")
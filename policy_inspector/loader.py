@@ -1,8 +1,23 @@
 import csv
+import inspect
 import json
 import logging
+import re
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import chain
 from pathlib import Path
-from typing import TYPE_CHECKING, Callable, Optional, TypeVar
+from typing import IO, TYPE_CHECKING, Any, Callable, Optional, TypeVar
+
+from pydantic import ValidationError
+
+from policy_inspector.model.base import (
+    BATCH_SIZE,
+    iter_batches,
+    paused_gc,
+    shift_errors,
+)
 
 if TYPE_CHECKING:
     from policy_inspector.model.base import MainModel
@@ -12,7 +27,7 @@ logger = logging.getLogger(__name__)
 ModelClass = TypeVar("ModelClass", bound="MainModel")
 """Type variable for model classes derived from MainModel."""
 
-Elements = list[dict]
+Elements = Iterable[dict]
 LoaderFunc = Callable[[Path], Elements]
 ParserFunc = Callable[[Elements], list[ModelClass]]
 
@@ -27,26 +42,224 @@ def load_json(
     return json.loads(file_path.read_text(encoding=encoding))
 
 
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class JSONArrayReader:
+    """Decode elements of a top-level JSON array from a text file.
+
+    File is read in chunks and only an unconsumed part of the last chunks
+    is buffered, so memory is bounded by the size of the largest element.
+
+    Args:
+        file: File opened in text mode.
+        chunk_size: Number of characters read at once.
+    """
+
+    decoder = json.JSONDecoder()
+
+    def __init__(self, file: IO[str], chunk_size: int):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+
+    def read(self, size: int) -> bool:
+        """Append next ``size`` characters to the buffer.
+
+        Returns:
+            ``False`` if the end of the file was reached.
+        """
+        chunk = self.file.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.position :] + chunk
+        self.position = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return next character, empty at the end."""
+        while True:
+            self.position = WHITESPACE.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.read(self.chunk_size):
+                return ""
+
+    def expect(self, characters: str) -> str:
+        """Consume next character, if it's one of ``characters``."""
+        character = self.peek()
+        if not character or character not in characters:
+            found = repr(character) if character else "end of file"
+            raise ValueError(
+                f"Expected one of {characters!r} in '{self.file.name}', "
+                f"found {found}"
+            )
+        self.position += 1
+        return character
+
+    def decode(self) -> Any:
+        """Decode next JSON value, reading as many chunks as it needs."""
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if not self.read(size):
+                    raise
+                size *= 2
+                continue
+            # Value ending with the buffer, like a number, may continue
+            if end < len(self.buffer) or not self.read(size):
+                self.position = end
+                return value
+
+    def __iter__(self) -> Iterator[Any]:
+        self.expect("[")
+        if self.peek() == "]":
+            self.position += 1
+        else:
+            while True:
+                yield self.decode()
+                if self.expect(",]") == "]":
+                    break
+        if self.peek():
+            raise ValueError(f"Extra data after array in '{self.file.name}'")
+
+
+def iter_json(
+    file_path: Path,
+    encoding: str = "utf-8",
+    chunk_size: int = 1 << 16,
+) -> Iterator[dict]:
+    """Yield elements of a top-level array in JSON file, one by one.
+
+    Unlike ``load_json``, neither whole text nor all elements are kept
+    in memory, so exports larger than available memory can be parsed.
+
+    Raises:
+        ValueError: If the file doesn't contain a valid JSON array.
+    """
+    with file_path.open(encoding=encoding) as file:
+        yield from JSONArrayReader(file, chunk_size)
+
+
 def load_csv(
     file_path: Path,
     encoding: str = "utf-8",
-) -> Elements:
-    """Loads CSV file from given file_path and return it's content."""
+) -> Iterator[dict]:
+    """Yield rows of CSV file from given file_path, one by one.
+
+    The file is closed once all rows were read or the generator is closed.
+    """
     # csv.field_size_limit(sys.maxsize)
-    return list(
-        csv.DictReader(file_path.open(encoding=encoding), dialect="excel")
-    )
+    with file_path.open(encoding=encoding, newline="") as file:
+        yield from csv.DictReader(file, dialect="excel")
 
 
-loaders: dict[str, LoaderFunc] = {"json": load_json, "csv": load_csv}
+loaders: dict[str, LoaderFunc] = {"json": iter_json, "csv": load_csv}
 """Mapping of file extensions to example loading functions."""
 
 
+def get_loader(file_path: Path) -> LoaderFunc:
+    """Return loading function for extension of the ``file_path``."""
+    ext = file_path.suffix.lower().lstrip(".")
+    if ext not in loaders:
+        raise ValueError(f"Unsupported file type: {ext}")
+    return loaders[ext]
+
+
+def load_chunks(
+    file_path: Path,
+    chunk_size: int = BATCH_SIZE,
+    loader_func: Optional[LoaderFunc] = None,
+) -> Iterator[list[dict]]:
+    """Yield elements of given file in lists of ``chunk_size`` elements.
+
+    Chunks can be parsed separately, e.g. by parallel workers, while
+    the file is still being read.
+    """
+    loader_func = loader_func or get_loader(file_path)
+    return iter_batches(loader_func(file_path), chunk_size)
+
+
+def _parse_chunk(
+    parser_func: ParserFunc,
+    chunk: list[dict],
+    start: Optional[int],
+) -> list[ModelClass]:
+    if start is None:
+        return parser_func(chunk)
+    return parser_func(chunk, start=start)
+
+
+def _receive_chunk(offset: int, future: Future) -> list[ModelClass]:
+    """Return models of a chunk, whose first element is at ``offset``."""
+    try:
+        return future.result()
+    except ValidationError as ex:
+        raise shift_errors(ex, offset) from None
+
+
+def parse_parallel(
+    parser_func: ParserFunc,
+    elements: Elements,
+    jobs: int,
+    chunk_size: int = BATCH_SIZE,
+) -> list[ModelClass]:
+    """Parse chunks of ``elements`` with ``parser_func`` in a pool of processes.
+
+    Parsers with a ``start`` argument get position of the first element
+    of a chunk, so numbering of models is the same as in a single call.
+    Locations of validation errors start with positions in ``elements``.
+    Only a few chunks are sent to workers at once and models are returned
+    in order of elements. A single chunk is parsed in this process.
+    Models of workers are unpickled in a thread of the pool, so the
+    garbage collector is paused until all of them are received.
+
+    Args:
+        parser_func: Picklable parser, like a ``parse_json`` of a model.
+        elements: Elements to parse.
+        jobs: Number of worker processes.
+        chunk_size: Number of elements parsed by a single call.
+    """
+    numbered = "start" in inspect.signature(parser_func).parameters
+    chunks = iter_batches(elements, chunk_size)
+    first = next(chunks, [])
+    second = next(chunks, None)
+    if second is None:
+        return _parse_chunk(parser_func, first, 1 if numbered else None)
+
+    models = []
+    pending = deque()
+    start = 1
+    with paused_gc(), ProcessPoolExecutor(max_workers=jobs) as executor:
+        for chunk in chain((first, second), chunks):
+            if len(pending) > 2 * jobs:
+                models.extend(_receive_chunk(*pending.popleft()))
+            future = executor.submit(
+                _parse_chunk,
+                parser_func,
+                chunk,
+                start if numbered else None,
+            )
+            pending.append((start - 1, future))
+            start += len(chunk)
+        while pending:
+            models.extend(_receive_chunk(*pending.popleft()))
+    return models
+
+
 def load_model(
     model_cls: type[ModelClass],
     file_path: Path,
     loader_func: Optional[LoaderFunc] = None,
     parser_func: Optional[ParserFunc] = None,
+    jobs: int = 1,
+    chunk_size: int = BATCH_SIZE,
 ) -> list[ModelClass]:
     """Load given file and create instances of the specified model class.
 
@@ -55,6 +268,9 @@ def load_model(
         file_path: The path to the JSON or CSV file containing the example.
         loader_func: Optional function to load ``file_path`` file.
         parser_func: Optional function to parse items from file to ``model_cls``.
+        jobs: Number of processes parsing chunks of elements, see
+            ``parse_parallel``.
+        chunk_size: Number of elements in a chunk parsed by a process.
 
     Returns:
         A list of instances of the specified model class.
@@ -62,11 +278,7 @@ def load_model(
     ext = file_path.suffix.lower().lstrip(".")
 
     if not loader_func:
-        if ext not in loaders:
-            raise ValueError(f"Unsupported file type: {ext}")
-        loader_func = loaders[ext]
-
-    items = loader_func(file_path)
+        loader_func = get_loader(file_path)
 
     if not parser_func:
         parser_name = f"{parser_suffix}{ext}"
@@ -74,7 +286,11 @@ def load_model(
         if parser_func is None:
             raise ValueError(f"{model_cls.__name__} lacks {parser_name} method")
 
-    return parser_func(items)
+    if jobs > 1:
+        return parse_parallel(
+            parser_func, loader_func(file_path), jobs, chunk_size
+        )
+    return parser_func(loader_func(file_path))
 
 
 def save_json(items: list, filename: str) -> Path:
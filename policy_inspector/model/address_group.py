@@ -1,4 +1,5 @@
-from typing import ClassVar
+from collections.abc import Iterable, Iterator
+from typing import ClassVar, Optional
 
 from pydantic import Field
 
@@ -13,40 +14,50 @@ class AddressGroup(MainModel):
     description: str = Field(default="")
     tag: SetStr = Field(default_factory=set)
     static: SetStr = Field(default_factory=set)
+    dynamic: Optional[str] = Field(
+        default=None,
+        description="Filter of tags of members of a dynamic address group.",
+    )
 
     @classmethod
-    def parse_json(cls, elements: list[dict]) -> list["AddressGroup"]:
+    def parse_json(cls, elements: Iterable[dict]) -> list["AddressGroup"]:
         """Map a JSON object to an AddressGroup."""
         mapping = {"@name": "name"}
         list_fields = ("tag", "static")
-        address_groups = []
-        for data in elements:
-            parsed = {}
-            for key, value in data.items():
-                mapped_key = mapping.get(key, key)
-                key_value = value
-                if mapped_key in list_fields:
-                    members = key_value.get("member", [])
-                    key_value = set(members) if members else set()
-                parsed[mapped_key] = key_value
-            address_groups.append(cls(**parsed))
-        return address_groups
+
+        def iter_items() -> Iterator[dict]:
+            for data in elements:
+                parsed = {}
+                for key, value in data.items():
+                    mapped_key = mapping.get(key, key)
+                    key_value = value
+                    if mapped_key in list_fields:
+                        members = key_value.get("member", [])
+                        key_value = set(members) if members else set()
+                    elif mapped_key == "dynamic":
+                        key_value = key_value.get("filter")
+                    parsed[mapped_key] = key_value
+                yield parsed
+
+        return cls.validate_many(iter_items())
 
     @classmethod
-    def parse_csv(cls, elements: list[dict]) -> list["AddressGroup"]:
+    def parse_csv(cls, elements: Iterable[dict]) -> list["AddressGroup"]:
         """Map a JSON object to an AddressObject."""
         mapping = {"Name": "name", "Addresses": "static", "Tags": "tag"}
         list_fields = ("tag", "static")
-        address_groups = []
-        for data in elements:
-            parsed = {}
-            for key, value in data.items():
-                mapped_key = mapping.get(key, key)
-                if not mapped_key:
-                    continue
-                key_value = value
-                if mapped_key in list_fields:
-                    key_value = set(value.split(";")) if value else set()
-                parsed[mapped_key] = key_value
-            address_groups.append(cls(**parsed))
-        return address_groups
+
+        def iter_items() -> Iterator[dict]:
+            for data in elements:
+                parsed = {}
+                for key, value in data.items():
+                    mapped_key = mapping.get(key, key)
+                    if not mapped_key:
+                        continue
+                    key_value = value
+                    if mapped_key in list_fields:
+                        key_value = set(value.split(";")) if value else set()
+                    parsed[mapped_key] = key_value
+                yield parsed
+
+        return cls.validate_many(iter_items())
@@ -1,10 +1,12 @@
 import logging
+from collections.abc import Iterable, Iterator
 from ipaddress import IPv4Address, IPv4Network
-from typing import ClassVar, Union
+from typing import Any, ClassVar, Optional, Union
 
-from pydantic import Field, field_validator
+from pydantic import Field, PrivateAttr, ValidationError, field_validator
 
-from policy_inspector.model.base import MainModel
+from policy_inspector.interval import Interval
+from policy_inspector.model.base import BATCH_SIZE, MainModel, relocate_errors
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +21,13 @@ class AddressObject(MainModel):
     description: str = Field(default="", description="Object description")
     tags: set[str] = Field(default_factory=set, description="Tags")
 
+    _interval: Optional[Interval] = PrivateAttr(default=None)
+
+    @property
+    def interval(self) -> Optional[Interval]:
+        """Integer ``(start, end)`` bounds of addresses or ``None`` if not an IP."""
+        return self._interval
+
     def __str__(self):
         return f"{self.name}[{str(getattr(self, 'value', ''))}]"
 
@@ -26,10 +35,57 @@ class AddressObject(MainModel):
         return self.__str__()
 
     def is_covered_by(self, other: "AddressObject") -> bool:
-        raise NotImplementedError("To be implement in child class")
+        """Check if this object's addresses are inside ``other`` object's ones.
+
+        Returns:
+            True if both objects are IP addresses and ``interval`` of this
+            object is inside ``interval`` of ``other``.
+        """
+        interval = self._interval
+        other_interval = other._interval
+        if interval is None or other_interval is None:
+            return False
+        return (
+            other_interval[0] <= interval[0]
+            and interval[1] <= other_interval[1]
+        )
+
+    @staticmethod
+    def validate_by_type(
+        items: Iterable[tuple[type["AddressObject"], dict]],
+        batch_size: int = BATCH_SIZE,
+    ) -> list["AddressObject"]:
+        """Validate items of each subclass in batches, keeping their order.
+
+        Raises:
+            pydantic.ValidationError: Location of errors starts with
+                position of an invalid item in ``items``.
+        """
+        address_objects: list[Optional[AddressObject]] = []
+        pending: dict[type[AddressObject], tuple[list[int], list[dict]]] = {}
+
+        def flush(subclass: type[AddressObject]) -> None:
+            positions, batch = pending.pop(subclass)
+            try:
+                models = subclass.validate_many(batch, batch_size)
+            except ValidationError as ex:
+                raise relocate_errors(ex, positions.__getitem__) from None
+            for position, model in zip(positions, models):
+                address_objects[position] = model
+
+        for subclass, data in items:
+            positions, batch = pending.setdefault(subclass, ([], []))
+            positions.append(len(address_objects))
+            batch.append(data)
+            address_objects.append(None)
+            if len(batch) >= batch_size:
+                flush(subclass)
+        for subclass in list(pending):
+            flush(subclass)
+        return address_objects
 
     @classmethod
-    def parse_json(cls, elements: list[dict]) -> list["AddressObject"]:
+    def parse_json(cls, elements: Iterable[dict]) -> list["AddressObject"]:
         """Parse JSON data from PAN-OS API response"""
         type_map = {
             "ip-netmask": AddressObjectIPNetwork,
@@ -37,52 +93,55 @@ class AddressObject(MainModel):
             "fqdn": AddressObjectFQDN,
         }
 
-        address_objects = []
-        for data in elements:
-            key_name = next(k for k in type_map if k in data)
-            subclass = type_map[key_name]
-
-            data_tag: Union[dict, None] = data.get("tag", None)
-            if not data_tag:
-                tags = set()
-            else:
-                tags = set(data_tag.get("member", []))
-
-            model = subclass(
-                name=data.get("@name"),
-                value=data[key_name],
-                description=data.get("description", ""),
-                tags=tags,
-            )
-            address_objects.append(model)
-        return address_objects
+        def iter_items() -> Iterator[tuple[type[AddressObject], dict]]:
+            for data in elements:
+                key_name = next(k for k in type_map if k in data)
+                subclass = type_map[key_name]
+
+                data_tag: Union[dict, None] = data.get("tag", None)
+                if not data_tag:
+                    tags = set()
+                else:
+                    tags = set(data_tag.get("member", []))
+
+                parsed = {
+                    "name": data.get("@name"),
+                    "value": data[key_name],
+                    "description": data.get("description", ""),
+                    "tags": tags,
+                }
+                yield subclass, parsed
+
+        return cls.validate_by_type(iter_items())
 
     @classmethod
-    def parse_csv(cls, elements: list[dict]) -> list["AddressObject"]:
+    def parse_csv(cls, elements: Iterable[dict]) -> list["AddressObject"]:
         """Parse CSV row from spreadsheet import"""
-        address_objects = []
-        for data in elements:
-            type_map = {
-                "IP Address": AddressObjectIPNetwork,
-                "IP Range": AddressObjectIPRange,
-                "FQDN": AddressObjectFQDN,
-            }
-            addr_type = data.get("Type", "")
-            try:
-                subclass = type_map[addr_type]
-            except KeyError as ex:
-                raise ValueError(f"Unknown 'Type'='{addr_type}'") from ex
-
-            tags = data.get("Tag", "")
-            tags = tags.split(";") if tags else set()
-            model = subclass(
-                name=data["Name"],
-                value=data["Address"],
-                description=data.get("Description", ""),
-                tags=tags,
-            )
-            address_objects.append(model)
-        return address_objects
+        type_map = {
+            "IP Address": AddressObjectIPNetwork,
+            "IP Range": AddressObjectIPRange,
+            "FQDN": AddressObjectFQDN,
+        }
+
+        def iter_items() -> Iterator[tuple[type[AddressObject], dict]]:
+            for data in elements:
+                addr_type = data.get("Type", "")
+                try:
+                    subclass = type_map[addr_type]
+                except KeyError as ex:
+                    raise ValueError(f"Unknown 'Type'='{addr_type}'") from ex
+
+                tags = data.get("Tag", "")
+                tags = tags.split(";") if tags else set()
+                parsed = {
+                    "name": data["Name"],
+                    "value": data["Address"],
+                    "description": data.get("Description", ""),
+                    "tags": tags,
+                }
+                yield subclass, parsed
+
+        return cls.validate_by_type(iter_items())
 
 
 class AddressObjectIPNetwork(AddressObject):
@@ -105,22 +164,10 @@ class AddressObjectIPNetwork(AddressObject):
         except ValueError as ex:
             raise ValueError(f"value '{v}' is not a valid IPv4 network") from ex
 
-    def is_covered_by(self, other: "AddressObject") -> bool:
-        """Check if this network is fully contained within another object.
-
-        Returns:
-            True if either:
-            - Contained within another IP network
-            - Fully inside an IP range
-        """
-        if isinstance(other, AddressObjectIPNetwork):
-            return self.value.subnet_of(other.value)
-        if isinstance(other, AddressObjectIPRange):
-            return (
-                self.value.network_address >= other.value[0]
-                and self.value.broadcast_address <= other.value[1]
-            )
-        return False
+    def model_post_init(self, context: Any) -> None:
+        # Cheaper than building ``broadcast_address``
+        start = int(self.value.network_address)
+        self._interval = (start, start | (1 << 32 - self.value.prefixlen) - 1)
 
 
 class AddressObjectIPRange(AddressObject):
@@ -153,26 +200,8 @@ class AddressObjectIPRange(AddressObject):
             raise ValueError("last IP address must be greater than first")
         return v
 
-    def is_covered_by(self, other: "AddressObject") -> bool:
-        """Check if this range is fully contained within another object.
-
-        Returns:
-            True if either:
-            - Fully inside another IP network
-            - Contained within another IP range
-        """
-        if isinstance(other, AddressObjectIPNetwork):
-            network_start = other.value.network_address
-            network_end = other.value.broadcast_address
-            return (
-                self.value[0] >= network_start and self.value[1] <= network_end
-            )
-        if isinstance(other, AddressObjectIPRange):
-            return (
-                self.value[0] >= other.value[0]
-                and self.value[1] <= other.value[1]
-            )
-        return False
+    def model_post_init(self, context: Any) -> None:
+        self._interval = (int(self.value[0]), int(self.value[1]))
 
 
 class AddressObjectFQDN(AddressObject):
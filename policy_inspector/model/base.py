@@ -1,7 +1,12 @@
+import gc
 import logging
-from typing import ClassVar, Literal, Optional
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from functools import cache
+from itertools import islice
+from typing import Any, ClassVar, Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
 AnyObj = "any"
 AnyObjType = set[Literal["any"]]
@@ -11,6 +16,66 @@ SetStr = set[str]
 Action = Literal["allow", "deny", "monitor"]
 logger = logging.getLogger(__name__)
 
+BATCH_SIZE = 10_000
+"""Number of items validated by a single validator call."""
+
+
+@contextmanager
+def paused_gc() -> Iterator[None]:
+    """Pause the cyclic garbage collector, e.g. while creating many objects.
+
+    Newly created objects are not garbage, but their number triggers
+    collections, which traverse all of them again and again.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def iter_batches(items: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    """Split ``items`` into lists of ``size`` items, the last may be shorter."""
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+@cache
+def get_list_adapter(model_cls: type[BaseModel]) -> TypeAdapter:
+    """Return ``TypeAdapter`` validating a list of ``model_cls`` instances."""
+    return TypeAdapter(list[model_cls])
+
+
+def relocate_errors(
+    error: ValidationError, locate: Callable[[int], int]
+) -> ValidationError:
+    """Return ``error`` of a batch with positions of items mapped by ``locate``.
+
+    Errors keep their types and context, so they can be pickled, e.g. by
+    a worker process, and relocated again.
+    """
+    line_errors = []
+    for details in error.errors():
+        line_error = {
+            "type": details["type"],
+            "loc": (locate(details["loc"][0]), *details["loc"][1:]),
+            "input": details["input"],
+        }
+        if "ctx" in details:
+            line_error["ctx"] = details["ctx"]
+        line_errors.append(line_error)
+    return ValidationError.from_exception_data(error.title, line_errors)
+
+
+def shift_errors(error: ValidationError, offset: int) -> ValidationError:
+    """Return ``error`` of a batch with positions of items moved by ``offset``."""
+    if not offset:
+        return error
+    return relocate_errors(error, lambda position: position + offset)
+
 
 class MainModel(BaseModel):
     """Base class for all models."""
@@ -19,3 +84,33 @@ class MainModel(BaseModel):
     """Display name of a single model."""
     plural: ClassVar[Optional[str]] = None
     """Display name of a many models."""
+
+    @classmethod
+    def validate_many(
+        cls,
+        items: Iterable[dict[str, Any]],
+        batch_size: int = BATCH_SIZE,
+    ) -> list[Any]:
+        """Validate ``items`` into instances, a batch per validator call.
+
+        ``items`` can be a generator, only a single batch of them is kept.
+        The garbage collector is paused only while a batch is validated.
+
+        Raises:
+            pydantic.ValidationError: Location of errors starts with
+                position of an invalid item in ``items``.
+        """
+        adapter = get_list_adapter(cls)
+        iterator = iter(items)
+        models = []
+        offset = 0
+        while True:
+            with paused_gc():
+                batch = list(islice(iterator, batch_size))
+                if not batch:
+                    return models
+                try:
+                    models.extend(adapter.validate_python(batch))
+                except ValidationError as ex:
+                    raise shift_errors(ex, offset) from None
+            offset += len(batch)
@@ -0,0 +1,131 @@
+import sys
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Optional
+
+from policy_inspector.model.base import AnyObj
+
+if TYPE_CHECKING:
+    from policy_inspector.model.security_rule import SecurityRule
+
+
+class SetInterner:
+    """Canonical frozensets of values, each with a small integer id.
+
+    Equal sets interned by the same interner are the same object and have
+    the same id, so ids can be compared and hashed instead of the sets.
+    """
+
+    def __init__(self):
+        self.ids: dict[frozenset[str], int] = {}
+        self.sets: list[frozenset[str]] = []
+
+    def intern(self, values: Iterable[str]) -> tuple[frozenset[str], int]:
+        """Return canonical frozenset of ``values`` and its id."""
+        values = frozenset(values)
+        set_id = self.ids.get(values)
+        if set_id is None:
+            set_id = self.ids[values] = len(self.sets)
+            self.sets.append(values)
+        return self.sets[set_id], set_id
+
+    def __len__(self) -> int:
+        return len(self.sets)
+
+
+class CompiledRule:
+    """Read-only representation of a ``SecurityRule`` used by checks.
+
+    Attributes have the same names as fields of ``SecurityRule``, but sets
+    are interned frozensets, shared by all rules with the same values.
+    Ids of interned sets are stored in ``*_id`` attributes.
+    Whether a set contains 'any' is stored in ``any_*`` flags.
+    Rule's ``fingerprint`` is computed once, when it's compiled.
+    Resolved addresses of ``AdvancedSecurityRule`` are available with
+    their merged intervals, for other rules they are empty.
+
+    Args:
+        model: Compiled rule.
+        interner: Interner of sets, shared between compiled rules.
+    """
+
+    __slots__ = (
+        "model",
+        "name",
+        "index",
+        "enabled",
+        "action",
+        "source_zones",
+        "destination_zones",
+        "source_addresses",
+        "destination_addresses",
+        "applications",
+        "services",
+        "category",
+        "fingerprint",
+        "source_zones_id",
+        "destination_zones_id",
+        "source_addresses_id",
+        "destination_addresses_id",
+        "applications_id",
+        "services_id",
+        "any_source_zone",
+        "any_destination_zone",
+        "any_source_address",
+        "any_destination_address",
+        "any_application",
+        "resolved_source_addresses",
+        "resolved_destination_addresses",
+        "source_intervals",
+        "destination_intervals",
+    )
+
+    def __init__(
+        self,
+        model: "SecurityRule",
+        interner: Optional[SetInterner] = None,
+    ):
+        if interner is None:
+            interner = SetInterner()
+        intern = interner.intern
+
+        self.model = model
+        self.name = model.name
+        self.index = model.index
+        self.enabled = model.enabled
+        self.action = sys.intern(model.action)
+        self.source_zones, self.source_zones_id = intern(model.source_zones)
+        self.destination_zones, self.destination_zones_id = intern(
+            model.destination_zones
+        )
+        self.source_addresses, self.source_addresses_id = intern(
+            model.source_addresses
+        )
+        self.destination_addresses, self.destination_addresses_id = intern(
+            model.destination_addresses
+        )
+        self.applications, self.applications_id = intern(model.applications)
+        self.services, self.services_id = intern(model.services)
+        self.category = intern(model.category)[0]
+        self.fingerprint = model.fingerprint
+        self.any_source_zone = AnyObj in self.source_zones
+        self.any_destination_zone = AnyObj in self.destination_zones
+        self.any_source_address = AnyObj in self.source_addresses
+        self.any_destination_address = AnyObj in self.destination_addresses
+        self.any_application = AnyObj in self.applications
+        self.resolved_source_addresses = getattr(
+            model, "resolved_source_addresses", None
+        )
+        self.resolved_destination_addresses = getattr(
+            model, "resolved_destination_addresses", None
+        )
+        self.source_intervals = getattr(model, "source_intervals", ())
+        self.destination_intervals = getattr(model, "destination_intervals", ())
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.name!r})"
+
+
+def compile_rules(rules: Iterable["SecurityRule"]) -> list[CompiledRule]:
+    """Compile rules, sharing equal sets and their ids between them."""
+    interner = SetInterner()
+    return [CompiledRule(rule, interner) for rule in rules]
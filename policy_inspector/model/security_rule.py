@@ -1,7 +1,10 @@
+from collections.abc import Iterable, Iterator
+from hashlib import blake2b
 from typing import ClassVar, Optional, Union
 
-from pydantic import Field, PositiveInt
+from pydantic import Field, PositiveInt, PrivateAttr, model_validator
 
+from policy_inspector.interval import Intervals, merge_intervals
 from policy_inspector.model.address_object import (
     AddressObjectFQDN,
     AddressObjectIPNetwork,
@@ -69,9 +72,44 @@ class SecurityRule(MainModel):
         description="URL categories or 'any'",
     )
 
+    fingerprint_fields: ClassVar[tuple[str, ...]] = (
+        "action",
+        "source_zones",
+        "destination_zones",
+        "source_addresses",
+        "destination_addresses",
+        "applications",
+        "services",
+        "category",
+    )
+    """Fields which decide what traffic a rule matches and how it's handled."""
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of ``fingerprint_fields``.
+
+        Rules with the same fingerprint differ only in name, index
+        or whether they are enabled. It's stable between runs.
+        """
+        digest = blake2b(digest_size=16)
+        for field in self.fingerprint_fields:
+            value = getattr(self, field)
+            values = (value,) if isinstance(value, str) else sorted(value)
+            digest.update("\x1f".join(values).encode())
+            digest.update(b"\x1e")
+        return digest.hexdigest()
+
     @classmethod
-    def parse_json(cls, elements: list[dict]) -> list["SecurityRule"]:
-        """Map a JSON object to a SecurityRule."""
+    def parse_json(
+        cls,
+        elements: Iterable[dict],
+        start: int = 1,
+    ) -> list["SecurityRule"]:
+        """Map a JSON object to a SecurityRule.
+
+        Rules are numbered by their position, ``start`` is the ``index``
+        of the first element, e.g. when a chunk of elements is parsed.
+        """
         mapping = {
             "@name": "name",
             "source": "source_addresses",
@@ -83,23 +121,36 @@ class SecurityRule(MainModel):
             "category": "category",
         }
 
-        def extract_value(value):
-            if isinstance(value, dict) and "member" in value:
-                return set(value["member"])
-            return value
+        fields = cls.model_fields.keys()
+
+        def iter_items() -> Iterator[dict]:
+            for index, data in enumerate(elements, start=start):
+                parsed = {}
+                for key, value in data.items():
+                    field = mapping.get(key, key)
+                    if field not in fields:
+                        continue
+                    if isinstance(value, dict) and "member" in value:
+                        value = value["member"]
+                        if isinstance(value, str):
+                            value = (value,)
+                    parsed[field] = value
+                parsed["index"] = index
+                yield parsed
 
-        security_rules = []
-        for index, data in enumerate(elements, start=1):
-            parsed = {
-                mapping.get(k, k): extract_value(v) for k, v in data.items()
-            }
-            parsed["index"] = index
-            security_rules.append(cls(**parsed))
-        return security_rules
+        return cls.validate_many(iter_items())
 
     @classmethod
-    def parse_csv(cls, elements: list[dict]) -> list["SecurityRule"]:
-        """Map a CSV row to a SecurityRule."""
+    def parse_csv(
+        cls,
+        elements: Iterable[dict],
+        start: int = 1,
+    ) -> list["SecurityRule"]:
+        """Map a CSV row to a SecurityRule.
+
+        Rules are numbered by their position, ``start`` is the ``index``
+        of the first element, e.g. when a chunk of elements is parsed.
+        """
         mapping = {
             "Name": "name",
             "Source Address": "source_addresses",
@@ -120,17 +171,18 @@ class SecurityRule(MainModel):
             "category",
         }
 
-        security_rules = []
-        for index, data in enumerate(elements, start=1):
-            parsed_data = {"index": index}
-            for key, value in data.items():
-                mapped_key = mapping.get(key, key)
-                key_value = value
-                if mapped_key in list_fields:
-                    key_value = set(value.split(";")) if value else set()
-                parsed_data[mapped_key] = key_value
-            security_rules.append(cls(**parsed_data))
-        return security_rules
+        def iter_items() -> Iterator[dict]:
+            for index, data in enumerate(elements, start=start):
+                parsed_data = {"index": index}
+                for key, value in data.items():
+                    mapped_key = mapping.get(key, key)
+                    key_value = value
+                    if mapped_key in list_fields:
+                        key_value = set(value.split(";")) if value else set()
+                    parsed_data[mapped_key] = key_value
+                yield parsed_data
+
+        return cls.validate_many(iter_items())
 
 
 AddressObjectTypes = Union[
@@ -149,19 +201,83 @@ class AdvancedSecurityRule(SecurityRule):
         description="Resolved destination to a list of specific Address Objects",
     )
 
+    _source_intervals: Optional[Intervals] = PrivateAttr(default=None)
+    _destination_intervals: Optional[Intervals] = PrivateAttr(default=None)
+
+    @model_validator(mode="after")
+    def set_intervals(self) -> "AdvancedSecurityRule":
+        self._source_intervals = self.get_intervals(
+            self.resolved_source_addresses
+        )
+        self._destination_intervals = self.get_intervals(
+            self.resolved_destination_addresses
+        )
+        return self
+
+    @staticmethod
+    def get_intervals(
+        address_objects: Optional[list[AddressObjectTypes]],
+    ) -> Intervals:
+        """Merge intervals of IP address objects, FQDN objects are skipped."""
+        if not address_objects:
+            return ()
+        return merge_intervals(
+            obj.interval for obj in address_objects if obj.interval is not None
+        )
+
+    @property
+    def source_intervals(self) -> Intervals:
+        """Merged intervals of ``resolved_source_addresses``."""
+        if self._source_intervals is None:
+            self._source_intervals = self.get_intervals(
+                self.resolved_source_addresses
+            )
+        return self._source_intervals
+
+    @property
+    def destination_intervals(self) -> Intervals:
+        """Merged intervals of ``resolved_destination_addresses``."""
+        if self._destination_intervals is None:
+            self._destination_intervals = self.get_intervals(
+                self.resolved_destination_addresses
+            )
+        return self._destination_intervals
+
     @classmethod
     def from_security_rule(
-        cls, rule: SecurityRule, **kwargs
+        cls,
+        rule: SecurityRule,
+        source_intervals: Optional[Intervals] = None,
+        destination_intervals: Optional[Intervals] = None,
+        **kwargs,
     ) -> "AdvancedSecurityRule":
         """Convert a base ``SecurityRule`` to an ``AdvancedSecurityRule``.
 
         Args:
             rule: ``SecurityRule`` instance to convert
+            source_intervals: Merged intervals of resolved source addresses,
+                computed from them when not given.
+            destination_intervals: Same, for destination addresses.
 
         Returns:
             New ``AdvancedSecurityRule`` instance with same field values
+
+        Notes:
+            Values of ``rule`` are already validated, so they are not
+            validated again. ``kwargs`` have to be valid as well.
         """
-        data = rule.model_dump(
-            exclude_none=True,
+        fields_set = rule.model_fields_set | kwargs.keys()
+        advanced = cls.model_construct(
+            fields_set, **{**rule.__dict__, **kwargs}
         )
-        return cls(**data, **kwargs)
+        if source_intervals is None:
+            source_intervals = cls.get_intervals(
+                advanced.resolved_source_addresses
+            )
+        if destination_intervals is None:
+            destination_intervals = cls.get_intervals(
+                advanced.resolved_destination_addresses
+            )
+        advanced._source_intervals = source_intervals
+        advanced._destination_intervals = destination_intervals
+        return advanced
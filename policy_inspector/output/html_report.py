@@ -235,6 +235,29 @@ _FOOTER = """
 """
 
 
+def _checks_results_table(explain, rule, shadowing_rules) -> str:
+    """Build a table with checks results of ``rule`` against each shadowing rule."""
+    columns = [
+        explain(rule, preceding_rule) for preceding_rule in shadowing_rules
+    ]
+    check_names = list(dict.fromkeys(name for c in columns for name in c))
+    headers = ["Check"] + [preceding.name for preceding in shadowing_rules]
+    rows = [
+        "<tr>" + "".join(f"<th>{escape(h)}</th>" for h in headers) + "</tr>"
+    ]
+    for check_name in check_names:
+        cells = []
+        for column in columns:
+            if check_name not in column:
+                cells.append("<td>-</td>")
+                continue
+            status, message = column[check_name]
+            mark = "✔" if status else "✖"
+            cells.append(f"<td>{mark} {escape(str(message))}</td>")
+        rows.append(f"<tr><td>{escape(check_name)}</td>{''.join(cells)}</tr>")
+    return '<table class="finding-table">' + "".join(rows) + "</table>"
+
+
 def export_as_html(
     scenarios: list["Scenario"],
     device_group: str,
@@ -383,6 +406,13 @@ def export_as_html(
 
             html.append("</table>")
 
+            # Checks results, their messages are created only here
+            explain = getattr(scenario, "explain", None)
+            if explain is not None:
+                html.append(
+                    _checks_results_table(explain, rule, shadowing_rules)
+                )
+
         # Checks section
         html.append(
             f'<h2 class="checks-header" id="{scenario_id}-checks">Checks</h2>'
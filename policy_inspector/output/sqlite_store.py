@@ -0,0 +1,134 @@
+import logging
+import sqlite3
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from policy_inspector.shadowing.results import PackedResults
+
+if TYPE_CHECKING:
+    from policy_inspector.shadowing.base import Shadowing
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    scenario TEXT NOT NULL,
+    device_group TEXT,
+    checks TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rules (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (run_id, position)
+);
+CREATE TABLE IF NOT EXISTS findings (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    kind TEXT NOT NULL,
+    rule_name TEXT NOT NULL,
+    preceding_rule_name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS masks (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    position INTEGER NOT NULL,
+    itemsize INTEGER NOT NULL,
+    masks BLOB NOT NULL,
+    PRIMARY KEY (run_id, position)
+);
+CREATE INDEX IF NOT EXISTS runs_scenario ON runs (scenario, device_group);
+CREATE INDEX IF NOT EXISTS rules_name ON rules (name);
+CREATE INDEX IF NOT EXISTS findings_rule_name ON findings (rule_name);
+CREATE INDEX IF NOT EXISTS findings_run ON findings (run_id, kind);
+"""
+"""Tables of the store. Bit ``k`` of a mask is set when ``k``-th check passed."""
+
+
+def iter_findings_rows(
+    run_id: int, scenario: "Shadowing"
+) -> Iterator[tuple[int, str, str, str]]:
+    for rule, shadowing_rules in scenario.analysis_results or ():
+        for preceding_rule in shadowing_rules:
+            yield run_id, "shadowing", rule.name, preceding_rule.name
+    for rule, same_rules in scenario.find_duplicates():
+        for same_rule in same_rules:
+            yield run_id, "duplicate", rule.name, same_rule.name
+
+
+def iter_masks_rows(
+    run_id: int, results: PackedResults
+) -> Iterator[tuple[int, int, int, bytes]]:
+    itemsize = results.masks.itemsize
+    for i in range(1, len(results.rules)):
+        start = results.offset(i, 0)
+        row = results.masks[start : start + i]
+        yield run_id, i, itemsize, row.tobytes()
+
+
+def save_results(
+    file_path: Path,
+    scenario: "Shadowing",
+    device_group: Optional[str] = None,
+) -> int:
+    """Save rules and findings of an evaluated scenario into SQLite database.
+
+    Every call adds a new run, so results of many runs and device groups
+    can be queried together. Masks of checks results of all pairs are
+    saved too, if the scenario was evaluated by ``execute``.
+    Everything is written in a single transaction.
+
+    Args:
+        file_path: Path to the database, created if it doesn't exist.
+        scenario: Scenario with ``analysis_results``.
+        device_group: Name of the device group the rules come from.
+
+    Returns:
+        Id of the saved run.
+    """
+    connection = sqlite3.connect(file_path)
+    try:
+        with connection:
+            connection.executescript(SCHEMA)
+            cursor = connection.execute(
+                "INSERT INTO runs (scenario, device_group, checks, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    str(scenario),
+                    device_group,
+                    ",".join(check.__name__ for check in scenario.checks),
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+            run_id = cursor.lastrowid
+            connection.executemany(
+                "INSERT INTO rules VALUES (?, ?, ?, ?, ?)",
+                (
+                    (
+                        run_id,
+                        position,
+                        rule.name,
+                        rule.fingerprint,
+                        rule.model.model_dump_json(),
+                    )
+                    for position, rule in enumerate(scenario.rules)
+                ),
+            )
+            connection.executemany(
+                "INSERT INTO findings VALUES (?, ?, ?, ?)",
+                iter_findings_rows(run_id, scenario),
+            )
+            results = scenario.execution_results
+            if isinstance(results, PackedResults):
+                connection.executemany(
+                    "INSERT INTO masks VALUES (?, ?, ?, ?)",
+                    iter_masks_rows(run_id, results),
+                )
+    finally:
+        connection.close()
+    logger.info(f"✓ Saved run {run_id} of '{scenario}' in '{file_path}'")
+    return run_id
@@ -1,90 +1,355 @@
 import logging
-from collections.abc import Iterable
-from typing import TYPE_CHECKING
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from ipaddress import IPv4Address, IPv4Network
+from itertools import chain
+from typing import TYPE_CHECKING, Optional
 
+from policy_inspector.interval import (
+    Intervals,
+    merge_intervals,
+    parse_ip_literal,
+)
 from policy_inspector.model.address_object import (
     AddressObject,
     AddressObjectIPNetwork,
     AddressObjectIPRange,
 )
+from policy_inspector.tag_filter import TagFilter, evaluate_filter, parse_filter
 
 if TYPE_CHECKING:
     from policy_inspector.model.address_group import AddressGroup
 
 logger = logging.getLogger(__name__)
 
+LITERAL_CHARACTERS = frozenset("0123456789./-")
+"""Characters of IP networks and ranges, other values are only names."""
+
 
 class Resolver:
     """Process Address Groups into their Address Objects or IP Network object.
 
-    It expands Address Groups (AG) recursively.
+    Closures of all Address Groups (AG) are computed once, when created.
+    Groups are visited in topological order, so every group is expanded
+    only after its nested groups and each group is stored as a set of ids
+    of its Address Objects, together with their merged intervals.
+
+    Members of dynamic groups are matched by filters of tags, evaluated
+    with set operations over an index of ids of objects by their tags.
+
+    Resolvers can be layered, like Panorama's shared scope and its Device
+    Groups. Names which aren't defined in a layer are resolved by its
+    ``parent``, once for all of its children, so objects and groups of
+    a Device Group override shared ones with the same names. Shared
+    groups can't contain objects of Device Groups, so they are resolved
+    the same way in every Device Group.
+
+    Each layer keeps only its own resolved objects, with ids following
+    the ids of its parent, so objects of a Device Group, including its
+    IP literals, are released together with its resolver. All objects
+    of the parent are resolved when a child is created, so the ids of
+    the parent don't change later.
 
     Args:
         address_objects: A list of ``AddressObject``.
         address_groups: A list of ``AddressGroup``.
+        parent: Resolver of the enclosing scope, e.g. of shared objects.
+
+    Raises:
+        ValueError: If Address Groups contain each other or a filter of
+            a dynamic group isn't valid.
     """
 
     def __init__(
         self,
         address_objects: list["AddressObject"],
         address_groups: list["AddressGroup"],
+        parent: Optional["Resolver"] = None,
     ):
+        self.parent = parent
         self.address_objects: dict[str, AddressObject] = {
             ao.name: ao for ao in address_objects
         }
         self.address_groups: dict[str, set[str]] = {
             ag.name: ag.static for ag in address_groups
         }
-        self.cache: dict[str, list[AddressObject]] = {}
+        self.offset: int = 0
+        """Id of the first Address Object of this layer."""
+        if parent is not None:
+            parent.get_visible()
+            self.offset = parent.offset + len(parent.objects)
+        self.objects: list[AddressObject] = []
+        """Resolved Address Objects of this layer, by ids minus ``offset``."""
+        self.object_intervals: list[Intervals] = []
+        """Intervals of resolved Address Objects of this layer."""
+        self.ids: dict[str, int] = {}
+        """Ids of resolved Address Objects by their names."""
+        self.cache: dict[str, frozenset[int]] = {}
+        """Ids of Address Objects by names of resolved groups and objects."""
+        self.intervals: dict[str, Intervals] = {}
+        """Merged intervals by names of resolved groups and objects."""
+        self.resolved: dict[frozenset[str], list[AddressObject]] = {}
+        """Resolved Address Objects by sets of names."""
+        self.unknown: dict[str, str] = {}
+        """Unknown member of a group, by names of groups containing it."""
+        self.filters: dict[str, TagFilter] = {}
+        """Parsed filters of dynamic groups by their names."""
+        for ag in address_groups:
+            if ag.dynamic:
+                try:
+                    self.filters[ag.name] = parse_filter(ag.dynamic)
+                except ValueError as ex:
+                    raise ValueError(
+                        f"Invalid filter of Address Group '{ag.name}'. {ex}"
+                    ) from None
+        self.visible: Optional[dict[str, int]] = None
+        """Ids of objects of this and parent layers by their names."""
+        self.tag_index: Optional[dict[str, frozenset[int]]] = None
+        """Ids of visible objects by their tags."""
+        self.universe: Optional[frozenset[int]] = None
+        """Ids of all visible objects."""
+        for name in self.iter_groups_order():
+            self._resolve_group(name)
 
-    def resolve(self, names: Iterable[str]) -> list["AddressObject"]:
-        """Resolve given names.
+    def iter_groups_order(self) -> Iterator[str]:
+        """Yield names of groups, each after all of its nested groups.
 
-        Args:
-            names: Names of ``Address Groups`` or ``Address Objects``
+        Raises:
+            ValueError: If Address Groups contain each other.
         """
-        result = []
-        for name in names:
-            result.extend(self._resolve_name(name))
-        return result
+        done: set[str] = set()
+        for root in self.address_groups:
+            if root in done:
+                continue
+            stack = [(root, iter(self.address_groups[root]))]
+            path = {root}
+            while stack:
+                name, members = stack[-1]
+                for member in members:
+                    if member not in self.address_groups or member in done:
+                        continue
+                    if member in path:
+                        names = [n for n, _ in stack]
+                        cycle = names[names.index(member) :] + [member]
+                        raise ValueError(
+                            f"Circular reference of Address Groups: "
+                            f"{' -> '.join(cycle)}"
+                        )
+                    stack.append((member, iter(self.address_groups[member])))
+                    path.add(member)
+                    break
+                else:
+                    stack.pop()
+                    path.discard(name)
+                    done.add(name)
+                    yield name
+
+    def _resolve_group(self, name: str) -> None:
+        """Store closure of a group, whose nested groups are resolved."""
+        logger.debug(f"Resolving Address Group by name: {name}")
+        ids: set[int] = set()
+        intervals: list[Intervals] = []
+        for member in self.address_groups[name]:
+            try:
+                self._resolve_object(member)
+            except ValueError:
+                self.unknown[name] = member
+                continue
+            if member in self.unknown:
+                self.unknown[name] = self.unknown[member]
+            ids.update(self.cache[member])
+            intervals.append(self.intervals[member])
+        if name in self.filters:
+            matched = self.match(self.filters[name])
+            ids.update(matched)
+            intervals.extend(self.get_object_intervals(i) for i in matched)
+        self.cache[name] = frozenset(ids)
+        self.intervals[name] = merge_intervals(chain.from_iterable(intervals))
 
-    def _resolve_name(self, name: str) -> list["AddressObject"]:
-        """Resolve single ``name``"""
+    def get_layer(self, object_id: int) -> "Resolver":
+        """Return the layer which resolved an Address Object of ``object_id``."""
+        layer = self
+        while object_id < layer.offset:
+            layer = layer.parent
+        return layer
+
+    def get_object(self, object_id: int) -> AddressObject:
+        """Return resolved Address Object of any layer by its id."""
+        layer = self.get_layer(object_id)
+        return layer.objects[object_id - layer.offset]
+
+    def get_object_intervals(self, object_id: int) -> Intervals:
+        """Return intervals of resolved Address Object by its id."""
+        layer = self.get_layer(object_id)
+        return layer.object_intervals[object_id - layer.offset]
+
+    def is_defined(self, name: str) -> bool:
+        """Check if ``name`` is an object or a group of this or parent layers."""
+        if name in self.address_objects or name in self.address_groups:
+            return True
+        return self.parent is not None and self.parent.is_defined(name)
+
+    def get_visible(self) -> dict[str, int]:
+        """Return ids of objects of this and parent layers by their names."""
+        if self.visible is None:
+            visible = dict(self.parent.get_visible()) if self.parent else {}
+            for name in self.address_objects:
+                if name not in self.address_groups:
+                    (visible[name],) = self._resolve_object(name)
+            self.visible = visible
+        return self.visible
+
+    def get_tag_index(self) -> dict[str, frozenset[int]]:
+        """Return ids of visible objects by their tags.
+
+        Index of a child layer is the index of its parent, changed only
+        by objects of the child and the parent's objects they override.
+        """
+        if self.tag_index is None:
+            visible = self.get_visible()
+            index = dict(self.parent.get_tag_index()) if self.parent else {}
+            parent_visible = self.parent.get_visible() if self.parent else {}
+            removed: dict[str, set[int]] = defaultdict(set)
+            added: dict[str, set[int]] = defaultdict(set)
+            for name in self.address_objects:
+                if name in parent_visible:
+                    overridden = parent_visible[name]
+                    for tag in self.get_object(overridden).tags:
+                        removed[tag].add(overridden)
+                if name in visible:
+                    for tag in self.get_object(visible[name]).tags:
+                        added[tag].add(visible[name])
+            for tag in removed.keys() | added.keys():
+                ids = index.get(tag, frozenset())
+                index[tag] = ids - removed[tag] | added[tag]
+            self.tag_index = index
+        return self.tag_index
+
+    def match(self, tag_filter: TagFilter) -> frozenset[int]:
+        """Return ids of visible objects matching a filter of tags."""
+        index = self.get_tag_index()
+        if self.universe is None:
+            self.universe = frozenset(self.get_visible().values())
+        return evaluate_filter(
+            tag_filter, lambda tag: index.get(tag, frozenset()), self.universe
+        )
+
+    def _resolve_object(self, name: str) -> frozenset[int]:
+        """Resolve single ``name`` of an Address Object or an IP value.
+
+        Groups are already resolved, names defined by other layers are
+        resolved by the ``parent``. IP values are resolved by the layer
+        using them.
+        """
         if name in self.cache:
             return self.cache[name]
 
-        try:
-            logger.debug(f"Resolving Address Group by name: {name}")
-            resolved = []
-            for member in self.address_groups[name]:
-                resolved.extend(self._resolve_name(member))
-            self.cache[name] = resolved
-            return resolved
-        except KeyError:
-            pass
+        if (
+            self.parent is not None
+            and name not in self.address_objects
+            and self.parent.is_defined(name)
+        ):
+            self.cache[name] = self.parent._resolve_object(name)
+            self.intervals[name] = self.parent.intervals[name]
+            if name in self.parent.unknown:
+                self.unknown[name] = self.parent.unknown[name]
+            return self.cache[name]
 
-        try:
+        address_object = self.address_objects.get(name)
+        if address_object is not None:
             logger.debug(f"Resolving Address Object by name: {name}")
-            resolved = [self.address_objects[name]]
-            self.cache[name] = resolved
-            return resolved
-        except KeyError:
-            pass
+        else:
+            address_object = self._create_object(name)
+
+        self.ids[name] = self.offset + len(self.objects)
+        self.objects.append(address_object)
+        interval = address_object.interval
+        self.intervals[name] = (interval,) if interval is not None else ()
+        self.object_intervals.append(self.intervals[name])
+        self.cache[name] = frozenset((self.ids[name],))
+        return self.cache[name]
+
+    @staticmethod
+    def _create_object(value: str) -> AddressObject:
+        """Create Address Object of an IP network or range ``value``.
+
+        Literals in canonical form are parsed by ``parse_ip_literal``
+        and objects are created without validation. Other values are
+        validated, unless they can't be IP addresses at all.
+        """
+        literal = parse_ip_literal(value)
+        if literal is not None:
+            (start, end), prefix = literal
+            if prefix is not None:
+                cls = AddressObjectIPNetwork
+                parsed = IPv4Network((start, prefix))
+            else:
+                cls = AddressObjectIPRange
+                parsed = (IPv4Address(start), IPv4Address(end))
+            # All fields are given, defaults are slow to construct
+            return cls.model_construct(
+                {"name", "value"},
+                name=value,
+                value=parsed,
+                description="",
+                tags=set(),
+            )
+        if not LITERAL_CHARACTERS.issuperset(value):
+            raise ValueError(f"Unknown address object/group: {value}")
 
         try:
             logger.debug(
-                f"Creating {AddressObjectIPNetwork} from value: {name}"
+                f"Creating {AddressObjectIPNetwork} from value: {value}"
             )
-            resolved = [AddressObjectIPNetwork(name=name, value=name)]
-            self.cache[name] = resolved
-            return resolved
+            return AddressObjectIPNetwork(name=value, value=value)
         except ValueError:
             pass
 
         try:
-            logger.debug(f"Creating {AddressObjectIPRange} from value: {name}")
-            resolved = [AddressObjectIPRange(name=name, value=name)]
-            self.cache[name] = resolved
-            return resolved
+            logger.debug(f"Creating {AddressObjectIPRange} from value: {value}")
+            return AddressObjectIPRange(name=value, value=value)
         except ValueError as ex:
-            raise ValueError(f"Unknown address object/group: {name}") from ex
+            raise ValueError(f"Unknown address object/group: {value}") from ex
+
+    def _resolve_name(self, name: str) -> frozenset[int]:
+        """Return ids of Address Objects of a single ``name``."""
+        ids = self._resolve_object(name)
+        if name in self.unknown:
+            raise ValueError(
+                f"Unknown address object/group: {self.unknown[name]}"
+            )
+        return ids
+
+    def resolve_ids(self, names: Iterable[str]) -> frozenset[int]:
+        """Return ids of Address Objects of given names, without duplicates."""
+        names = list(names)
+        if len(names) == 1:
+            return self._resolve_name(names[0])
+        return frozenset().union(*map(self._resolve_name, names))
+
+    def resolve(self, names: Iterable[str]) -> list["AddressObject"]:
+        """Resolve given names.
+
+        Each Address Object is returned once, even if it's a member of
+        many of the given groups. Results are cached by sets of names,
+        so returned lists are shared and must not be modified.
+
+        Args:
+            names: Names of ``Address Groups`` or ``Address Objects``
+        """
+        names = frozenset(names)
+        if names not in self.resolved:
+            ids = sorted(self.resolve_ids(names))
+            self.resolved[names] = [self.get_object(i) for i in ids]
+        return self.resolved[names]
+
+    def resolve_intervals(self, names: Iterable[str]) -> Intervals:
+        """Return merged intervals of Address Objects of given names."""
+        names = list(names)
+        for name in names:
+            self._resolve_name(name)
+        if len(names) == 1:
+            return self.intervals[names[0]]
+        return merge_intervals(
+            interval for name in names for interval in self.intervals[name]
+        )
@@ -1,6 +1,6 @@
 import logging
-from collections.abc import Iterable
-from typing import TYPE_CHECKING, Any, Callable, Optional, TypeVar
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING, Any, Callable, Optional, TypeVar, Union
 
 if TYPE_CHECKING:
     from policy_inspector.model.security_rule import SecurityRule
@@ -9,12 +9,43 @@ logger = logging.getLogger(__name__)
 
 ScenarioResults = TypeVar("ScenarioResults")
 
-CheckResult = tuple[bool, str]
+
+class Message:
+    """
+    A check's message formatted only when it is converted to ``str``.
+
+    Args:
+        template: Format string of the message.
+        *args: Values passed to ``str.format`` of ``template``.
+    """
+
+    __slots__ = ("template", "args")
+
+    def __init__(self, template: str, *args: Any):
+        self.template = template
+        self.args = args
+
+    def __str__(self) -> str:
+        return self.template.format(*self.args)
+
+    def __repr__(self) -> str:
+        return repr(str(self))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (str, Message)):
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+
+CheckResult = tuple[bool, Union[str, Message]]
 """
 A tuple representing the result of a check function.
 
 1. ``bool``: Indicates whether the check was fulfilled or not.
-2. ``str``: A verbose message describing the result.
+2. ``str`` or ``Message``: A verbose message describing the result.
 """
 
 Check = Callable[[...], CheckResult]
@@ -91,10 +122,42 @@ class Scenario:
                 logger.warning(f"☠ Error: {ex}")
                 logger.warning(f"☠ Check function: '{check.__name__}'")
                 for i, rule in enumerate(rules, start=1):
-                    logger.warning(f"☠ Rule {i}: {rule.name}")
-                    logger.debug(f"☠ Rule {i}: {rule.model_dump()}")
+                    # Compiled rules keep the model they were compiled from
+                    model = getattr(rule, "model", rule)
+                    logger.warning(f"☠ Rule {i}: {model.name}")
+                    logger.debug(f"☠ Rule {i}: {model.model_dump()}")
         return results
 
+    def passes_checks(
+        self,
+        *rules: "SecurityRule",
+        checks: Optional[Iterable[Check]] = None,
+    ) -> bool:
+        """
+        Check whether all ``checks`` are fulfilled by provided rules.
+
+        Unlike ``run_checks``, it stops at the first failed check
+        and ignores messages.
+
+        Args:
+            *rules: Security rules to evaluate.
+            checks: Checks to run. Defaults to all defined ``checks``.
+
+        Notes:
+            Check raising an error is skipped, the same as in ``run_checks``.
+
+        Returns:
+            ``True`` if none of the checks failed.
+        """
+        for check in self.checks if checks is None else checks:
+            try:
+                if not check(*rules)[0]:
+                    return False
+            except Exception as ex:  # noqa: BLE001
+                logger.warning(f"☠ Error: {ex}")
+                logger.warning(f"☠ Check function: '{check.__name__}'")
+        return True
+
     def execute(self) -> ScenarioResults:
         """
         Execute the scenario logic.
@@ -121,3 +184,16 @@ class Scenario:
             The analysis outcome.
         """
         raise NotImplementedError
+
+    def iter_findings(self) -> Iterator[Any]:
+        """
+        Yield analysis outcome item by item.
+
+        Notes:
+            Default implementation executes and analyzes whole scenario.
+            Subclasses can override it to stream findings.
+
+        Returns:
+            An iterator over analysis outcome.
+        """
+        yield from self.analyze(self.execute())
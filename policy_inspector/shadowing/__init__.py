@@ -1,5 +1,6 @@
 from .base import Scenario
 from .base import Shadowing
 from .advanced import ShadowingByValue
+from .cumulative import CumulativeShadowing
 
-__all__ = ["Scenario", "Shadowing", "ShadowingByValue"]
+__all__ = ["Scenario", "Shadowing", "ShadowingByValue", "CumulativeShadowing"]
@@ -1,13 +1,16 @@
 import logging
-from typing import TYPE_CHECKING
+from hashlib import blake2b
+from typing import TYPE_CHECKING, Callable, Optional
 
-from policy_inspector.model.address_object import AddressObjectFQDN
+from policy_inspector.interval import Intervals, covers
 from policy_inspector.model.base import AnyObj
+from policy_inspector.model.compiled import CompiledRule
 from policy_inspector.model.security_rule import (
     AdvancedSecurityRule,
     SecurityRule,
 )
 from policy_inspector.resolver import Resolver
+from policy_inspector.scenario import Message
 from policy_inspector.shadowing.base import (
     CheckResult,
     Shadowing,
@@ -18,6 +21,12 @@ from policy_inspector.shadowing.base import (
     check_services,
     check_source_zone,
 )
+from policy_inspector.shadowing.index import (
+    Bitset,
+    Prefilter,
+    RuleIndex,
+    memoize,
+)
 
 if TYPE_CHECKING:
     from policy_inspector.model.address_group import AddressGroup
@@ -34,96 +43,141 @@ def check_services_and_application(
     pass
 
 
+class Uncovered:
+    """Lazily describes the first address object not covered by ``intervals``."""
+
+    __slots__ = ("address_objects", "intervals")
+
+    def __init__(
+        self, address_objects: list["AddressObject"], intervals: Intervals
+    ):
+        self.address_objects = address_objects
+        self.intervals = intervals
+
+    def __str__(self) -> str:
+        for addr_obj in self.address_objects:
+            interval = addr_obj.interval
+            if interval is not None and not covers(self.intervals, (interval,)):
+                return f"{addr_obj.name} ({addr_obj.value})"
+        return ""
+
+
 def check_source_addresses_by_ip(
-    rule: "AdvancedSecurityRule",
-    preceding_rule: "AdvancedSecurityRule",
+    rule: CompiledRule,
+    preceding_rule: CompiledRule,
 ) -> CheckResult:
     """Check if rule's source IP addresses are covered by preceding rule.
 
-    Excludes FQDN address objects from comparison and logs warnings when encountered.
+    Excludes FQDN address objects from comparison.
     """
     if rule.source_addresses == preceding_rule.source_addresses:
-        return True, "Destination addresses are identical"
+        return True, "Source addresses are identical"
 
-    if AnyObj in preceding_rule.source_addresses:
-        return True, "Preceding rule allows any destination"
+    if preceding_rule.any_source_address:
+        return True, "Preceding rule allows any source"
 
-    if AnyObj in rule.source_addresses:
-        return False, "Current rule allows any destination (too broad)"
+    if rule.any_source_address:
+        return False, "Current rule allows any source (too broad)"
 
-    fqdn_count = 0
-    for addr_obj in rule.resolved_source_addresses:
-        if isinstance(addr_obj, AddressObjectFQDN):
-            logger.debug(
-                f"Skipping FQDN comparison for {addr_obj.name}={addr_obj.value}"
-            )
-            fqdn_count += 1
-            continue
-
-        if not any(
-            addr_obj.is_covered_by(preceding_addr_obj)
-            for preceding_addr_obj in preceding_rule.resolved_source_addresses
-            if not isinstance(preceding_addr_obj, AddressObjectFQDN)
-        ):
-            return (
-                False,
-                f"Destination {addr_obj.name} ({addr_obj.value}) not covered by preceding rule",
-            )
+    if not rule.source_intervals:
+        return True, "FQDN sources excluded from coverage check"
 
-    if fqdn_count == len(rule.resolved_source_addresses):
-        logger.debug("All destination addresses are FQDNs - comparison skipped")
-        return True, "FQDN destinations excluded from coverage check"
+    if not covers(preceding_rule.source_intervals, rule.source_intervals):
+        return False, Message(
+            "Source {} not covered by preceding rule",
+            Uncovered(
+                rule.resolved_source_addresses,
+                preceding_rule.source_intervals,
+            ),
+        )
 
     return (
         True,
-        "All non-FQDN destination addresses are covered by preceding rule(s)",
+        "All non-FQDN source addresses are covered by preceding rule",
     )
 
 
 def check_destination_addresses_by_ip(
-    rule: "AdvancedSecurityRule",
-    preceding_rule: "AdvancedSecurityRule",
+    rule: CompiledRule,
+    preceding_rule: CompiledRule,
 ) -> CheckResult:
     """Check if rule's destination IP addresses are covered by preceding rule.
 
-    Excludes FQDN address objects from comparison and logs warnings when encountered.
+    Excludes FQDN address objects from comparison.
     """
     if rule.destination_addresses == preceding_rule.destination_addresses:
         return True, "Destination addresses are identical"
 
-    if AnyObj in preceding_rule.destination_addresses:
+    if preceding_rule.any_destination_address:
         return True, "Preceding rule allows any destination"
 
-    if AnyObj in rule.destination_addresses:
+    if rule.any_destination_address:
         return False, "Current rule allows any destination (too broad)"
 
-    fqdn_count = 0
-    for addr_obj in rule.resolved_destination_addresses:
-        if isinstance(addr_obj, AddressObjectFQDN):
-            logger.debug(
-                f"Skipping FQDN comparison for {addr_obj.name}={addr_obj.value}"
-            )
-            fqdn_count += 1
-            continue
-
-        if not any(
-            addr_obj.is_covered_by(preceding_addr_obj)
-            for preceding_addr_obj in preceding_rule.resolved_destination_addresses
-            if not isinstance(preceding_addr_obj, AddressObjectFQDN)
-        ):
-            return (
-                False,
-                f"Destination {addr_obj.name} ({addr_obj.value}) not covered by preceding rule",
-            )
-
-    # Handle case where all addresses were FQDNs
-    if fqdn_count == len(rule.resolved_destination_addresses):
-        logger.debug("All destination addresses are FQDNs - comparison skipped")
+    if not rule.destination_intervals:
         return True, "FQDN destinations excluded from coverage check"
 
+    if not covers(
+        preceding_rule.destination_intervals, rule.destination_intervals
+    ):
+        return False, Message(
+            "Destination {} not covered by preceding rule",
+            Uncovered(
+                rule.resolved_destination_addresses,
+                preceding_rule.destination_intervals,
+            ),
+        )
+
     return (
         True,
-        "All non-FQDN destination addresses are covered by preceding rule(s)",
+        "All non-FQDN destination addresses are covered by preceding rule",
+    )
+
+
+@memoize("source_addresses_id")
+def prefilter_source_addresses_by_ip(
+    index: RuleIndex, rule: CompiledRule
+) -> Bitset:
+    """Candidates for ``check_source_addresses_by_ip``."""
+    result = index.same(
+        "source_addresses", rule.source_addresses
+    ) | index.equal("source_addresses", AnyObj)
+    if rule.any_source_address:
+        return result
+    if not rule.source_intervals:
+        return index.all
+    return result | index.covering("source_intervals", rule.source_intervals)
+
+
+@memoize("destination_addresses_id")
+def prefilter_destination_addresses_by_ip(
+    index: RuleIndex, rule: CompiledRule
+) -> Bitset:
+    """Candidates for ``check_destination_addresses_by_ip``."""
+    result = index.same(
+        "destination_addresses", rule.destination_addresses
+    ) | index.equal("destination_addresses", AnyObj)
+    if rule.any_destination_address:
+        return result
+    if not rule.destination_intervals:
+        return index.all
+    return result | index.covering(
+        "destination_intervals", rule.destination_intervals
+    )
+
+
+def prefilter_addresses_by_grid(index: RuleIndex, rule: CompiledRule) -> Bitset:
+    """Coarse candidates for both ``check_*_addresses_by_ip`` checks.
+
+    It is cheaper than the exact prefilters of these checks and drops
+    most of the rules whose source × destination region is apart from
+    the rule's one, e.g. for narrow host to host rules.
+    """
+    return index.containing_cells(
+        "source_intervals",
+        "destination_intervals",
+        rule.source_intervals,
+        rule.destination_intervals,
     )
 
 
@@ -138,20 +192,54 @@ class ShadowingByValue(Shadowing):
         check_source_addresses_by_ip,
         check_destination_addresses_by_ip,
     ]
+    prefilters: dict[Callable, Prefilter] = {
+        **Shadowing.prefilters,
+        check_source_addresses_by_ip: prefilter_source_addresses_by_ip,
+        check_destination_addresses_by_ip: prefilter_destination_addresses_by_ip,
+    }
     resolver_cls: type[Resolver] = Resolver
 
+    address_grid: bool = False
+    """Select candidates by ``prefilter_addresses_by_grid`` first, which
+    pays off only for many narrow rules whose addresses are far apart."""
+
     def __init__(
         self,
         security_rules: list["SecurityRule"],
         address_objects: list["AddressObject"],
         address_groups: list["AddressGroup"],
+        shared_resolver: Optional[Resolver] = None,
     ):
-        super().__init__(security_rules=security_rules)
         self.address_objects = address_objects
         self.address_groups = address_groups
-        self.resolver = self.resolver_cls(address_objects, address_groups)
+        self.resolver = self.resolver_cls(
+            address_objects, address_groups, parent=shared_resolver
+        )
+        super().__init__(security_rules=security_rules)
+
+    def compile_rules(self) -> list[CompiledRule]:
+        """Resolve addresses of ``security_rules`` and compile them."""
         self.resolve_rules()
-        self.rules_by_name = {rule.name: rule for rule in self.security_rules}
+        return super().compile_rules()
+
+    def get_content_hash(self, rule: CompiledRule) -> str:
+        """Return hash of rule's fingerprint and of its resolved addresses."""
+        digest = blake2b(rule.fingerprint.encode(), digest_size=16)
+        digest.update(repr(rule.source_intervals).encode())
+        digest.update(repr(rule.destination_intervals).encode())
+        return digest.hexdigest()
+
+    def get_prefilters(self) -> list[Prefilter]:
+        """Return prefilters of enabled checks, preceded by the address grid
+        when it's enabled together with both address checks."""
+        prefilters = super().get_prefilters()
+        if (
+            self.address_grid
+            and check_source_addresses_by_ip in self.checks
+            and check_destination_addresses_by_ip in self.checks
+        ):
+            prefilters.insert(0, prefilter_addresses_by_grid)
+        return prefilters
 
     def resolve_rules(self):
         resolved = []
@@ -167,10 +255,16 @@ class ShadowingByValue(Shadowing):
             params["resolved_source_addresses"] = self.resolver.resolve(
                 src_addrs
             )
+            params["source_intervals"] = self.resolver.resolve_intervals(
+                src_addrs
+            )
 
         dst_addrs = rule.destination_addresses
         if dst_addrs and AnyObj not in dst_addrs:
             params["resolved_destination_addresses"] = self.resolver.resolve(
                 dst_addrs
             )
+            params["destination_intervals"] = self.resolver.resolve_intervals(
+                dst_addrs
+            )
         return AdvancedSecurityRule.from_security_rule(rule, **params)
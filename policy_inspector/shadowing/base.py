@@ -1,7 +1,12 @@
 import logging
-from collections.abc import Iterable
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Iterable, Iterator
+from pathlib import Path
 from typing import TYPE_CHECKING, Callable, Literal, Optional
 
+from policy_inspector.interval import IntervalBackend
+from policy_inspector.model.compiled import CompiledRule, compile_rules
 from policy_inspector.scenario import CheckResult, Scenario
 from policy_inspector.shadowing.checks import (
     check_action,
@@ -12,7 +17,26 @@ from policy_inspector.shadowing.checks import (
     check_source_address,
     check_source_zone,
 )
-from policy_inspector.shadowing.show import show_as_table, show_as_text
+from policy_inspector.shadowing.incremental import Delta, Snapshot
+from policy_inspector.shadowing.index import (
+    CacheInfo,
+    Prefilter,
+    RuleIndex,
+    iter_bits,
+    prefilter_action,
+    prefilter_application,
+    prefilter_destination_address,
+    prefilter_destination_zone,
+    prefilter_services,
+    prefilter_source_address,
+    prefilter_source_zone,
+)
+from policy_inspector.shadowing.results import PackedResults, spread_bits
+from policy_inspector.shadowing.show import (
+    show_duplicates,
+    show_finding_as_table,
+    show_finding_as_text,
+)
 
 if TYPE_CHECKING:
     from policy_inspector.model.security_rule import SecurityRule
@@ -20,7 +44,7 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
-ShadowingCheckFunction = Callable[["SecurityRule", "SecurityRule"], CheckResult]
+ShadowingCheckFunction = Callable[[CompiledRule, CompiledRule], CheckResult]
 
 
 ChecksOutputs = dict[str, CheckResult]
@@ -32,8 +56,14 @@ PrecedingRulesOutputs = dict[str, ChecksOutputs]
 ExecuteResults = dict[str, PrecedingRulesOutputs]
 """Dict with Rule's name as keys and ``PrecedingRulesOutputs`` as value."""
 
-AnalysisResults = list[tuple["SecurityRule", list["SecurityRule"]]]
-"""List of two-element tuples where first element is a ``SecurityRule`` and second element is list of shadowing rules"""
+Finding = tuple["SecurityRule", list["SecurityRule"]]
+"""Two-element tuple where first element is a ``SecurityRule`` and second element is list of shadowing rules"""
+
+AnalysisResults = list[Finding]
+"""List of ``Finding``"""
+
+Duplicate = tuple["SecurityRule", list["SecurityRule"]]
+"""Two-element tuple where first element is a ``SecurityRule`` and second element is list of preceding rules with the same fingerprint"""
 
 
 class Shadowing(Scenario):
@@ -55,29 +85,216 @@ class Shadowing(Scenario):
         check_destination_address,
     ]
 
+    prefilters: dict[Callable, Prefilter] = {
+        check_action: prefilter_action,
+        check_application: prefilter_application,
+        check_services: prefilter_services,
+        check_source_zone: prefilter_source_zone,
+        check_destination_zone: prefilter_destination_zone,
+        check_source_address: prefilter_source_address,
+        check_destination_address: prefilter_destination_address,
+    }
+    """Mapping of a check to function selecting rules for which it passes."""
+
+    use_index: bool = True
+    """Compare rules only against preceding rules selected by ``prefilters``."""
+
+    index_cls: type[RuleIndex] = RuleIndex
+    """Index implementation, ``RuleIndex`` or its subclass."""
+
+    interval_backend: IntervalBackend = "tree"
+    """Search of address intervals by the index, ``"array"`` requires numpy."""
+
+    jobs: int = 1
+    """Number of worker processes used by ``iter_findings``."""
+
+    cache_file: Optional[Path] = None
+    """File with results of the previous run, updated by ``iter_findings``.
+
+    Only pairs of rules which changed, or whose order changed,
+    are evaluated again.
+    """
+
     show_map: dict[str, Callable] = {
-        "text": show_as_text,
-        "table": show_as_table,
+        "text": show_finding_as_text,
+        "table": show_finding_as_table,
     }
+    """Mapping of a format to function showing a single finding."""
 
     def __init__(self, security_rules: list["SecurityRule"]):
         self.security_rules = security_rules
+        self.rules = self.compile_rules()
+        """Compiled ``security_rules``, which are evaluated by checks."""
         self.rules_by_name = {rule.name: rule for rule in self.security_rules}
+        self.positions = {rule.name: i for i, rule in enumerate(self.rules)}
+        self.index: Optional[RuleIndex] = None
+        self.delta: Optional[Delta] = None
         self.execution_results: Optional[ExecuteResults] = None
         self.analysis_results: Optional[AnalysisResults] = None
 
-    def execute(self) -> ExecuteResults:
-        rules = self.security_rules
-        results = {}
+    def __getstate__(self) -> dict:
+        """Keep only the state needed to evaluate rules, e.g. in a worker."""
+        return {
+            "rules": self.rules,
+            "checks": self.checks,
+            "use_index": self.use_index,
+            "index_cls": self.index_cls,
+            "interval_backend": self.interval_backend,
+            "delta": self.delta,
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.security_rules = [rule.model for rule in self.rules]
+        self.rules_by_name = {rule.name: rule for rule in self.security_rules}
+        self.positions = {rule.name: i for i, rule in enumerate(self.rules)}
+        self.index = None
+        self.execution_results = None
+        self.analysis_results = None
+
+    def compile_rules(self) -> list[CompiledRule]:
+        """Compile ``security_rules`` once, before they are evaluated."""
+        return compile_rules(self.security_rules)
+
+    def get_content_hash(self, rule: CompiledRule) -> str:
+        """Return hash of everything the checks' results of ``rule`` depend on."""
+        return rule.fingerprint
+
+    def get_cache_key(self) -> str:
+        """Return key of the scenario, results of other keys are not reused."""
+        checks = ",".join(check.__name__ for check in self.checks)
+        return f"{self.__class__.__name__}:{checks}"
+
+    def load_delta(self) -> Optional[Delta]:
+        """Compare rules with the snapshot kept in ``cache_file``."""
+        if self.cache_file is None:
+            return None
+        snapshot = Snapshot.load(self.cache_file)
+        if snapshot is None:
+            return None
+        if snapshot.key != self.get_cache_key():
+            logger.info("↺ Scenario or checks changed, cached results ignored")
+            return None
+        delta = Delta(
+            snapshot,
+            [rule.name for rule in self.rules],
+            [self.get_content_hash(rule) for rule in self.rules],
+        )
+        logger.info(f"↺ {len(delta.reused)} rules unchanged since cached run")
+        return delta
+
+    def get_compiled(self, rule: "SecurityRule") -> CompiledRule:
+        """Return compiled representation of one of ``security_rules``."""
+        return self.rules[self.positions[rule.name]]
+
+    def build_index(self) -> None:
+        """Index compiled ``rules`` for candidates lookup."""
+        self.index = self.index_cls(
+            self.rules, interval_backend=self.interval_backend
+        )
+
+    def cache_info(self) -> dict[str, CacheInfo]:
+        """Return cache hits and misses of memoized prefilters of the index."""
+        if self.index is None:
+            return {}
+        return self.index.cache_info()
+
+    def log_cache_info(self) -> None:
+        for name, (hits, misses) in self.cache_info().items():
+            logger.debug(f"'{name}' cache: {hits} hits, {misses} misses")
+
+    def get_prefilters(self) -> list[Prefilter]:
+        """Return prefilters of currently enabled checks."""
+        return [
+            self.prefilters[check]
+            for check in self.checks
+            if check in self.prefilters
+        ]
+
+    def get_remaining_checks(self) -> list[ShadowingCheckFunction]:
+        """Return enabled checks which are not resolved by ``prefilters``."""
+        if not self.use_index:
+            return list(self.checks)
+        return [check for check in self.checks if check not in self.prefilters]
+
+    def iter_candidates(
+        self,
+        position: int,
+        prefilters: Optional[list[Prefilter]] = None,
+    ) -> Iterator[int]:
+        """Yield positions of preceding rules that can shadow given rule.
+
+        Args:
+            position: Position of a rule in ``security_rules``.
+            prefilters: Prefilters to apply. Defaults to ``get_prefilters``.
+        """
+        if not self.use_index:
+            yield from range(position)
+            return
+        if self.index is None:
+            self.build_index()
+        if prefilters is None:
+            prefilters = self.get_prefilters()
+        rule = self.rules[position]
+        candidates = (1 << position) - 1
+        for prefilter in prefilters:
+            if not candidates:
+                break
+            candidates &= prefilter(self.index, rule)
+        yield from iter_bits(candidates)
+
+    def is_shadowing(self, checks_results: ChecksOutputs) -> bool:
+        """Whether checks results mean that a rule is shadowed."""
+        return all(check_result[0] for check_result in checks_results.values())
+
+    def execute(self) -> PackedResults:
+        """Evaluate all pairs of rules and store checks results.
+
+        Checks with a prefilter are evaluated for every pair at once,
+        using the index. Remaining checks run only for pairs which
+        passed all of them.
+
+        Returns:
+            Checks results packed into ``PackedResults``, which can be read
+            as ``ExecuteResults``.
+        """
+        rules = self.rules
+        self.build_index()
+        prefilters = self.get_prefilters() if self.use_index else []
+        prefiltered = []
+        remaining = []
+        for k, check in enumerate(self.checks):
+            if self.use_index and check in self.prefilters:
+                prefiltered.append((1 << k, self.prefilters[check]))
+            else:
+                remaining.append((1 << k, check))
+        results = PackedResults(
+            rules, self.checks, sum(bit for bit, _ in prefiltered)
+        )
+        masks = results.masks
+        itemsize = masks.itemsize
         for i, rule in enumerate(rules):
-            output = {}
-            for j in range(i):
+            start = results.offset(i, 0)
+            row = 0
+            for bit, prefilter in prefiltered:
+                passed = prefilter(self.index, rule)
+                row |= spread_bits(passed, i, itemsize) * bit
+            results.set_row(i, row)
+            for j in self.iter_candidates(i, prefilters):
                 preceding_rule = rules[j]
-                output[preceding_rule.name] = self.run_checks(
-                    rule,
-                    preceding_rule,
-                )
-            results[rule.name] = output
+                for bit, check in remaining:
+                    try:
+                        passed = check(rule, preceding_rule)[0]
+                    except Exception as ex:  # noqa: BLE001
+                        logger.warning(f"☠ Error: {ex}")
+                        logger.warning(f"☠ Check function: '{check.__name__}'")
+                        errors = results.errors.get(start + j, 0)
+                        results.errors[start + j] = errors | bit
+                        passed = True
+                    if passed:
+                        masks[start + j] |= bit
+        logger.debug(f"Checks results stored in {results.nbytes} bytes")
+        self.log_cache_info()
         self.execution_results = results
         return results
 
@@ -86,12 +303,19 @@ class Shadowing(Scenario):
         results: ExecuteResults,
     ) -> AnalysisResults:
         analysis_results = []
+        if isinstance(results, PackedResults):
+            models = [rule.model for rule in results.rules]
+            for i, rule in enumerate(models):
+                shadowing_rules = [models[j] for j in results.iter_passed(i)]
+                if shadowing_rules:
+                    analysis_results.append((rule, shadowing_rules))
+            self.analysis_results = analysis_results
+            return analysis_results
+
         for rule_name, rule_results in results.items():
             shadowing_rules = []
             for preceding_rule_name, checks_results in rule_results.items():
-                if all(
-                    check_result[0] for check_result in checks_results.values()
-                ):
+                if self.is_shadowing(checks_results):
                     shadowing_rules.append(
                         self.rules_by_name[preceding_rule_name]
                     )
@@ -102,20 +326,143 @@ class Shadowing(Scenario):
         self.analysis_results = analysis_results
         return analysis_results
 
+    def find_shadowing(
+        self, positions: Iterable[int]
+    ) -> Iterator[tuple[int, list[int]]]:
+        """Yield positions of shadowed rules with positions of their shadowing rules.
+
+        Rules with the same fingerprint pass the same checks, so each
+        fingerprint is evaluated once, by its last rule. Rules preceding
+        any other rule of the fingerprint are taken from its results.
+        Unchanged rules of ``delta`` are evaluated only against changed
+        and moved preceding rules.
+
+        Args:
+            positions: Positions of rules to evaluate, in ascending order.
+        """
+        rules = self.rules
+        if self.index is None:
+            self.build_index()
+        prefilters = self.get_prefilters()
+        checks = self.get_remaining_checks()
+        last = {rule.fingerprint: i for i, rule in enumerate(rules)}
+        found: dict[str, list[int]] = {}
+        for i in positions:
+            reused = self.delta.split(i) if self.delta is not None else None
+            if reused is not None:
+                known, evaluated = reused
+                rule = rules[i]
+                shadowing = known + [
+                    j for j in evaluated if self.passes_checks(rule, rules[j])
+                ]
+                if shadowing:
+                    yield i, sorted(shadowing)
+                continue
+            fingerprint = rules[i].fingerprint
+            shadowing = found.get(fingerprint)
+            if shadowing is None:
+                k = last[fingerprint]
+                rule = rules[k]
+                shadowing = [
+                    j
+                    for j in self.iter_candidates(k, prefilters)
+                    if self.passes_checks(rule, rules[j], checks=checks)
+                ]
+                found[fingerprint] = shadowing
+            if i == last[fingerprint]:
+                del found[fingerprint]
+            else:
+                shadowing = shadowing[: bisect_left(shadowing, i)]
+            if shadowing:
+                yield i, shadowing
+
+    def find_duplicates(self) -> list[Duplicate]:
+        """Return rules with the same fingerprint as any preceding rule.
+
+        Such rules are identical on every matching attribute, only their
+        names differ. Each of them is returned with all preceding rules
+        with the same fingerprint.
+        """
+        duplicates = []
+        preceding: dict[str, list[SecurityRule]] = {}
+        for rule in self.rules:
+            same = preceding.setdefault(rule.fingerprint, [])
+            if same:
+                duplicates.append((rule.model, list(same)))
+            same.append(rule.model)
+        return duplicates
+
+    def iter_findings(self) -> Iterator[Finding]:
+        """Yield findings one by one, as soon as a rule has been evaluated.
+
+        Checks are evaluated with ``passes_checks``, results are not kept
+        and only the findings are collected in ``analysis_results``.
+        Use ``explain`` to get checks' messages for a finding.
+
+        With ``jobs`` greater than 1, rules are evaluated in worker processes
+        and findings are yielded in the same order.
+
+        With ``cache_file`` set, results of its previous run are reused
+        and the file is updated once all findings are yielded.
+        """
+        rules = self.security_rules
+        self.build_index()
+        self.delta = self.load_delta()
+        if self.jobs > 1:
+            from policy_inspector.shadowing.parallel import find_shadowing
+
+            found = find_shadowing(self, self.jobs)
+        else:
+            found = self.find_shadowing(range(len(rules)))
+        self.analysis_results = []
+        for i, shadowing in found:
+            finding = (rules[i], [rules[j] for j in shadowing])
+            self.analysis_results.append(finding)
+            yield finding
+        self.log_cache_info()
+        if self.cache_file is not None:
+            Snapshot.from_scenario(self).save(self.cache_file)
+
+    def explain(
+        self,
+        rule: "SecurityRule",
+        preceding_rule: "SecurityRule",
+    ) -> ChecksOutputs:
+        """Run all checks for given pair of rules, including their messages."""
+        return self.run_checks(
+            self.get_compiled(rule), self.get_compiled(preceding_rule)
+        )
+
     def show(
         self,
-        analysis_results: AnalysisResults,
+        analysis_results: Iterable[Finding],
         formats: Iterable[Literal["text", "table"]],
-    ):
+    ) -> None:
+        """Show findings in all given ``formats``, consuming them only once.
+
+        Without ``formats`` findings are only consumed, so that
+        ``analysis_results`` are complete.
+        """
         if not formats:
             logger.debug("No show format was provided.")
+            deque(analysis_results, maxlen=0)
             return
+        show_funcs = {}
         for format_ in formats:
             show_func = self.show_map.get(format_)
             if not show_func:
                 logger.warning(f"Show format '{format_}' unknown!")
                 continue
-            try:
-                show_func(analysis_results)
-            except Exception as ex:
-                logger.error(f"Failed to show {format_}. {ex}")
+            show_funcs[format_] = show_func
+
+        logger.info("Analysis results")
+        logger.info("----------------")
+        for i, (rule, shadowing_rules) in enumerate(analysis_results):
+            for format_, show_func in list(show_funcs.items()):
+                try:
+                    show_func(i + 1, rule, shadowing_rules)
+                except Exception as ex:
+                    logger.error(f"Failed to show {format_}. {ex}")
+                    del show_funcs[format_]
+        logger.info("----------------")
+        show_duplicates(self.find_duplicates())
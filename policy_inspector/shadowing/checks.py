@@ -1,18 +1,17 @@
 import logging
 from typing import TYPE_CHECKING
 
-from policy_inspector.model.base import AnyObj
 from policy_inspector.shadowing.base import CheckResult
 
 if TYPE_CHECKING:
-    from policy_inspector.model.security_rule import SecurityRule
+    from policy_inspector.model.compiled import CompiledRule
 
 logger = logging.getLogger(__name__)
 
 
 def check_action(
-    rule: "SecurityRule",
-    preceding_rule: "SecurityRule",
+    rule: "CompiledRule",
+    preceding_rule: "CompiledRule",
 ) -> CheckResult:
     """
     Checks if both rules have the same action (like 'allow' or 'deny').
@@ -24,8 +23,8 @@ def check_action(
 
 
 def check_source_zone(
-    rule: "SecurityRule",
-    preceding_rule: "SecurityRule",
+    rule: "CompiledRule",
+    preceding_rule: "CompiledRule",
 ) -> CheckResult:
     """
     Checks if the first rule covers all the same source zones as the second rule.
@@ -37,15 +36,15 @@ def check_source_zone(
     if preceding_rule.source_zones.issubset(rule.source_zones):
         return True, "Preceding rule source zones cover rule's source zones"
 
-    if AnyObj in preceding_rule.source_zones:
+    if preceding_rule.any_source_zone:
         return True, "Preceding rule source zones is 'any'"
 
     return False, "Source zones differ"
 
 
 def check_destination_zone(
-    rule: "SecurityRule",
-    preceding_rule: "SecurityRule",
+    rule: "CompiledRule",
+    preceding_rule: "CompiledRule",
 ) -> CheckResult:
     """
     Checks if the first rule covers all the same destination zones as the second rule.
@@ -60,15 +59,15 @@ def check_destination_zone(
             "Preceding rule destination zones cover rule's destination zones",
         )
 
-    if AnyObj in preceding_rule.destination_zones:
+    if preceding_rule.any_destination_zone:
         return True, "Preceding rule destination zones is 'any'"
 
     return False, "Destination zones differ"
 
 
 def check_source_address(
-    rule: "SecurityRule",
-    preceding_rule: "SecurityRule",
+    rule: "CompiledRule",
+    preceding_rule: "CompiledRule",
 ) -> CheckResult:
     """
     Checks if the first rule covers all the same source addresses (like IPs or groups).
@@ -77,10 +76,10 @@ def check_source_address(
     if rule.source_addresses == preceding_rule.source_addresses:
         return True, "Source addresses are the same"
 
-    if AnyObj in preceding_rule.source_addresses:
+    if preceding_rule.any_source_address:
         return True, "Preceding rule allows any source address"
 
-    if AnyObj in rule.source_addresses:
+    if rule.any_source_address:
         return False, "Rule not covered due to 'any' source"
 
     if rule.source_addresses.issubset(preceding_rule.source_addresses):
@@ -93,14 +92,14 @@ def check_source_address(
 
 
 def check_destination_address(
-    rule: "SecurityRule",
-    preceding_rule: "SecurityRule",
+    rule: "CompiledRule",
+    preceding_rule: "CompiledRule",
 ) -> CheckResult:
     """
     Checks if the first rule covers all the same destination addresses.
     If the first rule uses 'any' or all the same addresses, it can hide the second rule.
     """
-    if AnyObj in preceding_rule.destination_addresses:
+    if preceding_rule.any_destination_address:
         return True, "Preceding rule allows any destination address"
 
     if rule.destination_addresses == preceding_rule.destination_addresses:
@@ -118,8 +117,8 @@ def check_destination_address(
 
 
 def check_application(
-    rule: "SecurityRule",
-    preceding_rule: "SecurityRule",
+    rule: "CompiledRule",
+    preceding_rule: "CompiledRule",
 ) -> CheckResult:
     """
     Checks if the first rule allows all the same applications as the second rule.
@@ -131,7 +130,7 @@ def check_application(
     if rule_apps == preceding_apps:
         return True, "The same applications"
 
-    if AnyObj in preceding_apps:
+    if preceding_rule.any_application:
         return True, "Preceding rule allows any application"
 
     if rule_apps.issubset(preceding_apps):
@@ -141,8 +140,8 @@ def check_application(
 
 
 def check_services(
-    rule: "SecurityRule",
-    preceding_rule: "SecurityRule",
+    rule: "CompiledRule",
+    preceding_rule: "CompiledRule",
 ) -> CheckResult:
     """
     Checks if the first rule allows all the same network services or ports.
@@ -0,0 +1,522 @@
+import logging
+from collections.abc import Iterable, Iterator
+from hashlib import blake2b
+from ipaddress import IPv4Address
+from typing import TYPE_CHECKING, Callable, Optional, Union
+
+from policy_inspector.interval import (
+    Intervals,
+    intersect_intervals,
+    subtract_intervals,
+)
+from policy_inspector.model.base import AnyObj
+from policy_inspector.shadowing.advanced import (
+    ShadowingByValue,
+    check_destination_addresses_by_ip,
+    check_source_addresses_by_ip,
+)
+from policy_inspector.shadowing.base import (
+    AnalysisResults,
+    ChecksOutputs,
+    check_action,
+    check_application,
+    check_destination_zone,
+    check_services,
+    check_source_zone,
+)
+from policy_inspector.shadowing.index import (
+    Bitset,
+    Prefilter,
+    RuleIndex,
+    memoize,
+    prefilter_action,
+)
+
+if TYPE_CHECKING:
+    from policy_inspector.model.address_object import AddressObject
+    from policy_inspector.model.compiled import CompiledRule
+    from policy_inspector.model.security_rule import SecurityRule
+
+logger = logging.getLogger(__name__)
+
+
+class ValueSet:
+    """Set of values or, when ``complement`` is set, of all other values.
+
+    Args:
+        values: Values in the set, or excluded from it.
+        complement: Whether ``values`` are excluded.
+    """
+
+    __slots__ = ("values", "complement")
+
+    def __init__(
+        self,
+        values: frozenset[str] = frozenset(),
+        complement: bool = False,
+    ):
+        self.values = values
+        self.complement = complement
+
+    @classmethod
+    def from_values(cls, values: Iterable[str]) -> "ValueSet":
+        """Create a set of rule's values. Both 'any' and no value mean all."""
+        values = frozenset(values)
+        if not values or AnyObj in values:
+            return cls(complement=True)
+        return cls(values)
+
+    def __and__(self, other: "ValueSet") -> "ValueSet":
+        if self.complement and other.complement:
+            return ValueSet(self.values | other.values, complement=True)
+        if self.complement:
+            return ValueSet(other.values - self.values)
+        if other.complement:
+            return ValueSet(self.values - other.values)
+        return ValueSet(self.values & other.values)
+
+    def __invert__(self) -> "ValueSet":
+        return ValueSet(self.values, not self.complement)
+
+    def __sub__(self, other: "ValueSet") -> "ValueSet":
+        return self & ~other
+
+    def __bool__(self) -> bool:
+        return self.complement or bool(self.values)
+
+    def __repr__(self) -> str:
+        prefix = "~" if self.complement else ""
+        return f"{prefix}{set(self.values) or '{}'}"
+
+
+class AddressSet:
+    """Set of IPv4 addresses and of FQDN names, which have no addresses.
+
+    Args:
+        intervals: Merged intervals of addresses.
+        names: Names of FQDN address objects.
+    """
+
+    __slots__ = ("intervals", "names")
+
+    def __init__(self, intervals: Intervals, names: ValueSet):
+        self.intervals = intervals
+        self.names = names
+
+    def __and__(self, other: "AddressSet") -> "AddressSet":
+        return AddressSet(
+            intersect_intervals(self.intervals, other.intervals),
+            self.names & other.names,
+        )
+
+    def __sub__(self, other: "AddressSet") -> "AddressSet":
+        return AddressSet(
+            subtract_intervals(self.intervals, other.intervals),
+            self.names - other.names,
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.intervals) or bool(self.names)
+
+    def __repr__(self) -> str:
+        return f"AddressSet({self.intervals}, {self.names})"
+
+
+ANY_ADDRESS = AddressSet(((0, (1 << 32) - 1),), ValueSet(complement=True))
+
+Region = tuple[Union[ValueSet, AddressSet], ...]
+"""Product of sets, one for every dimension of rules' match criteria."""
+
+
+def describe(value: Union[ValueSet, AddressSet]) -> str:
+    """Return readable form of a set of values or of addresses."""
+    if isinstance(value, AddressSet):
+        if value.intervals == ANY_ADDRESS.intervals and value.names.complement:
+            return describe(value.names)
+        parts = [
+            str(IPv4Address(start))
+            if start == end
+            else f"{IPv4Address(start)}-{IPv4Address(end)}"
+            for start, end in value.intervals
+        ]
+        if value.names:
+            parts.append(describe(value.names))
+        return ", ".join(parts)
+    values = ", ".join(sorted(value.values))
+    if value.complement:
+        return f"any except {values}" if values else "any"
+    return values
+
+
+def subtract(region: Region, other: Region) -> Optional[list[Region]]:
+    """Split part of ``region`` outside of ``other`` into disjoint regions.
+
+    Returns:
+        Disjoint regions, or ``None`` when ``region`` and ``other``
+        don't overlap at all.
+    """
+    common = []
+    for value, other_value in zip(region, other):
+        both = value & other_value
+        if not both:
+            return None
+        common.append(both)
+    pieces = []
+    for dimension, value in enumerate(region):
+        rest = value - other[dimension]
+        if rest:
+            pieces.append((*common[:dimension], rest, *region[dimension + 1 :]))
+    return pieces
+
+
+def overlaps(region: Region, other: Region) -> bool:
+    """Whether ``region`` and ``other`` have any common part."""
+    return all(value & other_value for value, other_value in zip(region, other))
+
+
+def covers_projections(region: Region, others: list[Region]) -> bool:
+    """Whether ``others`` cover ``region`` in every dimension separately.
+
+    It is necessary, but not sufficient, for ``others`` to cover ``region``,
+    and much cheaper to find out.
+    """
+    for dimension, value in enumerate(region):
+        for other in others:
+            value = value - other[dimension]
+            if not value:
+                break
+        if value:
+            return False
+    return True
+
+
+def get_addresses(
+    addresses: set[str],
+    resolved: Optional[list["AddressObject"]],
+    intervals: Intervals,
+) -> AddressSet:
+    if not addresses or AnyObj in addresses:
+        return ANY_ADDRESS
+    names = frozenset(
+        obj.name for obj in resolved or () if obj.interval is None
+    )
+    return AddressSet(intervals, ValueSet(names))
+
+
+def get_source_addresses(rule: "CompiledRule") -> AddressSet:
+    return get_addresses(
+        rule.source_addresses,
+        rule.resolved_source_addresses,
+        rule.source_intervals,
+    )
+
+
+def get_destination_addresses(rule: "CompiledRule") -> AddressSet:
+    return get_addresses(
+        rule.destination_addresses,
+        rule.resolved_destination_addresses,
+        rule.destination_intervals,
+    )
+
+
+def _overlapping(index: RuleIndex, attribute: str, values: set[str]) -> Bitset:
+    if not values or AnyObj in values:
+        return index.all
+    return (
+        index.intersecting(attribute, values)
+        | index.equal(attribute, AnyObj)
+        | index.same(attribute, ())
+    )
+
+
+@memoize("applications_id")
+def overlap_application(index: RuleIndex, rule: "CompiledRule") -> Bitset:
+    return _overlapping(index, "applications", rule.applications)
+
+
+@memoize("services_id")
+def overlap_services(index: RuleIndex, rule: "CompiledRule") -> Bitset:
+    return _overlapping(index, "services", rule.services)
+
+
+@memoize("source_zones_id")
+def overlap_source_zone(index: RuleIndex, rule: "CompiledRule") -> Bitset:
+    return _overlapping(index, "source_zones", rule.source_zones)
+
+
+@memoize("destination_zones_id")
+def overlap_destination_zone(index: RuleIndex, rule: "CompiledRule") -> Bitset:
+    return _overlapping(index, "destination_zones", rule.destination_zones)
+
+
+def overlap_addresses(index: RuleIndex, rule: "CompiledRule") -> Bitset:
+    """Rules whose source × destination addresses can overlap rule's ones.
+
+    Axis with FQDN addresses is not constrained, as they have no intervals.
+    """
+    source = get_source_addresses(rule)
+    destination = get_destination_addresses(rule)
+    return index.overlapping_cells(
+        "source_intervals",
+        "destination_intervals",
+        () if source.names else source.intervals,
+        () if destination.names else destination.intervals,
+    )
+
+
+class CumulativeShadowing(ShadowingByValue):
+    """
+    This scenario identifies rules shadowed by a union of preceding rules.
+
+    Match criteria of a rule form a region, a product of its zones,
+    applications, services and addresses. Regions of preceding rules are
+    subtracted from rule's region, until nothing is left. Action is one of
+    the dimensions, so only rules with the same action are subtracted.
+    The rule is then reported with a covering set of preceding rules,
+    from which no rule can be removed.
+
+    Each check enables a dimension of the region, so excluded checks
+    are excluded from the comparison. Empty set of values is treated
+    as 'any'. FQDN addresses are compared by their names.
+
+    Every dimension, zones included, is compared by containment: rule's
+    source zones have to be contained in source zones of the covering
+    rules. It differs from ``check_source_zone`` of single rule scenarios,
+    which passes also when preceding rule's source zones are a subset of
+    rule's ones.
+
+    Pairwise checks can fail for each of the covering rules, so
+    ``explain`` tells which part of the rule each of them contains.
+    With ``cache_file``, covering sets are reused only for leading rules,
+    which are unchanged and in the same order as in the cached run, as
+    a covering set depends on all of the preceding rules.
+    """
+
+    name = "Cumulative Shadowing"
+
+    dimensions: dict[Callable, Callable[["CompiledRule"], object]] = {
+        check_source_addresses_by_ip: get_source_addresses,
+        check_destination_addresses_by_ip: get_destination_addresses,
+        check_action: lambda rule: ValueSet.from_values((rule.action,)),
+        check_application: lambda rule: ValueSet.from_values(rule.applications),
+        check_services: lambda rule: ValueSet.from_values(rule.services),
+        check_source_zone: lambda rule: ValueSet.from_values(rule.source_zones),
+        check_destination_zone: lambda rule: ValueSet.from_values(
+            rule.destination_zones
+        ),
+    }
+    """Mapping of a check to function returning a rule's set in its dimension.
+
+    Addresses go first, as they tell apart most of the rules.
+    """
+
+    overlaps: dict[Callable, Prefilter] = {
+        check_action: prefilter_action,
+        check_application: overlap_application,
+        check_services: overlap_services,
+        check_source_zone: overlap_source_zone,
+        check_destination_zone: overlap_destination_zone,
+    }
+    """Mapping of a check to function selecting rules overlapping in its dimension."""
+
+    max_regions: int = 1_000
+    """Number of regions left of a rule, above which the rule is skipped."""
+
+    regions: Optional[list[Region]] = None
+
+    coverings: Optional[dict[int, list[int]]] = None
+    """Covering sets found by ``explain``, by positions of covered rules."""
+
+    def build_index(self) -> None:
+        super().build_index()
+        self.regions = [self.get_region(rule) for rule in self.rules]
+
+    def get_dimensions(self) -> list[Callable]:
+        """Return checks of enabled dimensions, in order of regions."""
+        return [check for check in self.dimensions if check in self.checks]
+
+    def get_region(self, rule: "CompiledRule") -> Region:
+        """Return region of enabled dimensions matched by given rule."""
+        return tuple(
+            self.dimensions[check](rule) for check in self.get_dimensions()
+        )
+
+    def get_content_hash(self, rule: "CompiledRule") -> str:
+        """Return hash of rule's fingerprint and addresses, FQDN included."""
+        digest = blake2b(
+            super().get_content_hash(rule).encode(), digest_size=16
+        )
+        for addresses in (
+            get_source_addresses(rule),
+            get_destination_addresses(rule),
+        ):
+            digest.update(repr(sorted(addresses.names.values)).encode())
+        return digest.hexdigest()
+
+    def get_prefilters(self) -> list[Prefilter]:
+        """Return functions selecting rules which overlap in every dimension."""
+        prefilters = [
+            self.overlaps[check]
+            for check in self.checks
+            if check in self.overlaps
+        ]
+        if (
+            check_source_addresses_by_ip in self.checks
+            and check_destination_addresses_by_ip in self.checks
+        ):
+            prefilters.append(overlap_addresses)
+        return prefilters
+
+    def subtract_all(
+        self, regions: list[Region], positions: Iterable[int]
+    ) -> tuple[list[Region], list[int]]:
+        """Subtract regions of rules at ``positions`` until nothing is left.
+
+        Returns:
+            Regions left and positions of rules which overlapped any of them.
+            Nothing is left when it's over ``max_regions``.
+        """
+        used = []
+        for j in positions:
+            if not regions:
+                break
+            left = []
+            overlapped = False
+            for region in regions:
+                pieces = subtract(region, self.regions[j])
+                if pieces is None:
+                    left.append(region)
+                else:
+                    left.extend(pieces)
+                    overlapped = True
+            if overlapped:
+                used.append(j)
+                regions = left
+            if len(regions) > self.max_regions:
+                return regions, used
+        return regions, used
+
+    def find_covering(
+        self, position: int, candidates: Iterable[int]
+    ) -> list[int]:
+        """Return positions of preceding rules which together cover the rule.
+
+        The first candidate covering the rule alone is returned right away.
+        Otherwise, overlapping candidates are subtracted, starting from
+        those containing the rule in the most dimensions, as they split
+        remaining regions the least. Then each of the used ones is dropped,
+        if the remaining ones still cover the rule.
+
+        Returns:
+            Covering positions in ascending order, or an empty list.
+        """
+        region = self.regions[position]
+        overlapping = []
+        for j in candidates:
+            other = self.regions[j]
+            if not overlaps(region, other):
+                continue
+            contained = sum(
+                not value - other_value
+                for value, other_value in zip(region, other)
+            )
+            if contained == len(region):
+                return [j]
+            overlapping.append((-contained, j))
+        if not covers_projections(
+            region, [self.regions[j] for _, j in overlapping]
+        ):
+            return []
+        overlapping = [j for _, j in sorted(overlapping)]
+        left, used = self.subtract_all([region], overlapping)
+        if left or not used:
+            if len(left) > self.max_regions:
+                rule = self.security_rules[position]
+                logger.debug(f"Too many regions left of '{rule.name}'")
+            return []
+        covering = used
+        for j in reversed(used):
+            others = [k for k in covering if k != j]
+            if not self.subtract_all([region], others)[0]:
+                covering = others
+        return sorted(covering)
+
+    def find_shadowing(
+        self, positions: Iterable[int]
+    ) -> Iterator[tuple[int, list[int]]]:
+        if self.index is None:
+            self.build_index()
+        prefilters = self.get_prefilters()
+        for i in positions:
+            if self.delta is not None and i < self.delta.prefix:
+                covering, _ = self.delta.split(i)
+            else:
+                covering = self.find_covering(
+                    i, self.iter_candidates(i, prefilters)
+                )
+            if covering:
+                yield i, covering
+
+    def get_covering(self, position: int) -> list[int]:
+        """Return covering set of the rule at ``position``, found once."""
+        if self.coverings is None:
+            self.coverings = {}
+        covering = self.coverings.get(position)
+        if covering is None:
+            if self.index is None:
+                self.build_index()
+            covering = self.find_covering(
+                position, self.iter_candidates(position)
+            )
+            self.coverings[position] = covering
+        return covering
+
+    def explain(
+        self,
+        rule: "SecurityRule",
+        preceding_rule: "SecurityRule",
+    ) -> ChecksOutputs:
+        """Tell which part of rule's region is contained by a preceding rule.
+
+        For every enabled dimension, the preceding rule contains all, only
+        a part or none of rule's values. The last result lists the whole
+        covering set, which the preceding rule is a member of.
+        """
+        region = self.get_region(self.get_compiled(rule))
+        other = self.get_region(self.get_compiled(preceding_rule))
+        outputs = {}
+        for check, value, other_value in zip(
+            self.get_dimensions(), region, other
+        ):
+            common = value & other_value
+            if not value - other_value:
+                result = True, "Preceding rule contains all of rule's values"
+            elif common:
+                result = True, f"Preceding rule contains {describe(common)}"
+            else:
+                result = False, "Preceding rule has no common values"
+            outputs[check.__name__] = result
+        covering = [
+            self.security_rules[j].name
+            for j in self.get_covering(self.positions[rule.name])
+        ]
+        if covering:
+            outputs["covering_set"] = (
+                preceding_rule.name in covering,
+                f"Covered together by {', '.join(covering)}",
+            )
+        else:
+            outputs["covering_set"] = False, "Rule isn't covered"
+        return outputs
+
+    def execute(self) -> AnalysisResults:
+        """Find covering sets of preceding rules for all rules.
+
+        Results are already analyzed, the same as from ``iter_findings``.
+        """
+        self.execution_results = list(self.iter_findings())
+        return self.execution_results
+
+    def analyze(self, results: AnalysisResults) -> AnalysisResults:
+        self.analysis_results = results
+        return results
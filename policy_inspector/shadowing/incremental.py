@@ -0,0 +1,150 @@
+import json
+import logging
+from bisect import bisect_left, bisect_right, insort
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from policy_inspector.shadowing.base import Shadowing
+
+logger = logging.getLogger(__name__)
+
+
+class Snapshot:
+    """Content hashes of rules and shadowing found by a run of a scenario.
+
+    Verdict for a pair of rules depends only on contents of both rules,
+    so it still holds in the next run, if neither of the rules changed
+    and they are in the same order.
+
+    Args:
+        key: Scenario and its checks, see ``Shadowing.get_cache_key``.
+        hashes: Content hashes of rules by their names, in rules' order.
+        shadowing: Names of shadowing rules by names of shadowed rules.
+    """
+
+    version: int = 1
+    """Version of the file format, files of other versions are ignored."""
+
+    def __init__(
+        self,
+        key: str,
+        hashes: dict[str, str],
+        shadowing: dict[str, list[str]],
+    ):
+        self.key = key
+        self.hashes = hashes
+        self.shadowing = shadowing
+
+    @classmethod
+    def from_scenario(cls, scenario: "Shadowing") -> "Snapshot":
+        """Take snapshot of a scenario, after all of its rules were evaluated."""
+        return cls(
+            scenario.get_cache_key(),
+            {
+                rule.name: scenario.get_content_hash(rule)
+                for rule in scenario.rules
+            },
+            {
+                rule.name: [preceding.name for preceding in shadowing_rules]
+                for rule, shadowing_rules in scenario.analysis_results
+            },
+        )
+
+    @classmethod
+    def load(cls, file_path: Path) -> Optional["Snapshot"]:
+        """Read snapshot from a JSON file.
+
+        Returns:
+            Snapshot, or ``None`` if the file doesn't exist or can't be used.
+        """
+        try:
+            data = json.loads(file_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as ex:
+            logger.warning(f"☠ Cache file '{file_path}' ignored. {ex}")
+            return None
+        if not isinstance(data, dict) or data.get("version") != cls.version:
+            logger.warning(f"☠ Cache file '{file_path}' has unknown format")
+            return None
+        return cls(data["key"], dict(data["rules"]), data["shadowing"])
+
+    def save(self, file_path: Path) -> None:
+        """Write snapshot to a JSON file."""
+        data = {
+            "version": self.version,
+            "key": self.key,
+            "rules": list(self.hashes.items()),
+            "shadowing": self.shadowing,
+        }
+        file_path.write_text(json.dumps(data), encoding="utf-8")
+        logger.debug(f"Saved results of {len(self.hashes)} rules")
+
+
+class Delta:
+    """Difference between current rules and rules of a ``Snapshot``.
+
+    A rule is unchanged when a rule with the same name and content hash
+    was in the snapshot. Pairs of unchanged rules keep their verdicts,
+    unless their order was swapped.
+
+    Args:
+        snapshot: Snapshot of the previous run.
+        names: Names of current rules, in order.
+        hashes: Content hashes of current rules, in the same order.
+    """
+
+    def __init__(
+        self,
+        snapshot: Snapshot,
+        names: list[str],
+        hashes: list[str],
+    ):
+        previous = {name: k for k, name in enumerate(snapshot.hashes)}
+        positions = {name: i for i, name in enumerate(names)}
+        unchanged = [
+            snapshot.hashes.get(name) == content
+            for name, content in zip(names, hashes)
+        ]
+        self.changed: list[int] = []
+        """Positions of changed or new rules."""
+        self.reused: dict[int, tuple[list[int], list[int]]] = {}
+        """Known shadowing rules and moved preceding rules of unchanged rules."""
+        seen: list[int] = []
+        seen_at: dict[int, int] = {}
+        for i, name in enumerate(names):
+            if not unchanged[i]:
+                self.changed.append(i)
+                continue
+            old = previous[name]
+            moved = [seen_at[k] for k in seen[bisect_right(seen, old) :]]
+            known = []
+            for preceding_name in snapshot.shadowing.get(name, ()):
+                j = positions.get(preceding_name, i)
+                if j < i and unchanged[j] and previous[preceding_name] < old:
+                    known.append(j)
+            self.reused[i] = (known, moved)
+            insort(seen, old)
+            seen_at[old] = i
+        self.prefix = 0
+        """Number of leading rules, unchanged and in the snapshot's order."""
+        for name, previous_name in zip(names, snapshot.hashes):
+            if name != previous_name or not unchanged[self.prefix]:
+                break
+            self.prefix += 1
+
+    def split(self, position: int) -> Optional[tuple[list[int], list[int]]]:
+        """Split preceding rules of the rule at ``position``.
+
+        Returns:
+            Positions of preceding rules known to shadow the rule and
+            positions of preceding rules which have to be evaluated,
+            or ``None`` when the rule changed and all of them have to be.
+        """
+        reused = self.reused.get(position)
+        if reused is None:
+            return None
+        known, moved = reused
+        changed = self.changed[: bisect_left(self.changed, position)]
+        return known, sorted(changed + moved)
@@ -0,0 +1,327 @@
+import logging
+from collections.abc import Iterable, Iterator
+from functools import wraps
+from typing import TYPE_CHECKING, Callable, NamedTuple
+
+from policy_inspector.interval import (
+    IntervalArray,
+    IntervalBackend,
+    IntervalGrid,
+    Intervals,
+    IntervalTree,
+    require_numpy,
+)
+from policy_inspector.model.base import AnyObj
+
+if TYPE_CHECKING:
+    from policy_inspector.model.compiled import CompiledRule
+
+logger = logging.getLogger(__name__)
+
+Bitset = int
+"""Set of rule positions, where bit ``n`` stands for the rule at position ``n``."""
+
+
+def to_bitset(positions: Iterable[int], size: int) -> Bitset:
+    """Build a ``Bitset`` from rule positions lower than ``size``."""
+    buffer = bytearray((size >> 3) + 1)
+    for position in positions:
+        buffer[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(buffer, "little")
+
+
+class CacheInfo(NamedTuple):
+    """Numbers of cache hits and misses of a memoized prefilter."""
+
+    hits: int
+    misses: int
+
+
+def iter_bits(bitset: Bitset) -> Iterator[int]:
+    """Yield positions of all set bits in ascending order."""
+    while bitset:
+        lowest = bitset & -bitset
+        yield lowest.bit_length() - 1
+        bitset ^= lowest
+
+
+class RuleIndex:
+    """Inverted index of rule attribute values.
+
+    For every indexed attribute it keeps a mapping of a value to the
+    ``Bitset`` of rules containing that value. Postings of an attribute
+    are built once, on first use.
+
+    Args:
+        rules: Ordered list of rules to index.
+        interval_backend: Search of address intervals, ``"tree"`` or
+            ``"array"``, which requires ``numpy``.
+    """
+
+    def __init__(
+        self,
+        rules: list["CompiledRule"],
+        interval_backend: IntervalBackend = "tree",
+    ):
+        if interval_backend == "array":
+            require_numpy("Interval backend 'array'")
+        elif interval_backend != "tree":
+            raise ValueError(f"Unknown interval backend '{interval_backend}'")
+        self.interval_backend = interval_backend
+        self.rules = rules
+        self.size = len(rules)
+        self.all: Bitset = (1 << self.size) - 1
+        self.postings: dict[str, dict[str, Bitset]] = {}
+        self.groups: dict[str, dict[frozenset[str], Bitset]] = {}
+        self.trees: dict[str, IntervalTree] = {}
+        self.grids: dict[tuple[str, str], IntervalGrid] = {}
+        self.arrays: dict[str, IntervalArray] = {}
+        self.memo: dict[str, dict[int, Bitset]] = {}
+        self.hits: dict[str, int] = {}
+
+    def get_postings(self, attribute: str) -> dict[str, Bitset]:
+        """Return value to ``Bitset`` mapping for given ``attribute``."""
+        postings = self.postings.get(attribute)
+        if postings is not None:
+            return postings
+        logger.debug(f"Indexing rules by '{attribute}'")
+        positions: dict[str, list[int]] = {}
+        for position, rule in enumerate(self.rules):
+            values = getattr(rule, attribute)
+            if isinstance(values, str):
+                values = (values,)
+            for value in values:
+                positions.setdefault(value, []).append(position)
+        postings = {
+            value: to_bitset(value_positions, self.size)
+            for value, value_positions in positions.items()
+        }
+        self.postings[attribute] = postings
+        return postings
+
+    def cache_info(self) -> dict[str, CacheInfo]:
+        """Return cache hits and misses of each memoized prefilter."""
+        return {
+            name: CacheInfo(self.hits[name], len(cache))
+            for name, cache in self.memo.items()
+        }
+
+    def equal(self, attribute: str, value: str) -> Bitset:
+        """Rules whose ``attribute`` is or contains ``value``."""
+        return self.get_postings(attribute).get(value, 0)
+
+    def supersets(self, attribute: str, values: Iterable[str]) -> Bitset:
+        """Rules whose ``attribute`` contains every element of ``values``."""
+        postings = self.get_postings(attribute)
+        result = self.all
+        for value in values:
+            result &= postings.get(value, 0)
+            if not result:
+                break
+        return result
+
+    def same(self, attribute: str, values: Iterable[str]) -> Bitset:
+        """Rules whose ``attribute`` is equal to ``values``."""
+        groups = self.groups.get(attribute)
+        if groups is None:
+            positions: dict[frozenset[str], list[int]] = {}
+            for position, rule in enumerate(self.rules):
+                key = frozenset(getattr(rule, attribute))
+                positions.setdefault(key, []).append(position)
+            groups = {
+                key: to_bitset(group_positions, self.size)
+                for key, group_positions in positions.items()
+            }
+            self.groups[attribute] = groups
+        return groups.get(frozenset(values), 0)
+
+    def covering(self, attribute: str, intervals: Intervals) -> Bitset:
+        """Rules whose merged ``attribute`` intervals contain all ``intervals``.
+
+        Intervals of all rules are searched at once in an ``IntervalArray``
+        with the ``"array"`` backend, otherwise in an ``IntervalTree``.
+        """
+        if self.interval_backend == "array":
+            return self.get_interval_array(attribute).containing(intervals)
+        tree = self.trees.get(attribute)
+        if tree is None:
+            logger.debug(f"Building interval tree of '{attribute}'")
+            tree = IntervalTree(
+                (start, end, position)
+                for position, rule in enumerate(self.rules)
+                for start, end in getattr(rule, attribute)
+            )
+            self.trees[attribute] = tree
+        result = self.all
+        for start, end in intervals:
+            result &= tree.containing(start, end)
+            if not result:
+                break
+        return result
+
+    def get_interval_array(self, attribute: str) -> IntervalArray:
+        """Return intervals of ``attribute`` of all rules in flat arrays."""
+        array = self.arrays.get(attribute)
+        if array is None:
+            logger.debug(f"Building interval array of '{attribute}'")
+            array = IntervalArray(
+                getattr(rule, attribute) for rule in self.rules
+            )
+            self.arrays[attribute] = array
+        return array
+
+    def get_grid(self, x_attribute: str, y_attribute: str) -> IntervalGrid:
+        """Return grid of ``x_attribute`` × ``y_attribute`` intervals."""
+        key = x_attribute, y_attribute
+        grid = self.grids.get(key)
+        if grid is None:
+            logger.debug(f"Building grid of '{x_attribute}' × '{y_attribute}'")
+            grid = IntervalGrid(
+                (getattr(rule, x_attribute), getattr(rule, y_attribute))
+                for rule in self.rules
+            )
+            self.grids[key] = grid
+        return grid
+
+    def containing_cells(
+        self,
+        x_attribute: str,
+        y_attribute: str,
+        x_intervals: Intervals,
+        y_intervals: Intervals,
+    ) -> Bitset:
+        """Rules whose ``x_attribute`` × ``y_attribute`` region can contain
+        the ``x_intervals`` × ``y_intervals`` region.
+
+        It's a coarse lookup in an ``IntervalGrid``, the result may include
+        rules which don't contain the region.
+        """
+        grid = self.get_grid(x_attribute, y_attribute)
+        return grid.containing(x_intervals, y_intervals)
+
+    def overlapping_cells(
+        self,
+        x_attribute: str,
+        y_attribute: str,
+        x_intervals: Intervals,
+        y_intervals: Intervals,
+    ) -> Bitset:
+        """Rules whose ``x_attribute`` × ``y_attribute`` region can overlap
+        the ``x_intervals`` × ``y_intervals`` region.
+
+        The same as ``containing_cells``, the result is coarse.
+        """
+        grid = self.get_grid(x_attribute, y_attribute)
+        return grid.overlapping(x_intervals, y_intervals)
+
+    def intersecting(self, attribute: str, values: Iterable[str]) -> Bitset:
+        """Rules whose ``attribute`` contains any element of ``values``."""
+        postings = self.get_postings(attribute)
+        result = 0
+        for value in values:
+            result |= postings.get(value, 0)
+        return result
+
+    def subsets(self, attribute: str, values: Iterable[str]) -> Bitset:
+        """Rules whose ``attribute`` contains only elements of ``values``."""
+        outside = 0
+        for value, bitset in self.get_postings(attribute).items():
+            if value not in values:
+                outside |= bitset
+        return self.all & ~outside
+
+
+Prefilter = Callable[[RuleIndex, "CompiledRule"], Bitset]
+"""
+A function returning ``Bitset`` of rules for which a check can pass,
+when the given rule is compared against them as preceding rules.
+"""
+
+
+def memoize(attribute: str) -> Callable[[Prefilter], Prefilter]:
+    """Cache results of a prefilter by id of rule's interned set.
+
+    Result of a set-based check depends only on the sets of both rules,
+    so the prefilter's ``Bitset`` is the same for all rules sharing the set.
+    It is computed once per distinct set and kept in the index, so it's
+    dropped together with the index.
+
+    Args:
+        attribute: Name of ``CompiledRule`` attribute with id of the set.
+    """
+
+    def decorator(prefilter: Prefilter) -> Prefilter:
+        name = prefilter.__name__
+
+        @wraps(prefilter)
+        def memoized(index: RuleIndex, rule: "CompiledRule") -> Bitset:
+            cache = index.memo.get(name)
+            if cache is None:
+                cache = index.memo[name] = {}
+                index.hits[name] = 0
+            key = getattr(rule, attribute)
+            result = cache.get(key)
+            if result is None:
+                result = cache[key] = prefilter(index, rule)
+            else:
+                index.hits[name] += 1
+            return result
+
+        return memoized
+
+    return decorator
+
+
+def prefilter_action(index: RuleIndex, rule: "CompiledRule") -> Bitset:
+    """Candidates for ``check_action``."""
+    return index.equal("action", rule.action)
+
+
+@memoize("source_zones_id")
+def prefilter_source_zone(index: RuleIndex, rule: "CompiledRule") -> Bitset:
+    """Candidates for ``check_source_zone``."""
+    return index.subsets("source_zones", rule.source_zones) | index.equal(
+        "source_zones", AnyObj
+    )
+
+
+@memoize("destination_zones_id")
+def prefilter_destination_zone(
+    index: RuleIndex, rule: "CompiledRule"
+) -> Bitset:
+    """Candidates for ``check_destination_zone``."""
+    return index.supersets(
+        "destination_zones", rule.destination_zones
+    ) | index.equal("destination_zones", AnyObj)
+
+
+@memoize("source_addresses_id")
+def prefilter_source_address(index: RuleIndex, rule: "CompiledRule") -> Bitset:
+    """Candidates for ``check_source_address``."""
+    return index.supersets(
+        "source_addresses", rule.source_addresses
+    ) | index.equal("source_addresses", AnyObj)
+
+
+@memoize("destination_addresses_id")
+def prefilter_destination_address(
+    index: RuleIndex, rule: "CompiledRule"
+) -> Bitset:
+    """Candidates for ``check_destination_address``."""
+    return index.supersets(
+        "destination_addresses", rule.destination_addresses
+    ) | index.equal("destination_addresses", AnyObj)
+
+
+@memoize("applications_id")
+def prefilter_application(index: RuleIndex, rule: "CompiledRule") -> Bitset:
+    """Candidates for ``check_application``."""
+    return index.supersets("applications", rule.applications) | index.equal(
+        "applications", AnyObj
+    )
+
+
+@memoize("services_id")
+def prefilter_services(index: RuleIndex, rule: "CompiledRule") -> Bitset:
+    """Candidates for ``check_services``."""
+    return index.supersets("services", rule.services)
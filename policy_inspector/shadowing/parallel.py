@@ -0,0 +1,76 @@
+import logging
+import math
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from policy_inspector.shadowing.base import Shadowing
+
+logger = logging.getLogger(__name__)
+
+CHUNKS_PER_JOB = 4
+"""Chunks per worker, so that faster workers can pick up remaining ones."""
+
+_scenario: Optional["Shadowing"] = None
+"""Scenario received by a worker process."""
+
+
+def partition(count: int, chunks: int) -> list[range]:
+    """Split positions of ``count`` rules into ranges with similar workload.
+
+    A rule at position ``i`` is compared with ``i`` preceding rules, so first
+    ``m`` rules need ``m * (m - 1) / 2`` comparisons. Bounds are placed where
+    that triangular number reaches consecutive fractions of the total.
+
+    Args:
+        count: Number of rules.
+        chunks: Maximum number of ranges.
+
+    Returns:
+        Consecutive, non-empty ranges covering all positions.
+    """
+    total = count * (count - 1) / 2
+    bounds = [0]
+    for k in range(1, chunks):
+        bound = math.ceil((1 + math.sqrt(1 + 8 * total * k / chunks)) / 2)
+        if bounds[-1] < bound < count:
+            bounds.append(bound)
+    if count:
+        bounds.append(count)
+    return [range(start, stop) for start, stop in zip(bounds, bounds[1:])]
+
+
+def _init_worker(scenario: "Shadowing") -> None:
+    global _scenario
+    _scenario = scenario
+    _scenario.build_index()
+
+
+def _find_shadowing(positions: range) -> list[tuple[int, list[int]]]:
+    return list(_scenario.find_shadowing(positions))
+
+
+def find_shadowing(
+    scenario: "Shadowing",
+    jobs: int,
+) -> Iterator[tuple[int, list[int]]]:
+    """Run ``Shadowing.find_shadowing`` for all rules in a pool of processes.
+
+    Scenario is sent to every worker once, when it starts. Only positions
+    are exchanged afterward. Results are yielded in order of positions,
+    the same as in a serial run.
+
+    Args:
+        scenario: Scenario to evaluate.
+        jobs: Number of worker processes.
+    """
+    chunks = partition(len(scenario.security_rules), jobs * CHUNKS_PER_JOB)
+    logger.info(f"↺ Evaluating {len(chunks)} chunks in {jobs} processes")
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(scenario,),
+    ) as executor:
+        for found in executor.map(_find_shadowing, chunks):
+            yield from found
@@ -0,0 +1,193 @@
+import logging
+import sys
+from array import array
+from collections.abc import Iterator, Mapping
+from functools import cache
+from typing import TYPE_CHECKING, Callable
+
+from policy_inspector.scenario import CheckResult
+
+if TYPE_CHECKING:
+    from policy_inspector.model.compiled import CompiledRule
+
+logger = logging.getLogger(__name__)
+
+
+def get_typecode(bits: int) -> str:
+    """Return the smallest unsigned ``array`` typecode able to hold ``bits``."""
+    for typecode in ("B", "H", "I", "L", "Q"):
+        if array(typecode).itemsize * 8 >= bits:
+            return typecode
+    raise ValueError(f"Can't store {bits} checks results in a single mask")
+
+
+@cache
+def _lanes_table(itemsize: int) -> tuple[bytes, ...]:
+    """Map each byte value to its 8 bits spread into ``itemsize`` wide lanes."""
+    return tuple(
+        b"".join(
+            ((value >> n) & 1).to_bytes(itemsize, "little") for n in range(8)
+        )
+        for value in range(256)
+    )
+
+
+def spread_bits(bitset: int, length: int, itemsize: int) -> int:
+    """Move bit ``n`` of ``bitset`` to the lowest bit of ``n``-th lane.
+
+    Lanes are ``itemsize`` bytes wide, only first ``length`` bits are used.
+    """
+    table = _lanes_table(itemsize)
+    raw = (bitset & ((1 << length) - 1)).to_bytes((length >> 3) + 1, "little")
+    return int.from_bytes(b"".join(map(table.__getitem__, raw)), "little")
+
+
+class PackedResults(Mapping[str, "PrecedingRulesResults"]):
+    """Checks results of all pairs of rules packed into a single ``array``.
+
+    Every pair of a rule at position ``i`` and a preceding rule at position
+    ``j`` has one bitmask, where bit ``k`` is set when ``checks[k]`` passed.
+    Masks are stored in a triangular layout, row by row.
+
+    It can be read as ``ExecuteResults``, that is
+    ``results[rule_name][preceding_rule_name][check_name]``.
+    Check's message is not stored, it is created by running the check
+    again when the result is read.
+
+    Args:
+        rules: Ordered list of evaluated rules.
+        checks: Checks which results are stored.
+        prefiltered: Bitmask of checks evaluated for every pair. Other checks
+            are evaluated only for pairs which passed all of those.
+    """
+
+    def __init__(
+        self,
+        rules: list["CompiledRule"],
+        checks: list[Callable],
+        prefiltered: int = 0,
+    ):
+        self.rules = rules
+        self.checks = list(checks)
+        self.bits = {check.__name__: 1 << k for k, check in enumerate(checks)}
+        self.full = (1 << len(self.checks)) - 1
+        self.prefiltered = prefiltered
+        self.positions = {rule.name: i for i, rule in enumerate(rules)}
+        size = len(rules) * (len(rules) - 1) // 2
+        self.masks = array(get_typecode(len(self.checks)), [0]) * size
+        self.errors: dict[int, int] = {}
+        """Bitmasks of checks which raised an error, keyed by pair offset."""
+
+    @staticmethod
+    def offset(i: int, j: int) -> int:
+        """Position of the ``(i, j)`` pair in ``masks``."""
+        return i * (i - 1) // 2 + j
+
+    def get_mask(self, i: int, j: int) -> int:
+        return self.masks[self.offset(i, j)]
+
+    def get_known_mask(self, i: int, j: int) -> int:
+        """Bitmask of checks which were evaluated for the ``(i, j)`` pair."""
+        mask = self.get_mask(i, j)
+        if mask & self.prefiltered == self.prefiltered:
+            return self.full
+        return self.prefiltered
+
+    def set_row(self, i: int, row: int) -> None:
+        """Set masks of all preceding rules of the rule at position ``i``.
+
+        Args:
+            i: Position of a rule.
+            row: Masks of consecutive pairs packed into a single integer,
+                as produced by ``spread_bits``.
+        """
+        itemsize = self.masks.itemsize
+        values = array(
+            self.masks.typecode, row.to_bytes(i * itemsize, "little")
+        )
+        if sys.byteorder == "big":
+            values.byteswap()
+        start = self.offset(i, 0)
+        self.masks[start : start + i] = values
+
+    def passed(self, i: int, j: int) -> bool:
+        """Whether all checks passed for the ``(i, j)`` pair."""
+        return self.get_mask(i, j) == self.full
+
+    def iter_passed(self, i: int) -> Iterator[int]:
+        """Yield positions of preceding rules for which all checks passed."""
+        start = self.offset(i, 0)
+        full = self.full
+        for j, mask in enumerate(self.masks[start : start + i]):
+            if mask == full:
+                yield j
+
+    @property
+    def nbytes(self) -> int:
+        return self.masks.itemsize * len(self.masks)
+
+    def __getitem__(self, rule_name: str) -> "PrecedingRulesResults":
+        return PrecedingRulesResults(self, self.positions[rule_name])
+
+    def __iter__(self) -> Iterator[str]:
+        return (rule.name for rule in self.rules)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+
+class PrecedingRulesResults(Mapping[str, "ChecksResults"]):
+    """Results of a single rule, keyed by preceding rule's name."""
+
+    def __init__(self, results: PackedResults, position: int):
+        self.results = results
+        self.position = position
+
+    def __getitem__(self, preceding_rule_name: str) -> "ChecksResults":
+        j = self.results.positions[preceding_rule_name]
+        if j >= self.position:
+            raise KeyError(preceding_rule_name)
+        return ChecksResults(self.results, self.position, j)
+
+    def __iter__(self) -> Iterator[str]:
+        return (rule.name for rule in self.results.rules[: self.position])
+
+    def __len__(self) -> int:
+        return self.position
+
+
+class ChecksResults(Mapping[str, CheckResult]):
+    """Results of all checks for a single pair of rules."""
+
+    def __init__(self, results: PackedResults, i: int, j: int):
+        self.results = results
+        self.i = i
+        self.j = j
+
+    @property
+    def mask(self) -> int:
+        """Bitmask of passed checks. Bits of not evaluated checks are unset."""
+        return self.results.get_mask(self.i, self.j)
+
+    def _errors(self) -> int:
+        return self.results.errors.get(self.results.offset(self.i, self.j), 0)
+
+    def __getitem__(self, check_name: str) -> CheckResult:
+        bit = self.results.bits[check_name]
+        if bit & self._errors():
+            raise KeyError(check_name)
+        check = self.results.checks[bit.bit_length() - 1]
+        rules = self.results.rules
+        status, message = check(rules[self.i], rules[self.j])
+        if bit & self.results.get_known_mask(self.i, self.j):
+            status = bool(self.mask & bit)
+        return status, message
+
+    def __iter__(self) -> Iterator[str]:
+        errors = self._errors()
+        return (
+            name for name, bit in self.results.bits.items() if not bit & errors
+        )
+
+    def __len__(self) -> int:
+        return len(self.results.bits) - bin(self._errors()).count("1")
@@ -1,57 +1,67 @@
 import logging
+from collections.abc import Iterable
 from typing import TYPE_CHECKING
 
 from rich.table import Table
 
 if TYPE_CHECKING:
-    from .base import AnalysisResults
+    from policy_inspector.model.security_rule import SecurityRule
+
+    from .base import Duplicate
 
 logger = logging.getLogger(__name__)
 
 
-def show_as_text(analysis_results: "AnalysisResults") -> None:
-    logger.info("Analysis results")
-    logger.info("----------------")
-    for rule, shadowing_rules in analysis_results:
-        if shadowing_rules:
-            logger.info(f"✖ '{rule.name}' shadowed by:")
-            for preceding_rule in shadowing_rules:
-                logger.info(f"   • '{preceding_rule.name}'")
-        else:
-            logger.debug(f"✔ '{rule.name}' not shadowed")
-    logger.info("----------------")
+def show_finding_as_text(
+    number: int,
+    rule: "SecurityRule",
+    shadowing_rules: list["SecurityRule"],
+) -> None:
+    if not shadowing_rules:
+        logger.debug(f"✔ '{rule.name}' not shadowed")
+        return
+    logger.info(f"✖ '{rule.name}' shadowed by:")
+    for preceding_rule in shadowing_rules:
+        logger.info(f"   • '{preceding_rule.name}'")
 
 
-def show_as_table(analysis_results: "AnalysisResults") -> None:
+def show_finding_as_table(
+    number: int,
+    rule: "SecurityRule",
+    shadowing_rules: list["SecurityRule"],
+) -> None:
     from rich.console import Console
 
-    console = Console()
+    if not shadowing_rules:
+        return
+
+    table = Table(title=f"Finding {number}", show_lines=True)
 
-    for i, result in enumerate(analysis_results):
-        rule, shadowing_rules = result
-        if not shadowing_rules:
-            continue
+    main_headers = ["Attribute", "Shadowed Rule"]
+    next_headers = [
+        f"Preceding Rule {i}" for i in range(1, len(shadowing_rules) + 1)
+    ]
+    for header in main_headers + next_headers:
+        table.add_column(header)
 
-        table = Table(title=f"Finding {i + 1}", show_lines=True)
+    rules = [rule] + shadowing_rules
 
-        main_headers = ["Attribute", "Shadowed Rule"]
-        next_headers = [
-            f"Preceding Rule {i}" for i in range(1, len(shadowing_rules) + 1)
-        ]
-        for header in main_headers + next_headers:
-            table.add_column(header)
+    for attribute_name in rule.__pydantic_fields__:
+        attribute_values = []
+        for table_rule in rules:
+            rule_attribute = getattr(table_rule, attribute_name)
+            if isinstance(rule_attribute, (set, list)):
+                value = "\n".join(f"- {str(v)}" for v in rule_attribute)
+            else:
+                value = str(rule_attribute)
+            attribute_values.append(value)
+        table.add_row(attribute_name, *attribute_values)
 
-        rules = [rule] + shadowing_rules
+    Console().print(table)
 
-        for attribute_name in rule.__pydantic_fields__:
-            attribute_values = []
-            for rule in rules:
-                rule_attribute = getattr(rule, attribute_name)
-                if isinstance(rule_attribute, (set, list)):
-                    value = "\n".join(f"- {str(v)}" for v in rule_attribute)
-                else:
-                    value = str(rule_attribute)
-                attribute_values.append(value)
-            table.add_row(attribute_name, *attribute_values)
 
-        console.print(table)
+def show_duplicates(duplicates: Iterable["Duplicate"]) -> None:
+    """Log rules identical to preceding rules, apart from their names."""
+    for rule, same_rules in duplicates:
+        names = ", ".join(f"'{same_rule.name}'" for same_rule in same_rules)
+        logger.info(f"⧉ '{rule.name}' duplicates: {names}")
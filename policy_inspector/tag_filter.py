@@ -0,0 +1,158 @@
+import re
+from collections.abc import Iterator
+from functools import lru_cache
+from typing import Callable, Union
+
+TagFilter = Union[str, tuple[str, tuple["TagFilter", ...]]]
+"""Parsed filter, a tag name or an operator with its operands.
+
+Operators are ``and`` and ``or`` with many operands and ``not`` with one.
+"""
+
+_TOKEN = re.compile(
+    r"""\s*(?:(?P<paren>[()])|'(?P<single>[^']*)'|"(?P<double>[^"]*)"|(?P<word>[^\s()'"]+))"""
+)
+_OPERATORS = {"and", "or", "not"}
+
+
+def tokenize(expression: str) -> Iterator[tuple[str, str]]:
+    """Yield ``(kind, value)`` of tokens of a filter expression.
+
+    Kind is ``"tag"`` for a quoted or bare tag name, otherwise it's
+    an operator or a parenthesis.
+
+    Raises:
+        ValueError: For an unterminated quote.
+    """
+    position = 0
+    end = len(expression.rstrip())
+    while position < end:
+        match = _TOKEN.match(expression, position)
+        if match is None:
+            raise ValueError(
+                f"Unexpected character at {position} in '{expression}'"
+            )
+        position = match.end()
+        paren, single, double, word = match.groups()
+        if paren:
+            yield paren, paren
+        elif single is not None or double is not None:
+            yield "tag", single if single is not None else double
+        elif word.lower() in _OPERATORS:
+            yield word.lower(), word
+        else:
+            yield "tag", word
+
+
+class _Parser:
+    """Recursive descent parser of the grammar::
+
+    expression := term ("or" term)*
+    term := factor ("and" factor)*
+    factor := "not" factor | "(" expression ")" | tag
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.tokens = list(tokenize(expression))
+        self.position = 0
+
+    def peek(self) -> str:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position][0]
+        return ""
+
+    def take(self, kind: str) -> str:
+        if self.peek() != kind:
+            found = (
+                repr(self.tokens[self.position][1]) if self.peek() else "end"
+            )
+            raise ValueError(
+                f"Expected {kind!r}, found {found} in '{self.expression}'"
+            )
+        self.position += 1
+        return self.tokens[self.position - 1][1]
+
+    def parse(self) -> TagFilter:
+        node = self.parse_or()
+        if self.peek():
+            found = self.tokens[self.position][1]
+            raise ValueError(f"Unexpected {found!r} in '{self.expression}'")
+        return node
+
+    def parse_or(self) -> TagFilter:
+        return self.parse_operation("or", self.parse_and)
+
+    def parse_and(self) -> TagFilter:
+        return self.parse_operation("and", self.parse_factor)
+
+    def parse_operation(
+        self, operator: str, parse_operand: Callable[[], TagFilter]
+    ) -> TagFilter:
+        operands = [parse_operand()]
+        while self.peek() == operator:
+            self.position += 1
+            operands.append(parse_operand())
+        if len(operands) == 1:
+            return operands[0]
+        return operator, tuple(operands)
+
+    def parse_factor(self) -> TagFilter:
+        if self.peek() == "not":
+            self.position += 1
+            return "not", (self.parse_factor(),)
+        if self.peek() == "(":
+            self.position += 1
+            node = self.parse_or()
+            self.take(")")
+            return node
+        return self.take("tag")
+
+
+@lru_cache(maxsize=1024)
+def parse_filter(expression: str) -> TagFilter:
+    """Parse filter of a dynamic Address Group, e.g. ``'web' and not 'dev'``.
+
+    Tags are quoted or bare words. ``not`` binds the strongest, then
+    ``and``, then ``or``. Operators are case-insensitive.
+
+    Raises:
+        ValueError: If the expression isn't valid.
+    """
+    return _Parser(expression).parse()
+
+
+def evaluate_filter(
+    node: TagFilter,
+    tagged: Callable[[str], frozenset[int]],
+    within: frozenset[int],
+) -> frozenset[int]:
+    """Return ids of objects ``within`` given ones, which match a filter.
+
+    Operands of ``and`` narrow down objects for the next operands,
+    starting from tags with the fewest objects, so that ``not`` and ``or``
+    are evaluated only over objects which can still match.
+
+    Args:
+        node: Filter returned by ``parse_filter``.
+        tagged: Function returning ids of objects with a tag.
+        within: Ids of objects to match, e.g. of all objects.
+    """
+    if isinstance(node, str):
+        return tagged(node) & within
+    operator, operands = node
+    if operator == "not":
+        return within - evaluate_filter(operands[0], tagged, within)
+    if operator == "or":
+        return frozenset().union(
+            *(evaluate_filter(operand, tagged, within) for operand in operands)
+        )
+    tags = sorted(
+        (operand for operand in operands if isinstance(operand, str)),
+        key=lambda tag: len(tagged(tag)),
+    )
+    for operand in tags + [op for op in operands if not isinstance(op, str)]:
+        if not within:
+            break
+        within = evaluate_filter(operand, tagged, within)
+    return within
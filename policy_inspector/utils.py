@@ -93,6 +93,62 @@ def html_report(arg_name: str = "html_report") -> Callable:
     )
 
 
+def jobs_option(arg_name: str = "jobs") -> Callable:
+    return click.option(
+        "-j",
+        "--jobs",
+        arg_name,
+        type=click.IntRange(min=1),
+        default=1,
+        show_default=True,
+        nargs=1,
+        help="Number of processes used to evaluate rules.",
+    )
+
+
+def cache_option(arg_name: str = "cache_file") -> Callable:
+    return click.option(
+        "--cache",
+        arg_name,
+        type=click.Path(dir_okay=False, path_type=Path),
+        default=None,
+        nargs=1,
+        help="File with results of the previous run. Only changed rules are evaluated again.",
+    )
+
+
+def store_option(arg_name: str = "store_path") -> Callable:
+    return click.option(
+        "--store",
+        arg_name,
+        type=click.Path(dir_okay=False, path_type=Path),
+        default=None,
+        nargs=1,
+        help="SQLite database to which rules and findings are added.",
+    )
+
+
+def store_masks_option(arg_name: str = "store_masks") -> Callable:
+    return click.option(
+        "--store-masks",
+        arg_name,
+        is_flag=True,
+        help="Keep checks results of all pairs of rules and add them to the `--store` database.",
+    )
+
+
+def interval_backend_option(arg_name: str = "interval_backend") -> Callable:
+    return click.option(
+        "--intervals",
+        arg_name,
+        type=click.Choice(["tree", "array"]),
+        default="tree",
+        show_default=True,
+        nargs=1,
+        help="Search of address intervals. `array` is faster for many overlapping networks and requires `policy-inspector[numpy]`.",
+    )
+
+
 def config_logger(
     logger_name: str = "policy_inspector",
     default_level: str = "INFO",
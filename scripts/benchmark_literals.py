@@ -0,0 +1,96 @@
+"""Measure cost of creating Address Objects of IP literals, per single value.
+
+Compares ``Resolver._create_object``, which parses canonical literals
+with ``parse_ip_literal`` and creates objects with ``model_construct``,
+with full validation of the same values by pydantic, either of the right
+subclass or trying a network first and a range after it fails. Each way
+is measured ``REPEAT`` times, the best time is shown.
+
+Usage:
+    python scripts/benchmark_literals.py [COUNT]
+"""
+
+import random
+import sys
+import time
+from collections.abc import Callable
+from ipaddress import IPv4Address
+
+from policy_inspector.interval import parse_ip_literal
+from policy_inspector.model.address_object import (
+    AddressObject,
+    AddressObjectIPNetwork,
+    AddressObjectIPRange,
+)
+from policy_inspector.resolver import Resolver
+
+REPEAT = 5
+
+
+def make_literals(count: int, seed: int = 0) -> list[str]:
+    """Return canonical IP networks and ranges, half of each."""
+    rng = random.Random(seed)
+    literals = []
+    for i in range(count):
+        start = rng.getrandbits(32)
+        if i % 2:
+            prefix = rng.randint(8, 32)
+            network = start >> (32 - prefix) << (32 - prefix)
+            literals.append(f"{IPv4Address(network)}/{prefix}")
+        else:
+            end = min(start + rng.getrandbits(16), (1 << 32) - 1)
+            literals.append(f"{IPv4Address(start)}-{IPv4Address(end)}")
+    return literals
+
+
+def validate(value: str) -> AddressObject:
+    """Create Address Object of ``value`` with validation of its subclass."""
+    if "-" in value:
+        return AddressObjectIPRange(name=value, value=value)
+    return AddressObjectIPNetwork(name=value, value=value)
+
+
+def validate_fallback(value: str) -> AddressObject:
+    """Create Address Object of ``value`` trying a network, then a range."""
+    try:
+        return AddressObjectIPNetwork(name=value, value=value)
+    except ValueError:
+        return AddressObjectIPRange(name=value, value=value)
+
+
+def measure(
+    create: Callable[[str], AddressObject], literals: list[str]
+) -> tuple[float, list[AddressObject]]:
+    best = float("inf")
+    for _ in range(REPEAT):
+        parse_ip_literal.cache_clear()
+        start = time.perf_counter()
+        address_objects = [create(literal) for literal in literals]
+        best = min(best, time.perf_counter() - start)
+    return best, address_objects
+
+
+def main(count: int) -> None:
+    literals = make_literals(count)
+    results = {
+        "parse_ip_literal": measure(Resolver._create_object, literals),
+        "validation": measure(validate, literals),
+        "fallback": measure(validate_fallback, literals),
+    }
+
+    fast, constructed = results["parse_ip_literal"]
+    for name, (elapsed, address_objects) in results.items():
+        if [ao.interval for ao in address_objects] != [
+            ao.interval for ao in constructed
+        ]:
+            raise SystemExit(f"Intervals of '{name}' objects differ")
+        per_value = elapsed / count * 1e6
+        print(
+            f"{name:<16} {count:>8} values "
+            f"{elapsed:8.3f} s {per_value:8.1f} us/value "
+            f"{elapsed / fast:6.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
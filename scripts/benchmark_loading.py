@@ -0,0 +1,56 @@
+"""Measure cost of loading models from JSON exports, per single object.
+
+Usage:
+    python scripts/benchmark_loading.py [COUNT]
+"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from policy_inspector.loader import load_model
+from policy_inspector.model.address_group import AddressGroup
+from policy_inspector.model.address_object import AddressObject
+from policy_inspector.model.security_rule import SecurityRule
+
+EXAMPLE_DIR = (
+    Path(__file__).parent.parent / "policy_inspector" / "example" / "1"
+)
+
+MODELS = [
+    (SecurityRule, "policies.json"),
+    (AddressObject, "address_objects.json"),
+    (AddressGroup, "address_groups.json"),
+]
+
+
+def make_export(file_name: str, count: int) -> list[dict]:
+    """Repeat elements of an example export up to ``count`` unique ones."""
+    elements = json.loads((EXAMPLE_DIR / file_name).read_text())
+    return [
+        {**elements[i % len(elements)], "@name": f"object-{i}"}
+        for i in range(count)
+    ]
+
+
+def main(count: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        for model_cls, file_name in MODELS:
+            file_path = Path(directory) / file_name
+            file_path.write_text(json.dumps(make_export(file_name, count)))
+
+            start = time.perf_counter()
+            models = load_model(model_cls, file_path)
+            elapsed = time.perf_counter() - start
+
+            per_object = elapsed / len(models) * 1e6
+            print(
+                f"{model_cls.plural:<16} {len(models):>8} objects "
+                f"{elapsed:8.3f} s {per_object:8.1f} us/object"
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -4,6 +4,7 @@ import pytest
 from _pytest.mark import ParameterSet
 
 from policy_inspector.model.base import AnyObj
+from policy_inspector.model.compiled import CompiledRule
 from policy_inspector.model.security_rule import SecurityRule
 from policy_inspector.shadowing.checks import (
     check_action,
@@ -156,9 +157,9 @@ CHECK_TEST_VALUES = generate_checks_test_data()
     CHECK_TEST_VALUES,
 )
 def test_(check_func, rule_params, preceding_rule_params, expected_result):
-    rule = SecurityRule(name="rule0", **rule_params)
-    preceding_rule = SecurityRule(
-        name="rule_before_rule0", **preceding_rule_params
+    rule = CompiledRule(SecurityRule(name="rule0", **rule_params))
+    preceding_rule = CompiledRule(
+        SecurityRule(name="rule_before_rule0", **preceding_rule_params)
     )
     result = check_func(rule, preceding_rule)
     assert result == expected_result
@@ -1,7 +1,11 @@
+from pathlib import Path
+
 import pytest
 from click.testing import CliRunner
 
 from policy_inspector import cli
+from policy_inspector.resolver import Resolver
+from policy_inspector.utils import get_example_file_path
 
 
 @pytest.fixture
@@ -62,3 +66,31 @@ def test_run_example(runner, name):
     assert result.exit_code == 0
     for phrase in phrases:
         assert phrase in result.output
+
+
+def test_run_device_groups(runner, tmp_path, monkeypatch):
+    example_dir = get_example_file_path(Path("1"))
+    for kind in ("address_objects", "address_groups"):
+        (tmp_path / f"shared_{kind}.json").write_text(
+            (example_dir / f"{kind}.json").read_text()
+        )
+    device_groups = ["DG One", "dg2"]
+    for device_group in device_groups:
+        prefix = tmp_path / cli.get_file_prefix(device_group)
+        Path(f"{prefix}security_rules.json").write_text(
+            (example_dir / "policies.json").read_text()
+        )
+        Path(f"{prefix}address_objects.json").write_text("[]")
+        Path(f"{prefix}address_groups.json").write_text("[]")
+    resolvers = []
+    monkeypatch.setattr(
+        cli, "Resolver", lambda *args: resolvers.append(args) or Resolver(*args)
+    )
+
+    result = runner.invoke(
+        cli.main_run,
+        ["devicegroups", *device_groups, "--directory", str(tmp_path)],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert len(resolvers) == 1
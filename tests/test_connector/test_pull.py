@@ -0,0 +1,171 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from click import ClickException
+
+from policy_inspector.cli import get_data_from_panorama
+from policy_inspector.connector.panorama import PanoramaConnector
+
+
+class PanoramaStub(ThreadingHTTPServer):
+    """Stand-in for Panorama, which counts requests and concurrent ones."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), PanoramaHandler)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.active = 0
+        self.max_active = 0
+        self.clients = set()
+        self.failing = {"broken"}
+
+
+class PanoramaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def send(self, status: int, body: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def do_POST(self):  # noqa: N802
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send(200, "<response><result><key>token</key></result></response>")
+
+    def do_GET(self):  # noqa: N802
+        server = self.server
+        with server.lock:
+            server.clients.add(self.client_address)
+            server.requests += 1
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            device_group = query.get("device-group", ["shared"])[0]
+            if device_group in server.failing:
+                self.send(500, "failure")
+                return
+            resource = url.path.rsplit("/", 1)[-1]
+            entry = [{"@name": f"{device_group}-{resource}"}]
+            self.send(200, json.dumps({"result": {"entry": entry}}))
+        finally:
+            with server.lock:
+                server.active -= 1
+
+
+@pytest.fixture
+def panorama():
+    server = PanoramaStub()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def pull(panorama, device_groups, **kwargs):
+    return get_data_from_panorama(
+        hostname="127.0.0.1",
+        username="user",
+        password="password",  # noqa: S106
+        api_version="v11.1",
+        device_groups=device_groups,
+        verify_ssl=False,
+        scheme="http",
+        port=panorama.server_port,
+        **kwargs,
+    )
+
+
+def test_get_requests_keep_alive(panorama):
+    connector = PanoramaConnector(
+        "127.0.0.1",
+        "user",
+        "password",
+        port=panorama.server_port,
+        scheme="http",
+    )
+    for _ in range(3):
+        assert connector.get_address_objects("dg") == [
+            {"@name": "dg-Addresses"}
+        ]
+    assert len(panorama.clients) == 1
+
+
+@pytest.mark.parametrize("connections", [1, 3])
+def test_pull_device_groups(panorama, tmp_path, monkeypatch, connections):
+    monkeypatch.chdir(tmp_path)
+    device_groups = [f"dg{i}" for i in range(6)]
+
+    data = pull(panorama, device_groups, connections=connections)
+
+    assert list(data) == ["shared", *device_groups]
+    files = data["dg4"]
+    assert json.loads(files["security_rules"].read_text()) == [
+        {"@name": "dg4-SecurityPostRules"}
+    ]
+    assert json.loads(files["address_groups"].read_text()) == [
+        {"@name": "dg4-AddressGroups"},
+        {"@name": "shared-AddressGroups"},
+    ]
+    assert panorama.requests == 2 + 3 * len(device_groups)
+    assert panorama.max_active <= connections
+    assert len(panorama.clients) <= connections
+
+
+def test_pull_split_shared(panorama, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    merged = pull(panorama, ["dg0"], connections=1)
+    assert json.loads(merged["dg0"]["address_objects"].read_text()) == [
+        {"@name": "dg0-Addresses"},
+        {"@name": "shared-Addresses"},
+    ]
+    assert json.loads(merged["shared"]["address_groups"].read_text()) == [
+        {"@name": "shared-AddressGroups"}
+    ]
+
+    separate = pull(panorama, ["dg0"], connections=1, split_shared=True)
+    assert json.loads(separate["dg0"]["address_objects"].read_text()) == [
+        {"@name": "dg0-Addresses"}
+    ]
+
+
+def test_pull_continue_on_error(panorama, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    data = pull(panorama, ["dg0", "broken", "dg1"], connections=2)
+
+    assert list(data) == ["shared", "dg0", "dg1"]
+
+
+def test_pull_stops_on_error(panorama, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    with pytest.raises(ClickException, match="500"):
+        pull(
+            panorama,
+            ["broken", "dg0", "dg1"],
+            connections=2,
+            continue_on_error=False,
+        )
+
+
+def test_pull_shared_error(panorama, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    panorama.failing = {"shared"}
+
+    with pytest.raises(ClickException, match="500"):
+        pull(panorama, ["dg0", "dg1"])
+    assert not list(tmp_path.iterdir())
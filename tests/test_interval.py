@@ -0,0 +1,193 @@
+import random
+
+import pytest
+
+from policy_inspector.interval import (
+    IntervalArray,
+    IntervalGrid,
+    IntervalTree,
+    covers,
+    intersect_intervals,
+    merge_intervals,
+    parse_ip_literal,
+    subtract_intervals,
+)
+
+
+@pytest.mark.parametrize(
+    "intervals,expected",
+    [
+        ([], ()),
+        ([(5, 10)], ((5, 10),)),
+        ([(20, 30), (5, 10)], ((5, 10), (20, 30))),
+        ([(5, 10), (8, 12)], ((5, 12),)),
+        ([(5, 10), (11, 12)], ((5, 12),)),
+        ([(5, 10), (6, 7)], ((5, 10),)),
+        ([(1, 1), (1, 1), (3, 3)], ((1, 1), (3, 3))),
+    ],
+)
+def test_merge_intervals(intervals, expected):
+    assert merge_intervals(intervals) == expected
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("10.0.0.0/8", ((167772160, 184549375), 8)),
+        ("10.0.0.5/24", ((167772160, 167772415), 24)),
+        ("10.0.0.5", ((167772165, 167772165), 32)),
+        ("0.0.0.0/0", ((0, 4294967295), 0)),
+        ("10.1.1.1-10.1.1.20", ((167837953, 167837972), None)),
+        ("10.0.0.1-10.0.0.1", ((167772161, 167772161), None)),
+        ("10.0.0.20-10.0.0.1", None),
+        ("010.0.0.1", None),
+        ("10.0.0.256", None),
+        ("10.0.0/8", None),
+        ("10.0.0.0/33", None),
+        ("10.0.0.0/255.0.0.0", None),
+        ("10.0.0.0/", None),
+        ("web1", None),
+        ("", None),
+    ],
+)
+def test_parse_ip_literal(value, expected):
+    assert parse_ip_literal(value) == expected
+
+
+@pytest.mark.parametrize(
+    "intervals,other,expected",
+    [
+        (((0, 100),), ((10, 20), (30, 40)), True),
+        (((0, 100),), ((10, 20), (90, 101)), False),
+        (((10, 20), (30, 40)), ((10, 10), (35, 40)), True),
+        (((10, 20), (30, 40)), ((15, 35),), False),
+        (((10, 20), (30, 40)), ((5, 10),), False),
+        (((10, 20), (30, 40)), ((41, 41),), False),
+        (((10, 20),), (), True),
+        ((), ((1, 1),), False),
+    ],
+)
+def test_covers(intervals, other, expected):
+    assert covers(intervals, other) is expected
+
+
+def test_interval_tree_containing():
+    rng = random.Random(3)
+    items = []
+    for key in range(200):
+        start = rng.randint(0, 1000)
+        items.append((start, start + rng.randint(0, 300), key))
+    tree = IntervalTree(items)
+
+    for _ in range(500):
+        start = rng.randint(0, 1300)
+        end = start + rng.randint(0, 50)
+        expected = 0
+        for item_start, item_end, key in items:
+            if item_start <= start and end <= item_end:
+                expected |= 1 << key
+        assert tree.containing(start, end) == expected
+
+
+def test_empty_interval_tree():
+    assert IntervalTree([]).containing(1, 2) == 0
+
+
+def random_intervals(rng, count):
+    return merge_intervals(
+        (start, start + rng.randint(0, 1 << 20))
+        for start in (rng.randint(0, 1 << 24) for _ in range(count))
+    )
+
+
+def test_interval_grid_containing():
+    rng = random.Random(5)
+    regions = [
+        (random_intervals(rng, rng.randint(0, 3)), random_intervals(rng, 2))
+        for _ in range(200)
+    ]
+    grid = IntervalGrid(regions, bits=12)
+
+    for x_intervals, y_intervals in regions[:100]:
+        found = grid.containing(x_intervals, y_intervals)
+        for key, (x, y) in enumerate(regions):
+            if (not x or covers(x, x_intervals)) and covers(y, y_intervals):
+                assert found >> key & 1
+
+
+def test_interval_grid_wide_intervals():
+    everything = ((0, (1 << 32) - 1),)
+    host = ((167772161, 167772161),)
+    regions = [(everything, host)] * 1000 + [(host, host)]
+    grid = IntervalGrid(regions)
+
+    assert list(grid.columns) == [167772161 >> 16]
+    assert list(grid.rows) == [167772161 >> 16]
+    assert grid.unbounded[0] == (1 << 1000) - 1
+    assert grid.containing(host, host) == grid.all
+    assert grid.containing(((0, 10),), host) == (1 << 1000) - 1
+    assert grid.overlapping(((0, 10),), host) == (1 << 1000) - 1
+
+
+@pytest.mark.parametrize(
+    "x_intervals,y_intervals,expected",
+    [
+        (((0, 10),), ((0, 10),), 0b111),
+        (((300, 310),), ((0, 10),), 0b110),
+        (((300, 310),), ((300, 310),), 0b100),
+        ((), ((300, 310),), 0b101),
+        ((), (), 0b111),
+    ],
+)
+def test_interval_grid_cells(x_intervals, y_intervals, expected):
+    grid = IntervalGrid(
+        [
+            (((0, 255),), ((0, 511),)),
+            (((0, 511),), ((0, 255),)),
+            ((), ((0, 1023),)),
+        ],
+        bits=24,
+    )
+    assert grid.containing(x_intervals, y_intervals) == expected
+
+
+@pytest.mark.parametrize(
+    "intervals,other,intersection,difference",
+    [
+        (((0, 10),), ((5, 20),), ((5, 10),), ((0, 4),)),
+        (
+            ((0, 10), (20, 30)),
+            ((5, 25),),
+            ((5, 10), (20, 25)),
+            ((0, 4), (26, 30)),
+        ),
+        (
+            ((0, 30),),
+            ((5, 10), (20, 25)),
+            ((5, 10), (20, 25)),
+            ((0, 4), (11, 19), (26, 30)),
+        ),
+        (((0, 10),), ((20, 30),), (), ((0, 10),)),
+        (((5, 10),), ((0, 30),), ((5, 10),), ()),
+        ((), ((0, 30),), (), ()),
+    ],
+)
+def test_intersect_and_subtract_intervals(
+    intervals, other, intersection, difference
+):
+    assert intersect_intervals(intervals, other) == intersection
+    assert subtract_intervals(intervals, other) == difference
+
+
+def test_interval_array_containing():
+    pytest.importorskip("numpy")
+    rng = random.Random(7)
+    items = [random_intervals(rng, rng.randint(0, 4)) for _ in range(150)]
+    array = IntervalArray(items)
+
+    for intervals in [(), *items[:100]]:
+        expected = 0
+        for key, key_intervals in enumerate(items):
+            if covers(key_intervals, intervals):
+                expected |= 1 << key
+        assert array.containing(intervals) == expected
@@ -2,7 +2,7 @@
 
 import pytest
 
-from policy_inspector.loader import load_csv, load_model
+from policy_inspector.loader import load_chunks, load_csv, load_model
 from policy_inspector.model.address_group import AddressGroup
 from policy_inspector.model.address_object import AddressObject
 from tests.conftest import gather_data_files
@@ -57,5 +57,29 @@ VALID_CSV = gather_data_files("valid*.csv")
 
 @pytest.mark.parametrize("file_path", VALID_CSV)
 def test_valid_csv(file_path):
-    data = load_csv(file_path)
+    data = list(load_csv(file_path))
     assert data
+
+
+def test_load_csv_closes_file(tmp_path):
+    file_path = tmp_path / "rows.csv"
+    file_path.write_text("Name,Type\r\na,FQDN\r\nb,FQDN\r\n")
+
+    rows = load_csv(file_path)
+    assert next(rows) == {"Name": "a", "Type": "FQDN"}
+    file = rows.gi_frame.f_locals["file"]
+    rows.close()
+    assert file.closed
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5])
+def test_load_chunks(tmp_path, chunk_size):
+    file_path = tmp_path / "rows.csv"
+    file_path.write_text("Name\n" + "".join(f"n{i}\n" for i in range(5)))
+
+    chunks = list(load_chunks(file_path, chunk_size))
+
+    assert all(len(chunk) <= chunk_size for chunk in chunks)
+    assert [row["Name"] for chunk in chunks for row in chunk] == [
+        f"n{i}" for i in range(5)
+    ]
@@ -1,8 +1,16 @@
 # ruff: noqa: N802
 
+import json
+
 import pytest
+from pydantic import ValidationError
 
-from policy_inspector.loader import load_model
+from policy_inspector.loader import (
+    iter_json,
+    load_json,
+    load_model,
+    parse_parallel,
+)
 from policy_inspector.model.address_group import AddressGroup
 from policy_inspector.model.address_object import AddressObject
 from policy_inspector.model.security_rule import SecurityRule
@@ -25,3 +33,102 @@ def test_load_from_example_file(model_with_path):
     file_path = get_example_file_path(file_path)
     items = load_model(cls, file_path)
     assert all(isinstance(item, cls) for item in items)
+
+
+ELEMENTS = [
+    {"@name": "a", "member": ["x", "y"]},
+    {"@name": "b]", "value": '[,{"}'},
+    {"@name": "c", "numbers": [1, 22, 333, -4.5e6], "flags": [True, None]},
+    12345,
+    "text",
+    [],
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 1 << 16])
+@pytest.mark.parametrize("indent", [None, 4])
+def test_iter_json(tmp_path, chunk_size, indent):
+    file_path = tmp_path / "elements.json"
+    file_path.write_text(json.dumps(ELEMENTS, indent=indent))
+
+    assert list(iter_json(file_path, chunk_size=chunk_size)) == ELEMENTS
+
+
+@pytest.mark.parametrize("content", ["[]", " [ ] \n", "[\n]"])
+def test_iter_json_empty(tmp_path, content):
+    file_path = tmp_path / "empty.json"
+    file_path.write_text(content)
+
+    assert list(iter_json(file_path, chunk_size=1)) == []
+
+
+@pytest.mark.parametrize(
+    "content",
+    ["", "{}", "[1, 2", "[1 2]", "[1,]", "[{]", "[1] 2", '["a]'],
+)
+def test_iter_json_invalid(tmp_path, content):
+    file_path = tmp_path / "invalid.json"
+    file_path.write_text(content)
+
+    with pytest.raises(ValueError):
+        list(iter_json(file_path, chunk_size=2))
+
+
+def test_load_from_streamed_file(tmp_path):
+    source = get_example_file_path("1/policies.json")
+    file_path = tmp_path / "policies.json"
+    file_path.write_text(json.dumps(json.loads(source.read_text()), indent=2))
+
+    assert load_model(
+        SecurityRule, file_path, loader_func=load_json
+    ) == load_model(SecurityRule, file_path)
+
+
+@pytest.mark.parametrize(
+    "model_with_path",
+    [
+        (SecurityRule, "1/policies.json"),
+        (AddressObject, "1/address_objects.json"),
+    ],
+)
+def test_parse_parallel(model_with_path):
+    cls, file_path = model_with_path
+    file_path = get_example_file_path(file_path)
+    elements = load_json(file_path) * 3
+
+    models = parse_parallel(cls.parse_json, elements, jobs=2, chunk_size=2)
+
+    assert models == cls.parse_json(elements)
+
+
+def test_load_model_jobs(tmp_path):
+    elements = load_json(get_example_file_path("1/policies.json")) * 3
+    file_path = tmp_path / "policies.json"
+    file_path.write_text(json.dumps(elements))
+
+    models = load_model(SecurityRule, file_path, jobs=2, chunk_size=2)
+
+    assert len(models) == len(elements) > 4
+    assert models == load_model(SecurityRule, file_path)
+    assert [model.index for model in models] == list(range(1, len(models) + 1))
+
+
+@pytest.mark.parametrize(
+    "cls,element,invalid",
+    [
+        (SecurityRule, {"@name": "rule"}, {"action": "drop"}),
+        (
+            AddressObject,
+            {"@name": "range", "ip-range": "10.0.0.1-10.0.0.9"},
+            {"ip-netmask": "10.0.0.300/8"},
+        ),
+    ],
+)
+def test_parse_parallel_error_position(cls, element, invalid):
+    elements = [dict(element) for _ in range(7)]
+    elements[5] = {"@name": "invalid", **invalid}
+
+    with pytest.raises(ValidationError) as excinfo:
+        parse_parallel(cls.parse_json, elements, jobs=2, chunk_size=2)
+    [error] = excinfo.value.errors()
+    assert error["loc"][0] == 5
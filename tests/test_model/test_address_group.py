@@ -0,0 +1,19 @@
+from policy_inspector.model.address_group import AddressGroup
+
+
+def test_parse_json_dynamic_group():
+    groups = AddressGroup.parse_json(
+        [
+            {
+                "@name": "static",
+                "static": {"member": ["a", "b"]},
+                "tag": {"member": ["red"]},
+            },
+            {"@name": "dynamic", "dynamic": {"filter": "'web' and 'prod'"}},
+        ]
+    )
+
+    assert groups[0].static == {"a", "b"}
+    assert groups[0].dynamic is None
+    assert groups[1].static == set()
+    assert groups[1].dynamic == "'web' and 'prod'"
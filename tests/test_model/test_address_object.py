@@ -1,6 +1,7 @@
 from ipaddress import IPv4Address, IPv4Network
 
 import pytest
+from pydantic import ValidationError
 
 from policy_inspector.model.address_object import (
     AddressObject,
@@ -119,6 +120,16 @@ class TestParsing:
         assert isinstance(obj, AddressObjectFQDN)
         assert obj.value == "test.example.com"
 
+    def test_parse_json_keeps_order(self, json_data):
+        elements = [
+            {**json_data, "@name": "net", "ip-netmask": "10.0.0.0/8"},
+            {**json_data, "@name": "fqdn", "fqdn": "test.example.com"},
+            {**json_data, "@name": "host", "ip-netmask": "10.0.0.1/32"},
+        ]
+        objs = AddressObject.parse_json(elements)
+        assert [obj.name for obj in objs] == ["net", "fqdn", "host"]
+        assert objs[2].interval == (167772161, 167772161)
+
     def test_parse_csv_ip_network(self):
         csv_data = {
             "Name": "csv-net",
@@ -146,3 +157,53 @@ def test_missing_address_in_csv():
     csv_data = {"Name": "missing-addr", "Type": "IP Address"}
     with pytest.raises(KeyError):
         AddressObject.parse_csv([csv_data])
+
+
+@pytest.mark.parametrize(
+    "obj,expected",
+    [
+        (
+            AddressObjectIPNetwork(name="net", value="10.0.0.0/8"),
+            (167772160, 184549375),
+        ),
+        (
+            AddressObjectIPRange(name="range", value="10.0.0.1-10.0.0.3"),
+            (167772161, 167772163),
+        ),
+        (AddressObjectFQDN(name="fqdn", value="example.com"), None),
+    ],
+)
+def test_interval(obj, expected):
+    assert obj.interval == expected
+
+
+@pytest.mark.parametrize(
+    "obj,other,expected",
+    [
+        ("10.1.0.0/16", "10.0.0.0/8", True),
+        ("10.0.0.0/8", "10.1.0.0/16", False),
+        ("10.0.0.5/32", "10.0.0.1-10.0.0.10", True),
+        ("10.0.0.0/24", "10.0.0.1-10.0.0.255", False),
+        ("10.0.0.2-10.0.0.3", "10.0.0.0/30", True),
+        ("10.0.0.2-10.0.0.4", "10.0.0.0/30", False),
+    ],
+)
+def test_is_covered_by(obj, other, expected):
+    def create(value):
+        if "-" in value:
+            return AddressObjectIPRange(name=value, value=value)
+        return AddressObjectIPNetwork(name=value, value=value)
+
+    assert create(obj).is_covered_by(create(other)) is expected
+
+
+def test_parse_json_error_position():
+    elements = [
+        {"@name": "net1", "ip-netmask": "10.0.0.0/8"},
+        {"@name": "range", "ip-range": "10.0.0.1-10.0.0.9"},
+        {"@name": "net2", "ip-netmask": "10.0.0.300/8"},
+    ]
+    with pytest.raises(ValidationError) as excinfo:
+        AddressObject.parse_json(elements)
+    [error] = excinfo.value.errors()
+    assert error["loc"] == (2, "value")
@@ -0,0 +1,86 @@
+from ipaddress import IPv4Network
+
+from policy_inspector.model.address_object import AddressObjectIPNetwork
+from policy_inspector.model.compiled import (
+    CompiledRule,
+    SetInterner,
+    compile_rules,
+)
+from policy_inspector.model.security_rule import (
+    AdvancedSecurityRule,
+    SecurityRule,
+)
+
+
+def test_compiled_rules_share_sets():
+    rules = compile_rules(
+        [
+            SecurityRule(name="r0", applications={"web", "dns"}),
+            SecurityRule(name="r1", applications={"dns", "web"}),
+        ]
+    )
+    assert rules[0].applications == frozenset({"web", "dns"})
+    assert rules[0].applications is rules[1].applications
+    assert rules[0].source_zones is rules[0].category
+    assert rules[0].applications_id == rules[1].applications_id
+    assert rules[0].applications_id != rules[0].services_id
+
+
+def test_set_interner():
+    interner = SetInterner()
+    first, first_id = interner.intern(["a", "b"])
+    second, second_id = interner.intern({"b", "a"})
+    _, other_id = interner.intern(())
+
+    assert first is second
+    assert first_id == second_id == 0
+    assert other_id == 1
+    assert len(interner) == 2
+
+
+def test_compiled_rule_any_flags():
+    rule = CompiledRule(
+        SecurityRule(
+            name="rule",
+            source_zones={"trust"},
+            destination_addresses={"any"},
+        )
+    )
+    assert not rule.any_source_zone
+    assert rule.any_destination_zone
+    assert rule.any_destination_address
+    assert not hasattr(rule, "__dict__")
+
+
+def test_compiled_rule_intervals():
+    network = AddressObjectIPNetwork(
+        name="net", value=IPv4Network("10.0.0.0/24")
+    )
+    model = AdvancedSecurityRule.from_security_rule(
+        SecurityRule(name="rule", index=3, source_addresses={"net"}),
+        resolved_source_addresses=[network],
+    )
+    rule = CompiledRule(model)
+
+    assert rule.model is model
+    assert rule.index == 3
+    assert rule.resolved_source_addresses == [network]
+    assert rule.source_intervals == ((167772160, 167772415),)
+    assert rule.destination_intervals == ()
+
+
+def test_from_security_rule_keeps_fields():
+    rule = SecurityRule(name="rule", action="deny", services={"http"})
+    advanced = AdvancedSecurityRule.from_security_rule(rule)
+
+    assert (
+        advanced.model_dump(
+            exclude={
+                "resolved_source_addresses",
+                "resolved_destination_addresses",
+            }
+        )
+        == rule.model_dump()
+    )
+    assert advanced.model_fields_set == rule.model_fields_set
+    assert advanced.resolved_source_addresses is None
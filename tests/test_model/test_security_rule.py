@@ -0,0 +1,73 @@
+import gc
+
+import pytest
+from pydantic import ValidationError
+
+from policy_inspector.model.security_rule import SecurityRule
+
+
+def test_fingerprint_ignores_name_and_order():
+    rule = SecurityRule(name="a", applications={"web", "dns"}, index=1)
+    same = SecurityRule(name="b", applications={"dns", "web"}, index=7)
+    assert rule.fingerprint == same.fingerprint
+    assert len(rule.fingerprint) == 32
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [
+        {"action": "deny"},
+        {"services": {"http"}},
+        {"category": {"news"}},
+        {"source_zones": {"trust"}},
+        {"applications": {"web"}, "services": {"dns"}},
+    ],
+)
+def test_fingerprint_differs(changes):
+    rule = SecurityRule(name="rule", applications={"web", "dns"})
+    assert rule.model_copy(update=changes).fingerprint != rule.fingerprint
+
+
+def test_fingerprint_separates_fields():
+    first = SecurityRule(name="r", applications={"x"}, services=set())
+    second = SecurityRule(name="r", applications=set(), services={"x"})
+    assert first.fingerprint != second.fingerprint
+
+
+def test_parse_json_many():
+    elements = [
+        {
+            "@name": f"rule{i}",
+            "@location": "device-group",
+            "action": "deny",
+            "from": {"member": ["trust", "dmz"]},
+            "application": {"member": "web"},
+            "hip-profiles": {"member": ["any"]},
+        }
+        for i in range(3)
+    ]
+    rules = SecurityRule.parse_json(elements)
+
+    assert [rule.index for rule in rules] == [1, 2, 3]
+    assert rules[2].name == "rule2"
+    assert rules[0].source_zones == {"trust", "dmz"}
+    assert rules[0].applications == {"web"}
+    assert rules[0].action == "deny"
+
+
+def test_parse_json_invalid_item():
+    elements = [{"@name": "ok"}, {"@name": "bad", "action": "drop"}]
+    with pytest.raises(ValidationError, match="1.action"):
+        SecurityRule.parse_json(elements)
+    assert gc.isenabled()
+
+
+def test_validate_many_error_position():
+    items = [{"name": f"rule{i}"} for i in range(5)]
+    items[3]["action"] = "drop"
+    with pytest.raises(ValidationError) as excinfo:
+        SecurityRule.validate_many(items, batch_size=2)
+    [error] = excinfo.value.errors()
+    assert error["loc"] == (3, "action")
+    assert error["type"] == "literal_error"
+    assert gc.isenabled()
@@ -0,0 +1,71 @@
+import sqlite3
+from array import array
+
+from policy_inspector.model.security_rule import SecurityRule
+from policy_inspector.output.sqlite_store import save_results
+from policy_inspector.shadowing.base import Shadowing
+from tests.test_scenario.test_shadowing import random_rules
+
+
+def query(file_path, sql, *params):
+    connection = sqlite3.connect(file_path)
+    try:
+        return connection.execute(sql, params).fetchall()
+    finally:
+        connection.close()
+
+
+def test_save_findings(tmp_path):
+    file_path = tmp_path / "results.db"
+    rules = [
+        SecurityRule(name="r0"),
+        SecurityRule(name="r1", applications={"web"}),
+        SecurityRule(name="r2", applications={"web"}),
+    ]
+    scenario = Shadowing(rules)
+    list(scenario.iter_findings())
+
+    first = save_results(file_path, scenario, device_group="dg1")
+    second = save_results(file_path, scenario, device_group="dg2")
+
+    assert first != second
+    assert query(file_path, "SELECT scenario, device_group FROM runs") == [
+        ("Shadowing", "dg1"),
+        ("Shadowing", "dg2"),
+    ]
+    assert query(
+        file_path,
+        "SELECT kind, rule_name, preceding_rule_name FROM findings "
+        "WHERE run_id = ? ORDER BY kind, rule_name, preceding_rule_name",
+        second,
+    ) == [
+        ("duplicate", "r2", "r1"),
+        ("shadowing", "r1", "r0"),
+        ("shadowing", "r2", "r0"),
+        ("shadowing", "r2", "r1"),
+    ]
+    assert query(file_path, "SELECT count(*) FROM rules WHERE name = 'r1'") == [
+        (2,)
+    ]
+    assert query(file_path, "SELECT count(*) FROM masks") == [(0,)]
+
+
+def test_save_masks(tmp_path):
+    file_path = tmp_path / "results.db"
+    scenario = Shadowing(random_rules(20, 0))
+    results = scenario.execute()
+    scenario.analyze(results)
+
+    run_id = save_results(file_path, scenario)
+
+    rows = query(
+        file_path,
+        "SELECT position, itemsize, masks FROM masks WHERE run_id = ?",
+        run_id,
+    )
+    assert len(rows) == 19
+    for position, itemsize, masks in rows:
+        assert itemsize == results.masks.itemsize
+        start = results.offset(position, 0)
+        expected = results.masks[start : start + position]
+        assert array(expected.typecode, masks) == expected
@@ -1,3 +1,4 @@
+import random
 from ipaddress import IPv4Address, IPv4Network
 
 import pytest
@@ -124,11 +125,10 @@ def test_circular_dependency():
         AddressGroup(name="groupA", static={"groupB"}),
         AddressGroup(name="groupB", static={"groupA"}),
     ]
-    resolver = Resolver([], groups)
 
-    with pytest.raises(RecursionError) as excinfo:
-        resolver.resolve({"groupA"})
-    assert "maximum recursion depth" in str(excinfo.value)
+    with pytest.raises(ValueError) as excinfo:
+        Resolver([], groups)
+    assert "Circular reference of Address Groups" in str(excinfo.value)
 
 
 def test_cache_usage(objects_and_groups):
@@ -151,3 +151,258 @@ def test_duplicate_entries(address_objects):
     resolver = Resolver(address_objects, groups)
     result = resolver.resolve({"dupes"})
     assert len(result) == 1
+
+
+@pytest.mark.parametrize(
+    ("groups", "cycle"),
+    [
+        ({"groupA": {"groupA"}}, "groupA -> groupA"),
+        (
+            {"top": {"groupA"}, "groupA": {"groupB"}, "groupB": {"groupA"}},
+            "groupA -> groupB -> groupA",
+        ),
+    ],
+)
+def test_circular_dependency_path(groups, cycle):
+    groups = [AddressGroup(name=n, static=s) for n, s in groups.items()]
+
+    with pytest.raises(ValueError, match=cycle):
+        Resolver([], groups)
+
+
+def test_overlapping_groups_deduplicated(address_objects):
+    groups = [
+        AddressGroup(name="g0", static={"web1", "web2"}),
+        *(
+            AddressGroup(name=f"g{i}", static={f"g{i - 1}", f"g{i // 2}"})
+            for i in range(1, 60)
+        ),
+    ]
+    resolver = Resolver(address_objects, groups)
+
+    result = resolver.resolve({"g59", "g30", "web1"})
+
+    assert sorted(obj.name for obj in result) == ["web1", "web2"]
+    assert resolver.resolve_intervals({"g59"}) == ((3232235777, 3232235778),)
+
+
+def test_deeply_nested_groups(address_objects):
+    depth = 5000
+    groups = [AddressGroup(name="g0", static={"web5", "10.10.1.16"})] + [
+        AddressGroup(name=f"g{i}", static={f"g{i - 1}"})
+        for i in range(1, depth)
+    ]
+    resolver = Resolver(address_objects, groups)
+
+    assert len(resolver.resolve({f"g{depth - 1}"})) == 2
+    assert resolver.resolve_intervals({f"g{depth - 1}", "db1"}) == (
+        (167772165, 167772165),
+        (168427786, 168427792),
+    )
+
+
+def test_unknown_member_of_group(address_objects):
+    groups = [
+        AddressGroup(name="broken", static={"web1", "undefined"}),
+        AddressGroup(name="outer", static={"broken"}),
+        AddressGroup(name="valid", static={"web1"}),
+    ]
+    resolver = Resolver(address_objects, groups)
+
+    assert len(resolver.resolve({"valid"})) == 1
+    with pytest.raises(
+        ValueError, match="Unknown address object/group: undefined"
+    ):
+        resolver.resolve({"outer"})
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "10.0.0.0/8",
+        "10.0.0.5/24",
+        "192.168.1.1",
+        "10.1.1.1-10.1.1.20",
+        "10.0.0.0/255.0.0.0",
+    ],
+)
+def test_resolve_literal(value):
+    expected = (
+        AddressObjectIPRange(name=value, value=value)
+        if "-" in value
+        else AddressObjectIPNetwork(name=value, value=value)
+    )
+
+    (result,) = Resolver([], []).resolve({value})
+
+    assert type(result) is type(expected)
+    assert result == expected
+    assert result.interval == expected.interval
+
+
+@pytest.mark.parametrize(
+    "value", ["10.0.0.20-10.0.0.1", "10.0.0.0/33", "10.00.0.1-10.0.0.2"]
+)
+def test_resolve_invalid_literal(value):
+    with pytest.raises(ValueError, match="Unknown address object/group"):
+        Resolver([], []).resolve({value})
+
+
+def test_large_volume_of_literals():
+    rng = random.Random(0)
+    literals = []
+    for i in range(20000):
+        address = str(IPv4Address(rng.getrandbits(32)))
+        if i % 2:
+            literals.append(f"{address}/{rng.randint(0, 32)}")
+        else:
+            literals.append(f"{address}-255.255.255.255")
+    resolver = Resolver([], [])
+
+    for literal in literals:
+        (result,) = resolver.resolve({literal})
+        start, _, end = literal.partition("-")
+        if end:
+            assert result.interval == (
+                int(IPv4Address(start)),
+                int(IPv4Address(end)),
+            )
+        else:
+            network = IPv4Network(literal, strict=False)
+            assert result.interval == (
+                int(network.network_address),
+                int(network.broadcast_address),
+            )
+    assert len(resolver.objects) == len(set(literals))
+
+
+@pytest.fixture
+def shared_resolver(objects_and_groups):
+    return Resolver(*objects_and_groups)
+
+
+def test_layered_resolver_overrides_shared(shared_resolver):
+    address_objects = [
+        AddressObjectIPNetwork(name="db1", value="172.16.0.1/32"),
+    ]
+    groups = [
+        AddressGroup(name="databases", static={"db1"}),
+        AddressGroup(name="local", static={"app-tier", "db1", "10.9.9.9"}),
+    ]
+    resolver = Resolver(address_objects, groups, parent=shared_resolver)
+
+    (db1,) = resolver.resolve({"db1"})
+    assert db1.value == IPv4Network("172.16.0.1/32")
+    assert [obj.name for obj in resolver.resolve({"databases"})] == ["db1"]
+    # Shared group keeps shared objects, as in Panorama
+    assert sorted(obj.name for obj in resolver.resolve({"local"})) == [
+        "10.9.9.9",
+        "db1",
+        "db1",
+        "db2",
+        "web1",
+        "web2",
+        "web5",
+    ]
+    assert shared_resolver.resolve({"db1"})[0].value == IPv4Network(
+        "10.0.0.5/32"
+    )
+
+
+def test_layered_resolver_reuses_shared(shared_resolver):
+    first = Resolver([], [], parent=shared_resolver)
+    second = Resolver([], [], parent=shared_resolver)
+
+    assert first.resolve({"app-tier"}) == second.resolve({"app-tier"})
+    assert first.cache["app-tier"] is shared_resolver.cache["app-tier"]
+
+
+def test_layered_resolver_keeps_own_objects(shared_resolver):
+    first = Resolver([], [], parent=shared_resolver)
+    second = Resolver(
+        [AddressObjectIPNetwork(name="db1", value="172.16.0.1/32")],
+        [],
+        parent=shared_resolver,
+    )
+    shared_objects = list(shared_resolver.objects)
+
+    (literal,) = first.resolve({"10.1.1.1"})
+    (db1,) = second.resolve({"db1"})
+
+    assert first.objects == [literal]
+    assert second.objects == [db1]
+    assert shared_resolver.objects == shared_objects
+    assert first.offset == second.offset == len(shared_objects)
+    assert first.resolve_ids({"10.1.1.1"}) == {first.offset}
+    assert second.get_object(second.offset) is db1
+
+
+def test_layered_resolver_unknown_member(shared_resolver):
+    shared = Resolver([], [AddressGroup(name="broken", static={"missing"})])
+    groups = [AddressGroup(name="local", static={"broken"})]
+    resolver = Resolver([], groups, parent=shared)
+
+    for name in ("local", "broken", "undefined"):
+        with pytest.raises(ValueError, match="Unknown address object/group"):
+            resolver.resolve({name})
+    with pytest.raises(ValueError, match="missing"):
+        resolver.resolve({"local"})
+
+
+def tagged_objects():
+    return [
+        AddressObjectIPNetwork(
+            name="web-prod", value="10.0.1.0/24", tags={"web", "prod"}
+        ),
+        AddressObjectIPNetwork(
+            name="web-dev", value="10.0.2.0/24", tags={"web", "dev"}
+        ),
+        AddressObjectIPNetwork(
+            name="db-prod", value="10.0.3.0/24", tags={"db", "prod"}
+        ),
+    ]
+
+
+def names(address_objects):
+    return sorted(obj.name for obj in address_objects)
+
+
+def test_dynamic_groups():
+    groups = [
+        AddressGroup(name="web", dynamic="'web'"),
+        AddressGroup(name="prod", dynamic="'prod' and not 'web'"),
+        AddressGroup(name="all", static={"web", "prod"}),
+        AddressGroup(name="none", dynamic="'missing'"),
+    ]
+    resolver = Resolver(tagged_objects(), groups)
+
+    assert names(resolver.resolve({"web"})) == ["web-dev", "web-prod"]
+    assert names(resolver.resolve({"prod"})) == ["db-prod"]
+    assert len(resolver.resolve({"all"})) == 3
+    assert resolver.resolve({"none"}) == []
+    assert resolver.resolve_intervals({"all"}) == ((167772416, 167773183),)
+
+
+def test_invalid_dynamic_filter():
+    groups = [AddressGroup(name="broken", dynamic="'web' and")]
+
+    with pytest.raises(ValueError, match="Invalid filter of Address Group"):
+        Resolver([], groups)
+
+
+def test_layered_dynamic_groups():
+    shared = Resolver(
+        tagged_objects(), [AddressGroup(name="shared-web", dynamic="web")]
+    )
+    address_objects = [
+        AddressObjectIPNetwork(name="web-dev", value="10.9.0.0/24"),
+        AddressObjectIPNetwork(
+            name="local-web", value="10.8.0.0/24", tags={"web"}
+        ),
+    ]
+    groups = [AddressGroup(name="web", dynamic="web")]
+    resolver = Resolver(address_objects, groups, parent=shared)
+
+    assert names(resolver.resolve({"web"})) == ["local-web", "web-prod"]
+    assert names(resolver.resolve({"shared-web"})) == ["web-dev", "web-prod"]
+    assert names(shared.resolve({"shared-web"})) == ["web-dev", "web-prod"]
@@ -0,0 +1,12 @@
+import pytest
+
+from policy_inspector.shadowing.base import Shadowing
+
+
+@pytest.fixture(params=["tree", "array"])
+def interval_backend(request, monkeypatch):
+    """Run a test with each search of address intervals."""
+    if request.param == "array":
+        pytest.importorskip("numpy")
+    monkeypatch.setattr(Shadowing, "interval_backend", request.param)
+    return request.param
@@ -1,5 +1,6 @@
 import pytest
 
+from policy_inspector.scenario import Message
 from policy_inspector.shadowing import Scenario
 
 
@@ -30,3 +31,49 @@ class TestScenarioWithImplementation:
             scenario.execute()
         with pytest.raises(NotImplementedError):
             scenario.analyze(None)
+
+
+class TestPassesChecks:
+    class CountingScenario(Scenario):
+        def __init__(self):
+            self.calls = []
+            self.checks = [self.failing, self.passing]
+
+        def failing(self, *rules):
+            self.calls.append("failing")
+            return False, Message("Failed for {}", rules)
+
+        def passing(self, *rules):
+            self.calls.append("passing")
+            return True, "Passed"
+
+    def test_stops_at_first_failed_check(self):
+        scenario = self.CountingScenario()
+        assert scenario.passes_checks("rule") is False
+        assert scenario.calls == ["failing"]
+
+    def test_selected_checks(self):
+        scenario = self.CountingScenario()
+        assert scenario.passes_checks("rule", checks=[scenario.passing])
+        assert scenario.calls == ["passing"]
+
+    def test_run_checks_messages(self):
+        scenario = self.CountingScenario()
+        results = scenario.run_checks("rule")
+        assert results["failing"] == (False, "Failed for ('rule',)")
+        assert results["passing"] == (True, "Passed")
+
+
+def test_message_is_formatted_lazily():
+    class Value:
+        formatted = 0
+
+        def __format__(self, format_spec):
+            self.formatted += 1
+            return "value"
+
+    value = Value()
+    message = Message("Formatted {}", value)
+    assert value.formatted == 0
+    assert str(message) == "Formatted value"
+    assert value.formatted == 1
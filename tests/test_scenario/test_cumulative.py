@@ -0,0 +1,269 @@
+from ipaddress import IPv4Network
+
+import pytest
+
+from policy_inspector.interval import merge_intervals
+from policy_inspector.model.address_object import (
+    AddressObjectFQDN,
+    AddressObjectIPNetwork,
+)
+from policy_inspector.model.security_rule import SecurityRule
+from policy_inspector.shadowing.advanced import ShadowingByValue
+from policy_inspector.shadowing.cumulative import (
+    AddressSet,
+    CumulativeShadowing,
+    ValueSet,
+    subtract,
+)
+from tests.test_scenario.test_shadowing_by_value import random_address_rules
+
+
+@pytest.fixture
+def address_objects():
+    return [
+        AddressObjectIPNetwork(name="net", value=IPv4Network("10.0.0.0/16")),
+        AddressObjectIPNetwork(name="low", value=IPv4Network("10.0.0.0/17")),
+        AddressObjectIPNetwork(name="high", value=IPv4Network("10.0.128.0/17")),
+        AddressObjectIPNetwork(
+            name="middle", value=IPv4Network("10.0.64.0/18")
+        ),
+        AddressObjectFQDN(name="fqdn", value="example.com"),
+    ]
+
+
+def names(findings):
+    return [
+        (rule.name, [preceding.name for preceding in covering])
+        for rule, covering in findings
+    ]
+
+
+@pytest.mark.parametrize(
+    "first,second,expected",
+    [
+        (ValueSet(frozenset("ab")), ValueSet(frozenset("bc")), {"b"}),
+        (
+            ValueSet(frozenset("ab")),
+            ValueSet(frozenset("b"), complement=True),
+            {"a"},
+        ),
+        (
+            ValueSet(frozenset("a"), complement=True),
+            ValueSet(frozenset("ab")),
+            {"b"},
+        ),
+    ],
+)
+def test_value_set_intersection(first, second, expected):
+    both = first & second
+    assert not both.complement
+    assert both.values == expected
+
+
+def test_value_set_complement():
+    any_value = ValueSet.from_values({"any"})
+    assert any_value.complement
+    assert ValueSet.from_values(set()).complement
+    assert not any_value - ValueSet.from_values({"a"}) & ValueSet(
+        frozenset("a")
+    )
+    assert (any_value - ValueSet(frozenset("a"))).complement
+    assert not ValueSet(frozenset("a")) - any_value
+
+
+def test_subtract_regions():
+    region = (
+        ValueSet(frozenset("ab")),
+        AddressSet(((0, 99),), ValueSet()),
+    )
+    other = (
+        ValueSet(frozenset("a")),
+        AddressSet(((50, 200),), ValueSet()),
+    )
+    pieces = subtract(region, other)
+
+    assert len(pieces) == 2
+    assert pieces[0][0].values == {"b"}
+    assert pieces[0][1].intervals == ((0, 99),)
+    assert pieces[1][0].values == {"a"}
+    assert pieces[1][1].intervals == ((0, 49),)
+
+    apart = (ValueSet(frozenset("c")), other[1])
+    assert subtract(region, apart) is None
+
+
+def test_covered_by_union(address_objects):
+    rules = [
+        SecurityRule(
+            name="web", source_addresses={"middle"}, applications={"web"}
+        ),
+        SecurityRule(name="low", source_addresses={"low"}),
+        SecurityRule(name="high", source_addresses={"high"}),
+        SecurityRule(name="net", source_addresses={"net"}),
+    ]
+    scenario = CumulativeShadowing(rules, address_objects, [])
+
+    assert names(scenario.iter_findings()) == [
+        ("net", ["low", "high"]),
+    ]
+
+
+def test_covered_by_single_rule(address_objects):
+    rules = [
+        SecurityRule(name="low", source_addresses={"low"}),
+        SecurityRule(name="wide", source_addresses={"net"}),
+        SecurityRule(name="middle", source_addresses={"middle"}),
+    ]
+    scenario = CumulativeShadowing(rules, address_objects, [])
+
+    assert names(scenario.iter_findings()) == [
+        ("middle", ["low"]),
+    ]
+
+
+@pytest.mark.parametrize(
+    "rule",
+    [
+        SecurityRule(name="rule", source_addresses={"net"}, action="deny"),
+        SecurityRule(name="rule", source_addresses={"net", "fqdn"}),
+        SecurityRule(name="rule", source_addresses={"any"}),
+    ],
+)
+def test_not_covered(address_objects, rule):
+    rules = [
+        SecurityRule(
+            name="low", source_addresses={"low"}, applications={"web"}
+        ),
+        SecurityRule(name="high", source_addresses={"high"}),
+        SecurityRule(name="low-any", source_addresses={"low"}),
+        rule,
+    ]
+    scenario = CumulativeShadowing(rules, address_objects, [])
+
+    assert list(scenario.iter_findings()) == []
+
+
+def test_covered_by_applications(address_objects):
+    rules = [
+        SecurityRule(name="web", applications={"web"}),
+        SecurityRule(name="ssh", applications={"ssh", "dns"}),
+        SecurityRule(name="rule", applications={"web", "ssh"}),
+    ]
+    scenario = CumulativeShadowing(rules, address_objects, [])
+
+    assert names(scenario.iter_findings()) == [
+        ("rule", ["web", "ssh"]),
+    ]
+
+
+def test_excluded_check_is_not_compared(address_objects):
+    rules = [
+        SecurityRule(name="low", source_addresses={"low"}),
+        SecurityRule(name="high", source_addresses={"high"}, action="deny"),
+        SecurityRule(name="net", source_addresses={"net"}),
+    ]
+    scenario = CumulativeShadowing(rules, address_objects, [])
+    assert list(scenario.iter_findings()) == []
+
+    scenario.exclude_checks(["check_action"])
+    assert names(scenario.iter_findings()) == [
+        ("net", ["low", "high"]),
+    ]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_findings_cover_rules(seed):
+    rules, address_objects = random_address_rules(80, seed)
+    scenario = CumulativeShadowing(rules, address_objects, [])
+    findings = list(scenario.iter_findings())
+
+    naive = CumulativeShadowing(rules, address_objects, [])
+    naive.use_index = False
+    assert list(naive.iter_findings()) == findings
+
+    # FQDN addresses are compared by names, not excluded from comparison
+    single = ShadowingByValue(rules, address_objects, [])
+    shadowed = {rule.name for rule, _ in findings}
+    for rule, _ in single.iter_findings():
+        addresses = rule.source_addresses | rule.destination_addresses
+        assert rule.name in shadowed or "fqdn" in addresses
+
+    positions = {rule.name: i for i, rule in enumerate(scenario.security_rules)}
+    for rule, covering in findings:
+        region = scenario.regions[positions[rule.name]]
+        covering = [positions[preceding.name] for preceding in covering]
+        assert not scenario.subtract_all([region], covering)[0]
+        for j in covering:
+            others = [k for k in covering if k != j]
+            assert scenario.subtract_all([region], others)[0]
+
+
+def test_address_set_intervals():
+    addresses = AddressSet(merge_intervals([(0, 9), (20, 29)]), ValueSet())
+    rest = addresses - AddressSet(((5, 24),), ValueSet())
+    assert rest.intervals == ((0, 4), (25, 29))
+    assert not (addresses & AddressSet(((10, 19),), ValueSet()))
+
+
+def test_explain_covering_set(address_objects):
+    rules = [
+        SecurityRule(name="low", source_addresses={"low"}),
+        SecurityRule(name="high", source_addresses={"high"}),
+        SecurityRule(name="net", source_addresses={"net"}),
+    ]
+    scenario = CumulativeShadowing(rules, address_objects, [])
+    ((rule, covering),) = scenario.iter_findings()
+
+    outputs = scenario.explain(rule, covering[0])
+
+    assert outputs["check_source_addresses_by_ip"] == (
+        True,
+        "Preceding rule contains 10.0.0.0-10.0.127.255",
+    )
+    assert outputs["check_action"] == (
+        True,
+        "Preceding rule contains all of rule's values",
+    )
+    assert outputs["covering_set"] == (True, "Covered together by low, high")
+
+
+def test_source_zones_compared_by_containment(address_objects):
+    rules = [
+        SecurityRule(name="a", source_zones={"a"}),
+        SecurityRule(name="ab", source_zones={"a", "b"}),
+        SecurityRule(name="b", source_zones={"b"}),
+        SecurityRule(name="bc", source_zones={"b", "c"}),
+    ]
+    scenario = CumulativeShadowing(rules, address_objects, [])
+
+    assert names(scenario.iter_findings()) == [("b", ["ab"])]
+
+
+def test_cache_reuses_leading_rules(tmp_path, monkeypatch):
+    rules, address_objects = random_address_rules(60, 1)
+    changed = [
+        *rules[:40],
+        rules[40].model_copy(update={"applications": {"changed"}}),
+        *rules[41:],
+    ]
+    cache_file = tmp_path / "cache.json"
+    scenario = CumulativeShadowing(rules, address_objects, [])
+    scenario.cache_file = cache_file
+    list(scenario.iter_findings())
+
+    expected = list(
+        CumulativeShadowing(changed, address_objects, []).iter_findings()
+    )
+    evaluated = []
+    find_covering = CumulativeShadowing.find_covering
+
+    def spy(self, position, candidates):
+        evaluated.append(position)
+        return find_covering(self, position, candidates)
+
+    monkeypatch.setattr(CumulativeShadowing, "find_covering", spy)
+    cached = CumulativeShadowing(changed, address_objects, [])
+    cached.cache_file = cache_file
+
+    assert list(cached.iter_findings()) == expected
+    assert evaluated == list(range(40, 60))
@@ -0,0 +1,117 @@
+import random
+from ipaddress import IPv4Network
+
+import pytest
+
+from policy_inspector.model.address_object import AddressObjectIPNetwork
+from policy_inspector.shadowing.advanced import ShadowingByValue
+from policy_inspector.shadowing.base import Shadowing
+from policy_inspector.shadowing.incremental import Snapshot
+from tests.test_scenario.test_shadowing import random_rules
+from tests.test_scenario.test_shadowing_by_value import random_address_rules
+
+
+def modify(rules, seed):
+    """Change, add, remove and move a few of ``rules``."""
+    rng = random.Random(seed)
+    rules = list(rules)
+    replacements = random_rules(len(rules), seed + 100)
+    for k in rng.sample(range(len(rules)), 3):
+        rules[k] = replacements[k].model_copy(update={"name": rules[k].name})
+    new_rule = replacements[0].model_copy(update={"name": "new"})
+    rules.insert(rng.randrange(len(rules)), new_rule)
+    del rules[rng.randrange(len(rules))]
+    first, second = sorted(rng.sample(range(len(rules)), 2))
+    rules[first], rules[second] = rules[second], rules[first]
+    return rules
+
+
+def run(scenario, cache_file):
+    scenario.cache_file = cache_file
+    return list(scenario.iter_findings())
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_matches_full_run(tmp_path, seed):
+    cache_file = tmp_path / "cache.json"
+    rules = random_rules(80, seed)
+    assert run(Shadowing(rules), cache_file) == list(
+        Shadowing(rules).iter_findings()
+    )
+
+    modified = modify(rules, seed)
+    incremental = Shadowing(modified)
+    findings = run(incremental, cache_file)
+
+    assert findings == list(Shadowing(modified).iter_findings())
+    assert len(incremental.delta.reused) >= len(rules) - 8
+    assert Snapshot.load(cache_file).hashes == {
+        rule.name: rule.fingerprint for rule in modified
+    }
+
+
+def test_unchanged_rules_are_not_evaluated(tmp_path, monkeypatch):
+    cache_file = tmp_path / "cache.json"
+    rules = random_rules(40, 0)
+    expected = run(Shadowing(rules), cache_file)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Rule evaluated again")
+
+    scenario = Shadowing(rules)
+    monkeypatch.setattr(scenario, "passes_checks", fail)
+    monkeypatch.setattr(scenario, "iter_candidates", fail)
+    assert run(scenario, cache_file) == expected
+
+
+def test_changed_checks_ignore_cache(tmp_path):
+    cache_file = tmp_path / "cache.json"
+    rules = random_rules(40, 1)
+    run(Shadowing(rules), cache_file)
+
+    scenario = Shadowing(rules)
+    scenario.exclude_checks(["check_action"])
+    expected = Shadowing(rules)
+    expected.exclude_checks(["check_action"])
+
+    assert run(scenario, cache_file) == list(expected.iter_findings())
+    assert scenario.delta is None
+
+
+@pytest.mark.parametrize("content", ["", "[]", '{"version": 0}'])
+def test_invalid_cache_file_ignored(tmp_path, content):
+    cache_file = tmp_path / "cache.json"
+    cache_file.write_text(content)
+    rules = random_rules(20, 2)
+
+    assert run(Shadowing(rules), cache_file) == list(
+        Shadowing(rules).iter_findings()
+    )
+    assert Snapshot.load(cache_file) is not None
+
+
+def test_resolved_addresses_changed(tmp_path):
+    cache_file = tmp_path / "cache.json"
+    rules, address_objects = random_address_rules(60, 0)
+    run(ShadowingByValue(rules, address_objects, []), cache_file)
+
+    address_objects = [
+        AddressObjectIPNetwork(name=obj.name, value=IPv4Network("0.0.0.0/0"))
+        if obj.name == "net0"
+        else obj
+        for obj in address_objects
+    ]
+    scenario = ShadowingByValue(rules, address_objects, [])
+    expected = ShadowingByValue(rules, address_objects, [])
+
+    assert run(scenario, cache_file) == list(expected.iter_findings())
+    changed = [
+        rule.name
+        for i, rule in enumerate(scenario.rules)
+        if i not in scenario.delta.reused
+    ]
+    assert changed == [
+        rule.name
+        for rule in rules
+        if "net0" in rule.source_addresses | rule.destination_addresses
+    ]
@@ -0,0 +1,78 @@
+import pytest
+
+from policy_inspector.model.compiled import compile_rules
+from policy_inspector.model.security_rule import SecurityRule
+from policy_inspector.shadowing.base import Shadowing
+from policy_inspector.shadowing.index import (
+    CacheInfo,
+    RuleIndex,
+    iter_bits,
+    prefilter_application,
+    to_bitset,
+)
+from tests.test_scenario.test_shadowing import random_rules
+
+
+@pytest.fixture
+def rules():
+    return [
+        SecurityRule(name="r0", source_zones={"a"}, applications={"any"}),
+        SecurityRule(name="r1", source_zones={"a", "b"}, applications={"x"}),
+        SecurityRule(name="r2", source_zones=set(), applications={"x", "y"}),
+    ]
+
+
+@pytest.mark.parametrize("positions", [[], [0], [1, 5, 8], list(range(20))])
+def test_bitset_roundtrip(positions):
+    assert list(iter_bits(to_bitset(positions, 20))) == positions
+
+
+@pytest.mark.parametrize(
+    "method,attribute,values,expected",
+    [
+        ("equal", "applications", "any", [0]),
+        ("supersets", "applications", {"x"}, [1, 2]),
+        ("supersets", "applications", {"x", "y"}, [2]),
+        ("supersets", "applications", {"unknown"}, []),
+        ("supersets", "applications", set(), [0, 1, 2]),
+        ("subsets", "source_zones", {"a"}, [0, 2]),
+        ("subsets", "source_zones", {"a", "b"}, [0, 1, 2]),
+        ("subsets", "source_zones", set(), [2]),
+    ],
+)
+def test_rule_index(rules, method, attribute, values, expected):
+    index = RuleIndex(rules)
+    assert (
+        list(iter_bits(getattr(index, method)(attribute, values))) == expected
+    )
+
+
+def test_unknown_interval_backend(rules):
+    with pytest.raises(ValueError, match="Unknown interval backend 'list'"):
+        RuleIndex(compile_rules(rules), interval_backend="list")
+
+
+def test_prefilter_memoized_by_set_id(rules):
+    compiled = compile_rules(
+        [*rules, SecurityRule(name="r3", applications={"y", "x"})]
+    )
+    index = RuleIndex(compiled)
+
+    results = [prefilter_application(index, rule) for rule in compiled]
+
+    assert results[2] == results[3]
+    assert list(iter_bits(results[3])) == [0, 2, 3]
+    assert index.cache_info() == {
+        "prefilter_application": CacheInfo(hits=1, misses=3)
+    }
+    assert RuleIndex(compiled).cache_info() == {}
+
+
+def test_scenario_cache_info():
+    scenario = Shadowing(random_rules(50, 0))
+    assert scenario.cache_info() == {}
+
+    list(scenario.iter_findings())
+    info = scenario.cache_info()["prefilter_application"]
+    ids = {rule.applications_id for rule in scenario.rules}
+    assert info.misses <= len(ids) < info.hits
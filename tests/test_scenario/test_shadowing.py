@@ -1,7 +1,10 @@
+import random
+
 import pytest
 
 from policy_inspector.model.security_rule import SecurityRule
 from policy_inspector.shadowing.base import Shadowing
+from policy_inspector.shadowing.parallel import partition
 
 
 @pytest.fixture
@@ -121,3 +124,184 @@ def test_identical_rules(identical_rules):
     results = scenario.execute()
     for i, rule_result in enumerate(results.values()):
         assert i == len(rule_result)
+
+
+@pytest.mark.parametrize(
+    "rule_index,expected_candidates",
+    [
+        (0, []),
+        (1, []),  # Different action
+        (2, ["rule1"]),
+    ],
+)
+def test_rule_candidates(base_rules, rule_index, expected_candidates):
+    scenario = Shadowing(base_rules)
+    candidates = scenario.iter_candidates(rule_index)
+    assert [base_rules[j].name for j in candidates] == expected_candidates
+
+
+def random_rules(count: int, seed: int) -> list[SecurityRule]:
+    rng = random.Random(seed)
+
+    def pick(values: list[str]) -> set[str]:
+        if rng.random() < 0.2:
+            return {"any"}
+        return set(rng.sample(values, rng.randint(0, 2)))
+
+    zones = ["zoneA", "zoneB", "zoneC"]
+    addresses = ["net1", "net2", "net3"]
+    applications = ["web", "ssh", "dns"]
+    services = ["http", "https", "application-default"]
+    return [
+        SecurityRule(
+            name=f"rule{i}",
+            action=rng.choice(["allow", "deny"]),
+            source_zones=pick(zones),
+            destination_zones=pick(zones),
+            source_addresses=pick(addresses),
+            destination_addresses=pick(addresses),
+            applications=pick(applications),
+            services=pick(services),
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_index_matches_naive_analysis(seed):
+    rules = random_rules(80, seed)
+
+    naive = Shadowing(rules)
+    naive.use_index = False
+    naive_results = naive.analyze(naive.execute())
+
+    indexed = Shadowing(rules)
+    indexed_results = indexed.analyze(indexed.execute())
+
+    assert naive_results
+    assert indexed_results == naive_results
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_iter_findings_matches_analysis(seed):
+    rules = random_rules(60, seed)
+    scenario = Shadowing(rules)
+    expected = scenario.analyze(scenario.execute())
+
+    streamed = Shadowing(rules)
+    findings = streamed.iter_findings()
+    assert next(findings) == expected[0]
+    assert [expected[0], *findings] == expected
+    assert streamed.analysis_results == expected
+    assert streamed.execution_results is None
+
+
+def test_show_without_formats(caplog):
+    rules = random_rules(30, 1)
+    reference = Shadowing(rules)
+    expected = reference.analyze(reference.execute())
+    scenario = Shadowing(rules)
+
+    with caplog.at_level("INFO"):
+        scenario.show(scenario.iter_findings(), ())
+
+    assert "Analysis results" not in caplog.text
+    assert scenario.analysis_results == expected
+
+
+def test_explain_logs_failing_check(caplog):
+    def check_failing(rule, preceding_rule):
+        """Fails with an exception for every pair of rules."""
+        raise ValueError("broken check")
+
+    rules = random_rules(5, 0)
+    scenario = Shadowing(rules)
+    scenario.checks = [*scenario.checks, check_failing]
+
+    with caplog.at_level("DEBUG", logger="policy_inspector"):
+        results = scenario.explain(rules[1], rules[0])
+
+    assert "check_failing" not in results
+    assert "check_action" in results
+    assert "☠ Error: broken check" in caplog.text
+    assert f"☠ Rule 1: {rules[1].name}" in caplog.text
+    assert f"'name': '{rules[0].name}'" in caplog.text
+
+
+@pytest.mark.parametrize("use_index", [True, False])
+def test_packed_results_match_checks(use_index):
+    rules = random_rules(30, 0)
+    scenario = Shadowing(rules)
+    scenario.use_index = use_index
+    results = scenario.execute()
+
+    assert results.nbytes == len(rules) * (len(rules) - 1) // 2
+    assert list(results) == [rule.name for rule in rules]
+    for i, rule in enumerate(rules):
+        assert list(results[rule.name]) == [r.name for r in rules[:i]]
+        for preceding_rule in rules[:i]:
+            checks_results = results[rule.name][preceding_rule.name]
+            assert dict(checks_results) == scenario.explain(
+                rule, preceding_rule
+            )
+
+
+@pytest.mark.parametrize("count,chunks", [(0, 4), (1, 4), (5, 8), (1000, 16)])
+def test_partition_covers_all_rules(count, chunks):
+    ranges = partition(count, chunks)
+    assert [i for positions in ranges for i in positions] == list(range(count))
+    assert len(ranges) <= chunks
+
+
+def test_partition_balances_workload():
+    ranges = partition(1000, 4)
+    workloads = [sum(positions) for positions in ranges]
+    assert max(workloads) / min(workloads) < 1.05
+
+
+def test_parallel_findings_match_serial():
+    rules = random_rules(80, 1)
+    serial = Shadowing(rules)
+    expected = list(serial.iter_findings())
+
+    parallel = Shadowing(rules)
+    parallel.jobs = 2
+    assert list(parallel.iter_findings()) == expected
+    assert parallel.analysis_results == expected
+
+
+def test_duplicates_evaluated_once():
+    rules = random_rules(40, 2)
+    rules = [
+        *rules,
+        *(
+            rule.model_copy(update={"name": f"{rule.name}-copy"})
+            for rule in rules[::3]
+        ),
+    ]
+    scenario = Shadowing(rules)
+    expected = scenario.analyze(scenario.execute())
+
+    assert list(Shadowing(rules).iter_findings()) == expected
+    chunk = Shadowing(rules)
+    chunk.build_index()
+    assert [
+        (rules[i], [rules[j] for j in shadowing])
+        for i, shadowing in chunk.find_shadowing(range(0, 30))
+    ] == [
+        (rule, shadowing) for rule, shadowing in expected if rule in rules[:30]
+    ]
+
+
+def test_find_duplicates():
+    rules = [
+        SecurityRule(name="r0", applications={"web", "dns"}),
+        SecurityRule(name="r1", applications={"web"}),
+        SecurityRule(name="r2", applications={"dns", "web"}, enabled=False),
+        SecurityRule(name="r3", applications={"web", "dns"}, index=4),
+    ]
+    duplicates = Shadowing(rules).find_duplicates()
+    assert duplicates == [
+        (rules[2], [rules[0]]),
+        (rules[3], [rules[0], rules[2]]),
+    ]
@@ -1,3 +1,4 @@
+import random
 from ipaddress import IPv4Network
 
 import pytest
@@ -7,7 +8,11 @@ from policy_inspector.model.address_object import (
     AddressObjectIPNetwork,
 )
 from policy_inspector.model.security_rule import SecurityRule
-from policy_inspector.shadowing.advanced import ShadowingByValue
+from policy_inspector.shadowing.advanced import (
+    ShadowingByValue,
+    check_source_addresses_by_ip,
+    prefilter_addresses_by_grid,
+)
 
 
 @pytest.fixture
@@ -96,6 +101,7 @@ def test_single_rule(address_objects):
     assert results["single"] == {}
 
 
+@pytest.mark.usefixtures("interval_backend")
 @pytest.mark.parametrize(
     "rule_index,expected_preceding",
     [
@@ -114,6 +120,7 @@ def test_rule_preceding_counts(
     assert len(results[rule_name]) == expected_preceding
 
 
+@pytest.mark.usefixtures("interval_backend")
 def test_shadowing_relationships(base_rules, address_objects):
     scenario = ShadowingByValue(base_rules, address_objects, [])
     results = scenario.execute()
@@ -122,6 +129,7 @@ def test_shadowing_relationships(base_rules, address_objects):
     assert results["rule2"]["rule1"]["check_action"][0] is True
 
 
+@pytest.mark.usefixtures("interval_backend")
 def test_fqdn_rule_handling(fqdn_rules, address_objects):
     scenario = ShadowingByValue(fqdn_rules, address_objects, [])
     results = scenario.execute()
@@ -129,6 +137,7 @@ def test_fqdn_rule_handling(fqdn_rules, address_objects):
     assert "fqdn-rule1" in results["fqdn-rule2"]
 
 
+@pytest.mark.usefixtures("interval_backend")
 def test_mixed_address_types(mixed_rules, address_objects):
     """Test rules with combined IP and FQDN addresses"""
     scenario = ShadowingByValue(mixed_rules, address_objects, [])
@@ -137,6 +146,7 @@ def test_mixed_address_types(mixed_rules, address_objects):
     assert len(results["mixed2"]) == 1
 
 
+@pytest.mark.usefixtures("interval_backend")
 def test_identical_rules(address_objects):
     """Test multiple identical rules after resolution"""
     rules = [
@@ -154,3 +164,121 @@ def test_identical_rules(address_objects):
     # Each subsequent rule should check all preceding rules
     for i, rule_name in enumerate(["rule0", "rule1", "rule2"]):
         assert len(results[rule_name]) == i
+
+
+@pytest.mark.usefixtures("interval_backend")
+def test_covered_by_union_of_preceding_addresses():
+    address_objects = [
+        AddressObjectIPNetwork(name="low", value="10.0.0.0/25"),
+        AddressObjectIPNetwork(name="high", value="10.0.0.128/25"),
+        AddressObjectIPNetwork(name="whole", value="10.0.0.0/24"),
+    ]
+    rules = [
+        SecurityRule(name="halves", source_addresses={"low", "high"}),
+        SecurityRule(name="whole", source_addresses={"whole"}),
+    ]
+    scenario = ShadowingByValue(rules, address_objects, [])
+    assert scenario.security_rules[0].source_intervals == (
+        (167772160, 167772415),
+    )
+    results = scenario.execute()
+    assert results["whole"]["halves"]["check_source_addresses_by_ip"] == (
+        True,
+        "All non-FQDN source addresses are covered by preceding rule",
+    )
+
+
+@pytest.mark.usefixtures("interval_backend")
+def test_uncovered_address_message(address_objects):
+    rules = [
+        SecurityRule(name="narrow", source_addresses={"narrow-net"}),
+        SecurityRule(name="wide", source_addresses={"wide-net"}),
+    ]
+    scenario = ShadowingByValue(rules, address_objects, [])
+    results = scenario.execute()
+    assert results["wide"]["narrow"]["check_source_addresses_by_ip"] == (
+        False,
+        "Source wide-net (10.0.0.0/8) not covered by preceding rule",
+    )
+
+
+def random_address_rules(count: int, seed: int):
+    rng = random.Random(seed)
+    address_objects = []
+    for i in range(30):
+        prefix = rng.randint(8, 30)
+        network = IPv4Network(
+            (rng.choice([10, 172]) << 24, prefix), strict=False
+        )
+        subnet = rng.choice(
+            list(network.subnets(new_prefix=min(prefix + 2, 32)))
+        )
+        address_objects.append(
+            AddressObjectIPNetwork(name=f"net{i}", value=subnet)
+        )
+    address_objects.append(AddressObjectFQDN(name="fqdn", value="example.com"))
+    names = [obj.name for obj in address_objects]
+
+    def pick():
+        if rng.random() < 0.15:
+            return {"any"}
+        return set(rng.sample(names, rng.randint(1, 3)))
+
+    rules = [
+        SecurityRule(
+            name=f"rule{i}",
+            action=rng.choice(["allow", "allow", "deny"]),
+            source_addresses=pick(),
+            destination_addresses=pick(),
+        )
+        for i in range(count)
+    ]
+    return rules, address_objects
+
+
+@pytest.mark.usefixtures("interval_backend")
+@pytest.mark.parametrize("seed", range(5))
+def test_index_matches_naive_analysis(seed):
+    rules, address_objects = random_address_rules(80, seed)
+
+    naive = ShadowingByValue(rules, address_objects, [])
+    naive.use_index = False
+    expected = list(naive.iter_findings())
+
+    indexed = ShadowingByValue(rules, address_objects, [])
+    assert expected
+    assert list(indexed.iter_findings()) == expected
+    assert indexed.analyze(indexed.execute()) == expected
+
+
+def test_interval_backends_without_numpy(monkeypatch):
+    rules, address_objects = random_address_rules(80, 0)
+    expected = list(
+        ShadowingByValue(rules, address_objects, []).iter_findings()
+    )
+
+    monkeypatch.setattr("policy_inspector.interval.np", None)
+    scenario = ShadowingByValue(rules, address_objects, [])
+    scenario.interval_backend = "array"
+    with pytest.raises(ImportError, match=r"policy-inspector\[numpy\]"):
+        list(scenario.iter_findings())
+
+    scenario.interval_backend = "tree"
+    assert list(scenario.iter_findings()) == expected
+    assert scenario.index.trees
+    assert not scenario.index.arrays
+
+
+def test_grid_prefilter_needs_both_address_checks(address_objects):
+    scenario = ShadowingByValue([], address_objects, [])
+    assert prefilter_addresses_by_grid not in scenario.get_prefilters()
+
+    scenario.address_grid = True
+    assert scenario.get_prefilters()[0] is prefilter_addresses_by_grid
+
+    scenario.checks = [
+        check
+        for check in scenario.checks
+        if check is not check_source_addresses_by_ip
+    ]
+    assert prefilter_addresses_by_grid not in scenario.get_prefilters()
@@ -0,0 +1,62 @@
+import pytest
+
+from policy_inspector.tag_filter import evaluate_filter, parse_filter
+
+TAGS = {
+    0: {"web", "prod"},
+    1: {"web", "dev"},
+    2: {"db", "prod"},
+    3: {"db", "dev", "pci"},
+    4: set(),
+}
+
+
+def match(expression):
+    def tagged(tag):
+        return frozenset(i for i, tags in TAGS.items() if tag in tags)
+
+    node = parse_filter(expression)
+    return evaluate_filter(node, tagged, frozenset(TAGS))
+
+
+@pytest.mark.parametrize(
+    "expression,expected",
+    [
+        ("'web'", "web"),
+        ("'web' and 'prod'", ("and", ("web", "prod"))),
+        ("web or db and prod", ("or", ("web", ("and", ("db", "prod"))))),
+        ("(web or db) AND prod", ("and", (("or", ("web", "db")), "prod"))),
+        ("not 'web'", ("not", ("web",))),
+        ("'a b' or \"c\"", ("or", ("a b", "c"))),
+        ("a and b and c", ("and", ("a", "b", "c"))),
+    ],
+)
+def test_parse_filter(expression, expected):
+    assert parse_filter(expression) == expected
+
+
+@pytest.mark.parametrize(
+    "expression",
+    ["", "web and", "(web", "web db", "'web", "web)", "and", "not"],
+)
+def test_parse_invalid_filter(expression):
+    with pytest.raises(ValueError):
+        parse_filter(expression)
+
+
+@pytest.mark.parametrize(
+    "expression,expected",
+    [
+        ("'web'", {0, 1}),
+        ("'web' and 'prod'", {0}),
+        ("'web' or 'db' and 'prod'", {0, 1, 2}),
+        ("('web' or 'db') and 'prod'", {0, 2}),
+        ("not 'web'", {2, 3, 4}),
+        ("'db' and not 'pci'", {2}),
+        ("not 'web' and not 'db'", {4}),
+        ("'missing' and 'web'", set()),
+        ("not ('dev' or 'prod')", {4}),
+    ],
+)
+def test_evaluate_filter(expression, expected):
+    assert match(expression) == expected